@@ -8,4 +8,160 @@ SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-DB_PATH = ":memory:" if ENV == "test" else os.getenv("DB_PATH", "database/app.db")
\ No newline at end of file
+DB_PATH = ":memory:" if ENV == "test" else os.getenv("DB_PATH", "database/app.db")
+
+# Connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+
+# SQLite connection bootstrap profile, applied to every connection
+DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", "-16000"))  # negative = KiB
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(64 * 1024 * 1024)))
+DB_TEMP_STORE = os.getenv("DB_TEMP_STORE", "MEMORY")
+DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))  # milliseconds
+DB_FOREIGN_KEYS = os.getenv("DB_FOREIGN_KEYS", "ON")
+
+DB_READ_CACHE_SIZE = int(os.getenv("DB_READ_CACHE_SIZE", "-64000"))
+DB_READ_MMAP_SIZE = int(os.getenv("DB_READ_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Prepared statements sqlite3 keeps per connection (LRU, keyed by SQL text).
+# The default of 128 is smaller than the set of distinct statements a
+# long-lived pooled connection sees once filtered pages and reports are in
+# the mix, and an evicted lookup is parsed and planned again.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "512"))
+
+# "write" connections serve requests that modify data; "read" connections
+# get a bigger page cache and mmap window and refuse writes outright.
+DB_PROFILES = {
+    "write": {
+        "journal_mode": DB_JOURNAL_MODE,
+        "synchronous": DB_SYNCHRONOUS,
+        "cache_size": DB_CACHE_SIZE,
+        "mmap_size": DB_MMAP_SIZE,
+        "temp_store": DB_TEMP_STORE,
+        "busy_timeout": DB_BUSY_TIMEOUT,
+        "foreign_keys": DB_FOREIGN_KEYS,
+    },
+    "read": {
+        "journal_mode": DB_JOURNAL_MODE,
+        "synchronous": DB_SYNCHRONOUS,
+        "cache_size": DB_READ_CACHE_SIZE,
+        "mmap_size": DB_READ_MMAP_SIZE,
+        "temp_store": DB_TEMP_STORE,
+        "busy_timeout": DB_BUSY_TIMEOUT,
+        "foreign_keys": DB_FOREIGN_KEYS,
+        "query_only": "ON",
+    },
+}
+
+# Serve GET /exercises/ from cached, pre-encoded (and pre-compressed) bytes
+CATALOG_PRESERIALIZED = os.getenv("CATALOG_PRESERIALIZED", "true").lower() == "true"
+# Each worker checks the database catalog version this often, so a catalog
+# change made through another worker is served within this many seconds
+CATALOG_SYNC_SECONDS = float(os.getenv("CATALOG_SYNC_SECONDS", "5"))
+
+# Password hashing (scrypt). Cost is 2**PASSWORD_SCRYPT_LOG_N; tests use a
+# cheap setting so the suite stays fast.
+PASSWORD_SCRYPT_LOG_N = int(
+    os.getenv("PASSWORD_SCRYPT_LOG_N", "10" if ENV == "test" else "14")
+)
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Hash jobs allowed to run or queue at once; beyond that logins get a 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# JWT signing. HS256 signs with SECRET_KEY; JWT_PREVIOUS_SECRET_KEYS
+# (comma-separated) still verify tokens issued before a rotation. RS256,
+# ES256 and EdDSA sign with the PEM private key at JWT_PRIVATE_KEY_PATH and
+# also accept the retired public keys in JWT_PREVIOUS_PUBLIC_KEY_PATHS.
+JWT_PREVIOUS_SECRET_KEYS = [
+    key for key in os.getenv("JWT_PREVIOUS_SECRET_KEYS", "").split(",") if key
+]
+JWT_PRIVATE_KEY_PATH = os.getenv("JWT_PRIVATE_KEY_PATH")
+JWT_PREVIOUS_PUBLIC_KEY_PATHS = [
+    path for path in os.getenv("JWT_PREVIOUS_PUBLIC_KEY_PATHS", "").split(",") if path
+]
+
+# Verified-token cache: repeat requests with the same bearer token skip the
+# signature check for up to TOKEN_CACHE_TTL seconds (never past token expiry)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "60"))
+
+# Refresh tokens are opaque, single-use and rotated on every refresh
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+# Bulk session upload
+BULK_SESSIONS_MAX_ITEMS = int(os.getenv("BULK_SESSIONS_MAX_ITEMS", "500"))
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+# Sessions (each with all of its exercise rows) read per chunk when
+# streaming a training-history export
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "100"))
+
+# Weekly leaderboards: boards held in memory at once, and how often the
+# loaded boards are rebuilt from the volume rollups
+LEADERBOARD_MAX_BOARDS = int(os.getenv("LEADERBOARD_MAX_BOARDS", "256"))
+LEADERBOARD_REBUILD_SECONDS = float(os.getenv("LEADERBOARD_REBUILD_SECONDS", "300"))
+
+# Production server (manage.py prod): a pre-fork master with WEB_WORKERS
+# uvicorn workers (default: one per CPU) sharing one listening socket.
+# Each worker restarts after WEB_MAX_REQUESTS requests (0 = never), plus
+# up to WEB_MAX_REQUESTS_JITTER so they do not all restart at once.
+WEB_HOST = os.getenv("WEB_HOST", "127.0.0.1")
+WEB_PORT = int(os.getenv("WEB_PORT", "8000"))
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "0")) or os.cpu_count() or 1
+WEB_BACKLOG = int(os.getenv("WEB_BACKLOG", "2048"))
+WEB_MAX_REQUESTS = int(os.getenv("WEB_MAX_REQUESTS", "10000"))
+WEB_MAX_REQUESTS_JITTER = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "1000"))
+WEB_GRACEFUL_TIMEOUT = float(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+
+# Workers keep revoked access tokens in memory; each one reads the
+# revocations recorded since its last look this often (read-only, on the
+# read pool), so a logout handled by one worker reaches the others within
+# this many seconds
+DENYLIST_SYNC_SECONDS = float(os.getenv("DENYLIST_SYNC_SECONDS", "5"))
+
+# Observability. METRICS_ENABLED=false removes the per-request and
+# per-query timing hooks entirely; with METRICS_TOKEN set, /metrics needs
+# "Authorization: Bearer <token>". LOG_FORMAT is "text" or "json".
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Pre-fork workers: each writes its metrics to METRICS_DIR every
+# METRICS_FLUSH_SECONDS and /metrics serves the sum over all workers.
+# Unset, /metrics reports only the process that answers it. manage.py prod
+# creates a directory when none is given.
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+# Request profiling. PROFILING_ENABLED samples PROFILING_SAMPLE_RATE of all
+# requests; with PROFILING_SECRET set, a request carrying a valid signed
+# "X-Profile" header (manage.py profile-token) is profiled. A token is bound
+# to one request path. Each worker profiles at most
+# PROFILING_MAX_PER_MINUTE requests, sampled or signed. With neither
+# setting, the middleware is not installed. Stacks are sampled every
+# PROFILING_INTERVAL seconds and written to PROFILING_DIR, which keeps the
+# newest PROFILING_KEEP profiles (two files each); older ones are deleted.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.01"))
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.005"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_KEEP = int(os.getenv("PROFILING_KEEP", "200"))
+PROFILING_MAX_PER_MINUTE = int(os.getenv("PROFILING_MAX_PER_MINUTE", "30"))
+PROFILING_SECRET = os.getenv("PROFILING_SECRET")
+
+# Per-statement query statistics and the slow-query log (statements taking
+# SLOW_QUERY_MS or more are logged with their query plan). GET
+# /admin/queries shows the costliest statements; it needs
+# "Authorization: Bearer <ADMIN_TOKEN>" and is disabled without one.
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+QUERY_STATS_MAX_STATEMENTS = int(os.getenv("QUERY_STATS_MAX_STATEMENTS", "500"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
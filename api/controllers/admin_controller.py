@@ -0,0 +1,64 @@
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from api.config import ADMIN_TOKEN, QUERY_STATS_ENABLED
+from api.models.admin import QueryStatsReport, StatementStats
+from api.utils.query_stats import query_stats
+from typing import Optional
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(authorization or "", f"Bearer {ADMIN_TOKEN}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def _require_query_stats():
+    if not QUERY_STATS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Query statistics are disabled"
+        )
+
+
+@router.get(
+    "/queries",
+    response_model=QueryStatsReport,
+    dependencies=[Depends(require_admin), Depends(_require_query_stats)],
+)
+async def get_query_stats(
+    limit: int = Query(20, ge=1, le=500),
+    sort: str = Query("total", pattern="^(total|max|mean|calls)$"),
+):
+    return QueryStatsReport(
+        slow_query_ms=query_stats.slow_seconds * 1000,
+        sort=sort,
+        statements=[
+            StatementStats(
+                statement=entry.statement,
+                calls=entry.calls,
+                total_ms=round(entry.total * 1000, 3),
+                mean_ms=round(entry.total / entry.calls * 1000, 3),
+                max_ms=round(entry.max * 1000, 3),
+                rows=entry.rows,
+                slow_calls=entry.slow_calls,
+                plan=list(entry.plan) if entry.plan else None,
+                last_slow_params=entry.last_slow_params,
+            )
+            for entry in query_stats.top(limit, sort)
+        ],
+    )
+
+
+@router.delete(
+    "/queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_admin), Depends(_require_query_stats)],
+)
+async def reset_query_stats():
+    query_stats.reset()
@@ -1,20 +1,51 @@
 from fastapi import APIRouter, Depends, status
-from api.models.user import UserCreate, UserResponse, UserLogin, Token
+from api.models.user import (
+    UserCreate,
+    UserResponse,
+    UserLogin,
+    Token,
+    TokenData,
+    RefreshRequest,
+    LogoutRequest,
+)
+from api.repositories.refresh_token_repository import RefreshTokenRepository
+from api.repositories.user_repository import UserRepository
 from api.services.auth_service import AuthService
+from api.utils.auth import get_current_user
 from database.db import get_db
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _auth_service(db) -> AuthService:
+    return AuthService(UserRepository(db), RefreshTokenRepository(db))
+
+
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
 async def register(user: UserCreate, db=Depends(get_db)):
-    service = AuthService(db)
+    service = _auth_service(db)
     return await service.create_user(user)
 
 
 @router.post("/login", response_model=Token)
 async def login(credentials: UserLogin, db=Depends(get_db)):
-    service = AuthService(db)
+    service = _auth_service(db)
     return await service.login(credentials)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest, db=Depends(get_db)):
+    service = _auth_service(db)
+    return await service.refresh(body.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: LogoutRequest | None = None,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    service = _auth_service(db)
+    await service.logout(current_user, body.refresh_token if body else None)
@@ -1,24 +1,103 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse
 from api.models.exercise import ExerciseResponse
 from api.services.exercise_service import ExerciseService
 from api.repositories.exercise_repository import ExerciseRepository
-from database.db import get_db
-from typing import List
+from api.utils.catalog_cache import etag_matches, exercise_catalog
+from api.config import CATALOG_PRESERIALIZED
+from database.db import get_lazy_read_db, get_read_db
+from typing import List, Optional
 
 router = APIRouter(prefix="/exercises", tags=["Exercises"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 @router.get("/", response_model=List[ExerciseResponse], status_code=status.HTTP_200_OK)
-async def get_all_exercises(db=Depends(get_db)):
+async def get_all_exercises(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    muscle_group: Optional[str] = None,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated columns to return (id is always included)"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    connect=Depends(get_lazy_read_db),
+):
+    paginated = any(
+        value is not None for value in (category, muscle_group, fields, cursor, limit)
+    )
+    if paginated:
+        service = ExerciseService(ExerciseRepository(await connect()))
+        items, next_cursor = await service.get_exercises_page(
+            category=category,
+            muscle_group=muscle_group,
+            fields=fields,
+            cursor=cursor,
+            limit=limit or DEFAULT_PAGE_SIZE,
+        )
+
+        headers = {}
+        if next_cursor:
+            next_url = request.url.include_query_params(cursor=next_cursor)
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return JSONResponse(content=items, headers=headers)
+
+    # Unfiltered: the whole catalog, served from the cache. Only a miss
+    # checks out a connection.
+    snapshot = exercise_catalog.get()
+    if snapshot is None:
+        repository = ExerciseRepository(await connect(), exercise_catalog)
+        service = ExerciseService(repository)
+        exercises = await service.get_all_exercises()
+
+        snapshot = exercise_catalog.get()
+        if snapshot is None:
+            # Not cacheable right now (a write raced this read)
+            return exercises
+
+    # Answer revalidations straight from the cached snapshot
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if CATALOG_PRESERIALIZED:
+        body, coding = snapshot.negotiate(request.headers.get("accept-encoding"))
+        headers["Vary"] = "Accept-Encoding"
+        if coding:
+            headers["Content-Encoding"] = coding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    response.headers.update(headers)
+    return list(snapshot.exercises)
+
+
+@router.get(
+    "/search", response_model=List[ExerciseResponse], status_code=status.HTTP_200_OK
+)
+async def search_exercises(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_read_db),
+):
     repository = ExerciseRepository(db)
     service = ExerciseService(repository)
-    return await service.get_all_exercises()
+    return await service.search_exercises(q, limit)
 
 
 @router.get(
     "/{exercise_id}", response_model=ExerciseResponse, status_code=status.HTTP_200_OK
 )
-async def get_exercise_by_id(exercise_id: int, db=Depends(get_db)):
-    repository = ExerciseRepository(db)
+async def get_exercise_by_id(exercise_id: int, connect=Depends(get_lazy_read_db)):
+    # Found in the cached catalog: answered without a connection
+    snapshot = exercise_catalog.get()
+    if snapshot is not None and exercise_id in snapshot.by_id:
+        return snapshot.by_id[exercise_id]
+
+    repository = ExerciseRepository(await connect(), exercise_catalog)
     service = ExerciseService(repository)
     return await service.get_exercise_by_id(exercise_id)
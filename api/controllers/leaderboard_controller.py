@@ -0,0 +1,25 @@
+from datetime import date
+from fastapi import APIRouter, Depends, status
+from api.models.leaderboard import Leaderboard
+from api.models.user import TokenData
+from api.repositories.leaderboard_repository import LeaderboardRepository
+from api.services.leaderboard_service import LeaderboardService
+from api.utils.auth import get_current_user
+from database.db import get_read_db
+from typing import Optional
+
+router = APIRouter(prefix="/leaderboards", tags=["Leaderboards"])
+
+
+@router.get("/weekly", response_model=Leaderboard, status_code=status.HTTP_200_OK)
+async def get_weekly_leaderboard(
+    week: Optional[date] = None,
+    exercise_id: Optional[int] = None,
+    limit: int = 10,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_read_db),
+):
+    service = LeaderboardService(LeaderboardRepository(db))
+    return await service.get_weekly_leaderboard(
+        current_user.user_id, week, exercise_id, limit
+    )
@@ -0,0 +1,52 @@
+from datetime import date
+from fastapi import APIRouter, Depends, status
+from api.models.report import E1RMTrend, PersonalRecord, VolumeReport
+from api.models.user import TokenData
+from api.repositories.report_repository import ReportRepository
+from api.services.report_service import ReportService
+from api.utils.auth import get_current_user
+from database.db import get_read_db
+from typing import List, Optional
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+
+@router.get("/volume", response_model=VolumeReport, status_code=status.HTTP_200_OK)
+async def get_volume_report(
+    period: str = "weekly",
+    group_by: str = "total",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_read_db),
+):
+    service = ReportService(ReportRepository(db))
+    return await service.get_volume_report(
+        current_user.user_id, period, group_by, start, end
+    )
+
+
+@router.get(
+    "/records", response_model=List[PersonalRecord], status_code=status.HTTP_200_OK
+)
+async def get_personal_records(
+    formula: str = "epley",
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_read_db),
+):
+    service = ReportService(ReportRepository(db))
+    return await service.get_personal_records(current_user.user_id, formula)
+
+
+@router.get(
+    "/e1rm/{exercise_id}", response_model=E1RMTrend, status_code=status.HTTP_200_OK
+)
+async def get_e1rm_trend(
+    exercise_id: int,
+    formula: str = "epley",
+    window: int = 7,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_read_db),
+):
+    service = ReportService(ReportRepository(db))
+    return await service.get_e1rm_trend(current_user.user_id, exercise_id, formula, window)
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Header, Query, status
+from fastapi.responses import StreamingResponse
+from api.models.user import TokenData
+from api.models.workout_session import BulkSessionResult, BulkSessionUpload
+from api.repositories.leaderboard_repository import LeaderboardRepository
+from api.repositories.session_repository import SessionRepository
+from api.services.export_service import EXPORT_FORMATS, ExportService
+from api.services.leaderboard_service import LeaderboardService
+from api.services.session_service import SessionService
+from api.utils.auth import get_current_user
+from database.db import get_db
+from typing import Optional
+
+router = APIRouter(prefix="/sessions", tags=["Workout Sessions"])
+
+
+@router.post("/bulk", response_model=BulkSessionResult, status_code=status.HTTP_200_OK)
+async def bulk_create_sessions(
+    upload: BulkSessionUpload,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    service = SessionService(
+        SessionRepository(db), LeaderboardService(LeaderboardRepository(db))
+    )
+    return await service.bulk_create_sessions(
+        current_user.user_id, upload.sessions, idempotency_key
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_sessions(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: TokenData = Depends(get_current_user),
+):
+    service = ExportService()
+    return StreamingResponse(
+        service.export_history(current_user.user_id, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="training-history.{format}"'
+        },
+    )
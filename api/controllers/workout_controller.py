@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, status
+from api.models.user import TokenData
+from api.models.workout_plan import (
+    WorkoutPlanCreate,
+    WorkoutPlanResponse,
+    WorkoutPlanUpdate,
+)
+from api.models.workout_plan_exercise import (
+    WorkoutPlanExerciseCreate,
+    WorkoutPlanExerciseResponse,
+)
+from api.repositories.workout_repository import WorkoutRepository
+from api.services.workout_service import WorkoutService
+from api.utils.auth import get_current_user
+from database.db import get_db, get_read_db
+from typing import List
+
+router = APIRouter(prefix="/workouts", tags=["Workouts"])
+
+
+@router.get("/", response_model=List[WorkoutPlanResponse], status_code=status.HTTP_200_OK)
+async def get_all_workout_plans(
+    current_user: TokenData = Depends(get_current_user), db=Depends(get_read_db)
+):
+    service = WorkoutService(WorkoutRepository(db))
+    return await service.get_all_workout_plans(current_user.user_id)
+
+
+@router.post(
+    "/", response_model=WorkoutPlanResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_workout_plan(
+    workout: WorkoutPlanCreate,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    service = WorkoutService(WorkoutRepository(db))
+    return await service.create_workout_plan(
+        current_user.user_id, workout.name, workout.description
+    )
+
+
+@router.get(
+    "/{workout_id}", response_model=WorkoutPlanResponse, status_code=status.HTTP_200_OK
+)
+async def get_workout_plan(
+    workout_id: int,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_read_db),
+):
+    service = WorkoutService(WorkoutRepository(db))
+    return await service.get_workout_plan_by_id(workout_id, current_user.user_id)
+
+
+@router.put(
+    "/{workout_id}", response_model=WorkoutPlanResponse, status_code=status.HTTP_200_OK
+)
+async def update_workout_plan(
+    workout_id: int,
+    workout: WorkoutPlanUpdate,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    service = WorkoutService(WorkoutRepository(db))
+    return await service.update_workout_plan(
+        workout_id, current_user.user_id, workout.name, workout.description
+    )
+
+
+@router.delete("/{workout_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_workout_plan(
+    workout_id: int,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    service = WorkoutService(WorkoutRepository(db))
+    await service.delete_workout_plan(workout_id, current_user.user_id)
+
+
+@router.post(
+    "/{workout_id}/exercises",
+    response_model=WorkoutPlanExerciseResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_exercise_to_plan(
+    workout_id: int,
+    exercise: WorkoutPlanExerciseCreate,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    service = WorkoutService(WorkoutRepository(db))
+    return await service.add_exercise_to_plan(workout_id, current_user.user_id, exercise)
+
+
+@router.delete(
+    "/{workout_id}/exercises/{exercise_id}", status_code=status.HTTP_204_NO_CONTENT
+)
+async def remove_exercise_from_plan(
+    workout_id: int,
+    exercise_id: int,
+    current_user: TokenData = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    service = WorkoutService(WorkoutRepository(db))
+    await service.remove_exercise_from_plan(workout_id, current_user.user_id, exercise_id)
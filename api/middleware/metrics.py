@@ -0,0 +1,40 @@
+import time
+from api.utils.metrics import http_request_duration
+
+
+class MetricsMiddleware:
+    """Records the latency of every HTTP request by method, route and status.
+
+    Plain ASGI rather than BaseHTTPMiddleware: no extra task per request,
+    and streaming responses pass through untouched. The route is the
+    matched path template (``/workouts/{workout_id}``), never the raw
+    path, so label values stay bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                str(status),
+            )
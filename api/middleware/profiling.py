@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import random
+import sys
+import time
+from starlette.concurrency import run_in_threadpool
+from api.config import (
+    PROFILING_DIR,
+    PROFILING_ENABLED,
+    PROFILING_INTERVAL,
+    PROFILING_KEEP,
+    PROFILING_MAX_PER_MINUTE,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_SECRET,
+)
+from api.utils.profiler import (
+    RequestProfile,
+    Sampler,
+    activate,
+    deactivate,
+    prune_profiles,
+    verify_token,
+)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """Profiles a sample of requests, or any request with a signed header.
+
+    A signed header is valid for one request path until it expires, and no
+    more than ``max_per_minute`` requests are profiled per process, so a
+    leaked token cannot turn every request into a profiled one. A profiled
+    request gets an ``X-Profile-Id`` response header naming the files
+    written to ``directory`` (see api.utils.profiler), which keeps the
+    newest ``keep`` profiles. Requests that are not selected cost one random
+    draw and one header scan.
+    """
+
+    def __init__(
+        self,
+        app,
+        enabled: bool = PROFILING_ENABLED,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        secret: str | None = PROFILING_SECRET,
+        directory: str = PROFILING_DIR,
+        interval: float = PROFILING_INTERVAL,
+        keep: int = PROFILING_KEEP,
+        max_per_minute: int = PROFILING_MAX_PER_MINUTE,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate if enabled else 0.0
+        self.secret = secret
+        self.directory = directory
+        self.keep = keep
+        self.max_per_minute = max_per_minute
+        self.sampler = Sampler(interval)
+        self._minute = None
+        self._profiled = 0  # in the current minute
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (self._selected(scope) and self._within_budget()):
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        profile = RequestProfile(asyncio.current_task(), sys._getframe(), label)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (PROFILE_ID_HEADER, profile.id.encode()),
+                ]
+            await send(message)
+
+        token = activate(profile)
+        self.sampler.start(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.sampler.stop(profile)
+            deactivate(token)
+            route = scope.get("route")
+            try:
+                await run_in_threadpool(
+                    self._write, profile, route=getattr(route, "path", None), status=status
+                )
+            except OSError as e:
+                logger.warning("Profile %s not written: %s", profile.id, e)
+
+    def _write(self, profile: RequestProfile, **details) -> None:
+        profile.write(self.directory, **details)
+        prune_profiles(self.directory, self.keep)
+
+    def _selected(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if self.secret:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return verify_token(self.secret, value.decode("latin-1"), scope["path"])
+        return False
+
+    def _within_budget(self) -> bool:
+        minute = int(time.monotonic() // 60)
+        if minute != self._minute:
+            self._minute, self._profiled = minute, 0
+        if self._profiled >= self.max_per_minute:
+            return False
+        self._profiled += 1
+        return True
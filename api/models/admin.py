@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class StatementStats(BaseModel):
+    statement: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    rows: int
+    slow_calls: int
+    plan: Optional[List[str]] = None
+    last_slow_params: Optional[str] = None
+
+class QueryStatsReport(BaseModel):
+    """Costliest normalized statements seen by this worker process"""
+    slow_query_ms: float
+    sort: str
+    statements: List[StatementStats]
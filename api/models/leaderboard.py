@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str] = None
+    score: float
+
+class Leaderboard(BaseModel):
+    """Total training volume per user for one week (Monday start)"""
+    week: date
+    exercise_id: Optional[int] = None
+    size: int
+    entries: List[LeaderboardEntry]
+    me: Optional[LeaderboardEntry] = None
@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+class VolumeBucket(BaseModel):
+    """Training volume (sets x reps x weight) in one day or week"""
+    period_start: date
+    exercise_id: Optional[int] = None
+    muscle_group: Optional[str] = None
+    sets: int
+    reps: int
+    volume: float
+
+class VolumeReport(BaseModel):
+    period: str
+    group_by: str
+    start: date
+    end: date
+    buckets: List[VolumeBucket]
+
+class PersonalRecord(BaseModel):
+    exercise_id: int
+    max_weight: float
+    max_weight_date: date
+    max_reps: int
+    best_e1rm: Optional[float] = None
+    best_e1rm_date: Optional[date] = None
+    best_set_volume: float
+
+class E1RMPoint(BaseModel):
+    date: date
+    e1rm: float
+    rolling_mean: float
+
+class E1RMTrend(BaseModel):
+    exercise_id: int
+    formula: str
+    window: int
+    points: List[E1RMPoint]
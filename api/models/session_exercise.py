@@ -1,17 +1,17 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class SessionExerciseBase(BaseModel):
-    session_id: int
     exercise_id: int
-    sets_completed: Optional[int] = None
-    reps_completed: Optional[int] = None
-    weight_used: Optional[float] = None
+    sets_completed: Optional[int] = Field(None, ge=0)
+    reps_completed: Optional[int] = Field(None, ge=0)
+    weight_used: Optional[float] = Field(None, ge=0)
     notes: Optional[str] = None
 
 class SessionExerciseCreate(SessionExerciseBase):
+    """Request model; the session is the one it is nested in"""
     pass
 
 class SessionExerciseResponse(SessionExerciseBase):
     id: int
-    
+    session_id: int
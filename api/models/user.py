@@ -21,12 +21,29 @@ class UserResponse(BaseModel):
     email: EmailStr
     created_at: Optional[datetime] = None
     
+class UserCredentials(BaseModel):
+    """Internal model for login: the stored hash, never returned to clients"""
+    id: int
+    email: EmailStr
+    password_hash: str
+
 class Token(BaseModel):
     """Response model for JWT Token"""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    """Request model for exchanging a refresh token"""
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    """Request model for logout; the refresh token's family is revoked too"""
+    refresh_token: Optional[str] = None
     
 class TokenData(BaseModel):
     """Data extracted from JWT Token"""
     user_id: Optional[int] = None
-    email: Optional[str] = None
\ No newline at end of file
+    email: Optional[str] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
\ No newline at end of file
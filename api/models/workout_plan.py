@@ -1,13 +1,19 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from api.models.workout_plan_exercise import WorkoutPlanExerciseResponse
 
 class WorkoutPlanBase(BaseModel):
-    user_id: int
     name: str
     description: Optional[str] = None
 
 class WorkoutPlanCreate(WorkoutPlanBase):
+    """Request model; the owner comes from the access token"""
+    pass
+
+class WorkoutPlanUpdate(WorkoutPlanBase):
     pass
 
-class workoutPlanResponse(WorkoutPlanBase):
-    id: int
\ No newline at end of file
+class WorkoutPlanResponse(WorkoutPlanBase):
+    id: int
+    user_id: int
+    exercises: List[WorkoutPlanExerciseResponse] = []
@@ -2,15 +2,16 @@ from pydantic import BaseModel
 from typing import Optional
 
 class WorkoutPlanExerciseBase(BaseModel):
-    workout_plan_id: int
     exercise_id: int
-    sets: int
+    sets: int = 1
     reps: Optional[int] = None
     weight: Optional[float] = None
     notes: Optional[str] = None
     
 class WorkoutPlanExerciseCreate(WorkoutPlanExerciseBase):
+    """Request model; the plan comes from the URL"""
     pass
 
 class WorkoutPlanExerciseResponse(WorkoutPlanExerciseBase):
-    id: int
\ No newline at end of file
+    id: int
+    workout_plan_id: int
@@ -1,9 +1,9 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
 from datetime import datetime
+from api.models.session_exercise import SessionExerciseCreate
 
 class WorkoutSessionBase(BaseModel):
-    user_id: int
     workout_plan_id: int
     scheduled_date: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -11,8 +11,24 @@ class WorkoutSessionBase(BaseModel):
     notes: Optional[str] = None
     
 class WorkoutSessionCreate(WorkoutSessionBase):
-    pass
+    """Request model; the owner comes from the access token"""
+    exercises: List[SessionExerciseCreate] = []
 
-class workoutSessionResponse(WorkoutSessionBase)
+class WorkoutSessionResponse(WorkoutSessionBase):
     id: int
-    
+    user_id: int
+
+class BulkSessionUpload(BaseModel):
+    """Batch upload; items are validated one by one so one bad item
+    does not reject the rest"""
+    sessions: List[Any] = Field(..., min_length=1)
+
+class BulkSessionError(BaseModel):
+    index: int
+    errors: List[str]
+
+class BulkSessionResult(BaseModel):
+    created: int
+    session_ids: List[int]
+    errors: List[BulkSessionError] = []
+    replayed: bool = False
@@ -1,13 +1,99 @@
+import re
 from api.models.exercise import ExerciseCreate, ExerciseResponse
+from database.statements import CATALOG_VERSION, EXERCISE_BY_ID, EXERCISE_SEARCH
+
+EXERCISE_COLUMNS = ("id", "name", "description", "category", "muscle_group")
+
+# bm25 column weights: a hit in the name counts ten times one in the description
+SEARCH_WEIGHTS = (10.0, 1.0)
+
+
+def to_prefix_query(text: str) -> str | None:
+    """Turns free text into an FTS5 query matching every word as a prefix.
+
+    Each word is quoted, so FTS5 operators and syntax characters typed by
+    the user are searched for literally instead of being interpreted.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
 
 
 class ExerciseRepository:
-    def __init__(self, db):
+    def __init__(self, db, cache=None):
         self.db = db
+        self.cache = cache
 
     async def get_all_exercises(self) -> list[ExerciseResponse]:
-        cursor = self.db.cursor()
-        rows = cursor.execute("SELECT * FROM exercises").fetchall()
+        if self.cache is not None:
+            snapshot = self.cache.get()
+            if snapshot:
+                return list(snapshot.exercises)
+            version = self.cache.version
+            # Read first: a write landing before the rows only costs a reload
+            source_version = await self.get_catalog_version()
+
+        rows = await self.db.fetchall("SELECT * FROM exercises")
+
+        exercises = [
+            ExerciseResponse(
+                id=row["id"],
+                name=row["name"],
+                description=row["description"],
+                category=row["category"],
+                muscle_group=row["muscle_group"],
+            )
+            for row in rows
+        ]
+
+        if self.cache is not None:
+            self.cache.store(exercises, version, source_version)
+
+        return exercises
+
+    async def get_catalog_version(self) -> int:
+        """Bumped by every change to the exercises table, from any process"""
+        row = await self.db.fetchone(CATALOG_VERSION)
+        return row[0]
+
+    async def get_exercises_page(
+        self,
+        category: str | None = None,
+        muscle_group: str | None = None,
+        after_id: int = 0,
+        limit: int = 50,
+        columns=EXERCISE_COLUMNS,
+    ) -> list[dict]:
+        """Keyset page of the catalog in id order, optionally filtered and projected"""
+        # Column names come from the EXERCISE_COLUMNS whitelist, never from
+        # the request directly.
+        selected = ", ".join(c for c in EXERCISE_COLUMNS if c in columns or c == "id")
+        conditions = ["id > ?"]
+        params = [after_id]
+
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if muscle_group is not None:
+            conditions.append("muscle_group = ?")
+            params.append(muscle_group)
+
+        rows = await self.db.fetchall(
+            f"SELECT {selected} FROM exercises WHERE {' AND '.join(conditions)} "
+            "ORDER BY id LIMIT ?",
+            (*params, limit),
+        )
+
+        return [dict(row) for row in rows]
+
+    async def search_exercises(self, text: str, limit: int = 20) -> list[ExerciseResponse]:
+        """Type-ahead search over name and description, best matches first"""
+        match = to_prefix_query(text)
+        if match is None:
+            return []
+
+        rows = await self.db.fetchall(EXERCISE_SEARCH, (match, *SEARCH_WEIGHTS, limit))
 
         return [
             ExerciseResponse(
@@ -21,10 +107,12 @@ class ExerciseRepository:
         ]
 
     async def get_exercise_by_id(self, exercise_id: int) -> ExerciseResponse | None:
-        cursor = self.db.cursor()
-        row = cursor.execute(
-            "SELECT * FROM exercises WHERE id = ?", (exercise_id,)
-        ).fetchone()
+        if self.cache is not None:
+            snapshot = self.cache.get()
+            if snapshot:
+                return snapshot.by_id.get(exercise_id)
+
+        row = await self.db.fetchone(EXERCISE_BY_ID, (exercise_id,))
 
         if row:
             return ExerciseResponse(
@@ -36,3 +124,20 @@ class ExerciseRepository:
             )
 
         return None
+
+    async def create_exercise(self, exercise: ExerciseCreate) -> ExerciseResponse:
+        cursor = await self.db.execute(
+            "INSERT INTO exercises (name, description, category, muscle_group) VALUES (?, ?, ?, ?)",
+            (
+                exercise.name,
+                exercise.description,
+                exercise.category,
+                exercise.muscle_group,
+            ),
+        )
+        await self.db.commit()
+
+        if self.cache is not None:
+            self.cache.invalidate()
+
+        return ExerciseResponse(id=cursor.lastrowid, **exercise.model_dump())
@@ -0,0 +1,49 @@
+import json
+from typing import Optional
+
+
+class LeaderboardRepository:
+    """Leaderboard scores, read from the weekly volume rollup.
+
+    volume_weekly already holds each user's volume per week and exercise
+    and is updated by every session write, so it doubles as the score table.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_board_scores(
+        self, week: str, exercise_id: Optional[int] = None
+    ) -> list[tuple[int, float]]:
+        """``(user_id, score)`` for everyone on one board"""
+        if exercise_id is None:
+            rows = await self.db.fetchall(
+                "SELECT user_id, SUM(volume) FROM volume_weekly "
+                "WHERE week = ? GROUP BY user_id",
+                (week,),
+            )
+        else:
+            rows = await self.db.fetchall(
+                "SELECT user_id, volume FROM volume_weekly "
+                "WHERE week = ? AND exercise_id = ?",
+                (week, exercise_id),
+            )
+        return [(row[0], row[1]) for row in rows]
+
+    async def get_user_scores(
+        self, user_id: int, weeks
+    ) -> list[tuple[str, int, float]]:
+        """``(week, exercise_id, volume)`` rows of one user for some weeks"""
+        rows = await self.db.fetchall(
+            "SELECT week, exercise_id, volume FROM volume_weekly "
+            "WHERE user_id = ? AND week IN (SELECT value FROM json_each(?))",
+            (user_id, json.dumps(sorted(set(weeks)))),
+        )
+        return [(row[0], row[1], row[2]) for row in rows]
+
+    async def get_usernames(self, user_ids) -> dict[int, str]:
+        rows = await self.db.fetchall(
+            "SELECT id, username FROM users WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(sorted(set(user_ids))),),
+        )
+        return {row[0]: row[1] for row in rows}
@@ -0,0 +1,115 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Optional
+from database.statements import REFRESH_TOKEN_BY_HASH
+
+
+@dataclass(frozen=True)
+class RotationResult:
+    """Outcome of presenting a refresh token"""
+
+    status: str  # "rotated", "unknown", "expired" or "reused"
+    user_id: Optional[int] = None
+    email: Optional[str] = None
+
+
+class RefreshTokenRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def create_refresh_token(
+        self, user_id: int, token_hash: bytes, family_id: str, expires_at: int
+    ) -> None:
+        await self.db.execute(
+            """
+            INSERT INTO refresh_tokens (user_id, token_hash, family_id, expires_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (user_id, token_hash, family_id, expires_at),
+        )
+        await self.db.commit()
+
+    async def rotate_refresh_token(
+        self, token_hash: bytes, new_hash: bytes, expires_at: int
+    ) -> RotationResult:
+        """Atomically spends ``token_hash`` and stores ``new_hash`` in its family"""
+        return await self.db.run(_rotate, token_hash, new_hash, expires_at, int(time.time()))
+
+    async def revoke_family_of(self, token_hash: bytes) -> None:
+        await self.db.execute(
+            """
+            UPDATE refresh_tokens SET revoked_at = ?
+            WHERE revoked_at IS NULL AND family_id = (
+                SELECT family_id FROM refresh_tokens WHERE token_hash = ?
+            )
+            """,
+            (int(time.time()), token_hash),
+        )
+        await self.db.commit()
+
+    async def revoke_access_token(self, jti: str, expires_at: int) -> None:
+        await self.db.execute(
+            "INSERT OR IGNORE INTO revoked_access_tokens (jti, expires_at) VALUES (?, ?)",
+            (jti, expires_at),
+        )
+        await self.db.commit()
+
+    async def get_revoked_access_tokens(self, after_id: int = 0) -> list[tuple[int, str, int]]:
+        """``(id, jti, expires_at)`` of revocations recorded after ``after_id``,
+        oldest first. Read-only, so it can run on the read pool."""
+        rows = await self.db.fetchall(
+            "SELECT id, jti, expires_at FROM revoked_access_tokens WHERE id > ? ORDER BY id",
+            (after_id,),
+        )
+        return [(row[0], row[1], row[2]) for row in rows]
+
+    async def prune_revoked_access_tokens(self) -> int:
+        """Deletes revocations of tokens that have expired anyway"""
+        cursor = await self.db.execute(
+            "DELETE FROM revoked_access_tokens WHERE expires_at <= ?", (int(time.time()),)
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+
+def _rotate(conn, token_hash, new_hash, expires_at, now) -> RotationResult:
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(REFRESH_TOKEN_BY_HASH, (token_hash,)).fetchone()
+
+        if row is None:
+            conn.rollback()
+            return RotationResult("unknown")
+
+        token_id, user_id, family_id, token_expires_at, revoked_at, email = row
+
+        if revoked_at is not None:
+            # A spent token came back: someone holds a copy. Kill the family.
+            conn.execute(
+                "UPDATE refresh_tokens SET revoked_at = ? "
+                "WHERE family_id = ? AND revoked_at IS NULL",
+                (now, family_id),
+            )
+            conn.commit()
+            return RotationResult("reused", user_id)
+
+        if token_expires_at <= now:
+            conn.rollback()
+            return RotationResult("expired", user_id)
+
+        conn.execute(
+            "UPDATE refresh_tokens SET revoked_at = ? WHERE id = ?", (now, token_id)
+        )
+        conn.execute(
+            """
+            INSERT INTO refresh_tokens (user_id, token_hash, family_id, expires_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (user_id, new_hash, family_id, expires_at),
+        )
+        conn.commit()
+        return RotationResult("rotated", user_id, email)
+    except sqlite3.Error:
+        conn.rollback()
+        raise
@@ -0,0 +1,162 @@
+import sqlite3
+from api.models.report import VolumeBucket
+from api.utils.analytics import LiftHistory
+
+# Upserts the rollup rows for a contiguous range of freshly written
+# session ids. Runs inside the session write transaction, so reports are
+# never behind (or ahead of) the raw history.
+_ROLLUP_DAILY = """
+    INSERT INTO volume_daily (user_id, day, exercise_id, muscle_group, sets, reps, volume)
+    SELECT s.user_id,
+           date(COALESCE(s.completed_at, s.scheduled_date)),
+           se.exercise_id, e.muscle_group,
+           SUM(COALESCE(se.sets_completed, 1)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)
+               * COALESCE(se.weight_used, 0))
+    FROM workout_sessions s
+    JOIN sessions_exercises se ON se.session_id = s.id
+    JOIN exercises e ON e.id = se.exercise_id
+    WHERE s.id BETWEEN ? AND ?
+      AND s.status = 'completed'
+      AND COALESCE(s.completed_at, s.scheduled_date) IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (user_id, day, exercise_id) DO UPDATE SET
+        sets = sets + excluded.sets,
+        reps = reps + excluded.reps,
+        volume = volume + excluded.volume
+"""
+
+_ROLLUP_WEEKLY = """
+    INSERT INTO volume_weekly (user_id, week, exercise_id, muscle_group, sets, reps, volume)
+    SELECT s.user_id,
+           date(COALESCE(s.completed_at, s.scheduled_date), 'weekday 0', '-6 days'),
+           se.exercise_id, e.muscle_group,
+           SUM(COALESCE(se.sets_completed, 1)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)
+               * COALESCE(se.weight_used, 0))
+    FROM workout_sessions s
+    JOIN sessions_exercises se ON se.session_id = s.id
+    JOIN exercises e ON e.id = se.exercise_id
+    WHERE s.id BETWEEN ? AND ?
+      AND s.status = 'completed'
+      AND COALESCE(s.completed_at, s.scheduled_date) IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (user_id, week, exercise_id) DO UPDATE SET
+        sets = sets + excluded.sets,
+        reps = reps + excluded.reps,
+        volume = volume + excluded.volume
+"""
+
+# A user's completed sets as plain numeric tuples, dated by the day they
+# count towards (a session never completed by its schedule). Every column
+# is non-NULL: a date SQLite cannot parse drops the row rather than
+# leaving a hole in the arrays. Unordered; LiftHistory sorts the arrays.
+_LIFT_HISTORY = """
+    SELECT exercise_id, day, sets, reps, weight
+    FROM (
+        SELECT se.exercise_id,
+               CAST(julianday(COALESCE(s.completed_at, s.scheduled_date))
+                    - 2440587.5 AS INTEGER) AS day,
+               COALESCE(se.sets_completed, 1) AS sets,
+               COALESCE(se.reps_completed, 0) AS reps,
+               COALESCE(se.weight_used, 0) AS weight
+        FROM workout_sessions s
+        JOIN sessions_exercises se ON se.session_id = s.id
+        WHERE s.user_id = ?
+          AND s.status = 'completed'
+    )
+    WHERE day IS NOT NULL
+"""
+
+# period -> (table, bucket column)
+ROLLUP_TABLES = {
+    "daily": ("volume_daily", "day"),
+    "weekly": ("volume_weekly", "week"),
+}
+
+# group_by -> extra key columns
+GROUPINGS = {
+    "total": (),
+    "exercise": ("exercise_id",),
+    "muscle_group": ("muscle_group",),
+}
+
+
+def apply_session_rollups(conn, first_session_id: int, last_session_id: int) -> None:
+    """Folds sessions ``first..last`` into the rollups (caller owns the transaction)"""
+    params = (first_session_id, last_session_id)
+    conn.execute(_ROLLUP_DAILY, params)
+    conn.execute(_ROLLUP_WEEKLY, params)
+
+
+def _load_lift_history(conn, user_id: int) -> LiftHistory:
+    cursor = conn.cursor()
+    # Plain tuples: NumPy reads them straight into a record array
+    cursor.row_factory = None
+    return LiftHistory.from_records(cursor.execute(_LIFT_HISTORY, (user_id,)))
+
+
+def rebuild_volume_rollups(conn) -> None:
+    """Recomputes both rollups from the raw history in one transaction"""
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM volume_daily")
+        conn.execute("DELETE FROM volume_weekly")
+        last = conn.execute("SELECT COALESCE(MAX(id), 0) FROM workout_sessions").fetchone()[0]
+        apply_session_rollups(conn, 0, last)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+
+class ReportRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def get_volume(
+        self,
+        user_id: int,
+        period: str,
+        group_by: str,
+        start: str,
+        end: str,
+    ) -> list[VolumeBucket]:
+        """Volume buckets in ``[start, end]``; reads only rollup rows"""
+        # Table and column names come from the whitelists above
+        table, bucket = ROLLUP_TABLES[period]
+        keys = GROUPINGS[group_by]
+        key_columns = "".join(f", {key}" for key in keys)
+
+        rows = await self.db.fetchall(
+            f"""
+            SELECT {bucket}{key_columns}, SUM(sets), SUM(reps), SUM(volume)
+            FROM {table}
+            WHERE user_id = ? AND {bucket} BETWEEN ? AND ?
+            GROUP BY {bucket}{key_columns}
+            ORDER BY {bucket}{key_columns}
+            """,
+            (user_id, start, end),
+        )
+
+        buckets = []
+        for row in rows:
+            values = dict(zip(keys, row[1 : 1 + len(keys)]))
+            sets, reps, volume = row[1 + len(keys) :]
+            buckets.append(
+                VolumeBucket(
+                    period_start=row[0],
+                    exercise_id=values.get("exercise_id"),
+                    muscle_group=values.get("muscle_group"),
+                    sets=sets,
+                    reps=reps,
+                    volume=volume,
+                )
+            )
+        return buckets
+
+    async def get_lift_history(self, user_id: int) -> LiftHistory:
+        """A user's completed sets as columnar arrays, loaded in one query"""
+        return await self.db.run(_load_lift_history, user_id)
@@ -0,0 +1,258 @@
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from api.models.workout_session import WorkoutSessionCreate
+from api.repositories.report_repository import apply_session_rollups
+from database.statements import IDEMPOTENT_RESPONSE
+
+
+HISTORY_COLUMNS = (
+    "session_id",
+    "workout_plan_id",
+    "scheduled_date",
+    "completed_at",
+    "status",
+    "session_notes",
+    "exercise_id",
+    "exercise_name",
+    "category",
+    "muscle_group",
+    "sets_completed",
+    "reps_completed",
+    "weight_used",
+    "exercise_notes",
+)
+
+# One keyset page of a user's history: the next ``limit`` sessions in
+# (completed_at, id) order, found by a seek on
+# idx_workout_sessions_user_completed (rowid included), with all of their
+# exercise rows. Only the page is sorted. completed_at is NULL for sessions
+# never completed; those sort first and are paged by id alone.
+_HISTORY_PAGE = """
+    SELECT
+        s.id, s.workout_plan_id, s.scheduled_date, s.completed_at, s.status, s.notes,
+        se.exercise_id, e.name, e.category, e.muscle_group,
+        se.sets_completed, se.reps_completed, se.weight_used, se.notes
+    FROM (
+        SELECT id, workout_plan_id, scheduled_date, completed_at, status, notes
+        FROM workout_sessions
+        WHERE user_id = ? AND {after}
+        ORDER BY completed_at, id
+        LIMIT ?
+    ) s
+    LEFT JOIN sessions_exercises se ON se.session_id = s.id
+    LEFT JOIN exercises e ON e.id = se.exercise_id
+    ORDER BY s.completed_at, s.id, se.id
+"""
+HISTORY_FIRST_PAGE_SQL = _HISTORY_PAGE.format(after="1")
+HISTORY_PAGE_AFTER_NULL_SQL = _HISTORY_PAGE.format(
+    after="((completed_at IS NULL AND id > ?) OR completed_at IS NOT NULL)"
+)
+HISTORY_PAGE_AFTER_SQL = _HISTORY_PAGE.format(after="(completed_at, id) > (?, ?)")
+
+
+class IdempotencyKeyMismatch(Exception):
+    """Raised when an idempotency key is reused for a different request"""
+
+
+@dataclass(frozen=True)
+class Idempotency:
+    key: str
+    request_hash: bytes
+    expires_before: int  # records created before this are treated as gone
+
+
+class SessionRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def get_owned_plan_ids(self, user_id: int, plan_ids) -> set[int]:
+        rows = await self.db.fetchall(
+            "SELECT id FROM workout_plans "
+            "WHERE user_id = ? AND id IN (SELECT value FROM json_each(?))",
+            (user_id, json.dumps(sorted(set(plan_ids)))),
+        )
+        return {row[0] for row in rows}
+
+    async def get_existing_exercise_ids(self, exercise_ids) -> set[int]:
+        exercise_ids = sorted(set(exercise_ids))
+        if not exercise_ids:
+            return set()
+
+        # One bound JSON array instead of one parameter per id
+        rows = await self.db.fetchall(
+            "SELECT id FROM exercises WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(exercise_ids),),
+        )
+        return {row[0] for row in rows}
+
+    async def get_idempotent_response(
+        self, user_id: int, idempotency: Idempotency
+    ) -> Optional[dict]:
+        """The stored response for a key, or None; raises on payload mismatch"""
+        row = await self.db.fetchone(
+            IDEMPOTENT_RESPONSE, (user_id, idempotency.key, idempotency.expires_before)
+        )
+        return _replay(row, idempotency)
+
+    async def get_history_page(
+        self, user_id: int, after: tuple | None = None, limit: int = 100
+    ) -> list[sqlite3.Row]:
+        """Rows for the ``limit`` sessions following the ``after`` key, a
+        ``(completed_at, session_id)`` pair as returned by ``history_key``"""
+        if after is None:
+            return await self.db.fetchall(HISTORY_FIRST_PAGE_SQL, (user_id, limit))
+        completed_at, session_id = after
+        if completed_at is None:
+            return await self.db.fetchall(
+                HISTORY_PAGE_AFTER_NULL_SQL, (user_id, session_id, limit)
+            )
+        return await self.db.fetchall(
+            HISTORY_PAGE_AFTER_SQL, (user_id, completed_at, session_id, limit)
+        )
+
+    async def bulk_create_sessions(
+        self,
+        user_id: int,
+        sessions: list[WorkoutSessionCreate],
+        errors: list[dict],
+        idempotency: Optional[Idempotency] = None,
+    ) -> tuple[dict, bool]:
+        """Writes every session and its exercises in one transaction.
+
+        Returns the response body ``{"session_ids": [...], "errors": errors}``
+        and whether it was replayed from an earlier request with the same
+        idempotency key.
+        """
+        return await self.db.run(_bulk_create, user_id, sessions, errors, idempotency)
+
+
+def history_key(row) -> tuple:
+    """The keyset position of a history row: ``(completed_at, session_id)``"""
+    return row[3], row[0]
+
+
+def _bulk_create(conn, user_id, sessions, errors, idempotency):
+    try:
+        # Take the write lock first: the id range below and the idempotency
+        # check must not race another writer.
+        conn.execute("BEGIN IMMEDIATE")
+
+        if idempotency is not None:
+            conn.execute(
+                "DELETE FROM idempotency_keys WHERE user_id = ? AND created_at < ?",
+                (user_id, idempotency.expires_before),
+            )
+            row = conn.execute(
+                "SELECT request_hash, response FROM idempotency_keys "
+                "WHERE user_id = ? AND key = ?",
+                (user_id, idempotency.key),
+            ).fetchone()
+            replayed = _replay(row, idempotency)
+            if replayed is not None:
+                conn.commit()
+                return replayed, True
+
+        # executemany cannot report lastrowid per row, so ids are handed out
+        # up front from a range nobody else can claim while we hold the lock
+        first_id = _next_id(conn, "workout_sessions")
+        session_ids = list(range(first_id, first_id + len(sessions)))
+
+        conn.executemany(
+            """
+            INSERT INTO workout_sessions
+                (id, workout_plan_id, user_id, scheduled_date, completed_at, status, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    session_id,
+                    session.workout_plan_id,
+                    user_id,
+                    _timestamp(session.scheduled_date),
+                    _timestamp(session.completed_at),
+                    session.status,
+                    session.notes,
+                )
+                for session_id, session in zip(session_ids, sessions)
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO sessions_exercises
+                (session_id, exercise_id, sets_completed, reps_completed, weight_used, notes)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    session_id,
+                    exercise.exercise_id,
+                    exercise.sets_completed,
+                    exercise.reps_completed,
+                    exercise.weight_used,
+                    exercise.notes,
+                )
+                for session_id, session in zip(session_ids, sessions)
+                for exercise in session.exercises
+            ],
+        )
+
+        apply_session_rollups(conn, session_ids[0], session_ids[-1])
+
+        response = {"session_ids": session_ids, "errors": errors}
+        if idempotency is not None:
+            conn.execute(
+                """
+                INSERT INTO idempotency_keys
+                    (user_id, key, request_hash, response, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    user_id,
+                    idempotency.key,
+                    idempotency.request_hash,
+                    json.dumps(response),
+                    int(time.time()),
+                ),
+            )
+
+        conn.commit()
+        return response, False
+    except (sqlite3.Error, IdempotencyKeyMismatch):
+        conn.rollback()
+        raise
+
+
+def _replay(row, idempotency: Idempotency) -> Optional[dict]:
+    if row is None:
+        return None
+    if row[0] != idempotency.request_hash:
+        raise IdempotencyKeyMismatch(idempotency.key)
+    return json.loads(row[1])
+
+
+def _next_id(conn, table: str) -> int:
+    # AUTOINCREMENT never reuses ids, so respect sqlite_sequence as well as
+    # the current maximum
+    row = conn.execute(
+        f"""
+        SELECT MAX(
+            COALESCE((SELECT MAX(id) FROM {table}), 0),
+            COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0)
+        ) + 1
+        """,
+        (table,),
+    ).fetchone()
+    return row[0]
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    """Stores datetimes as UTC in SQLite's CURRENT_TIMESTAMP format"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
@@ -1,30 +1,60 @@
-from api.models.user import UserResponse
-from api.utils.security import hash_password
+import sqlite3
+from api.models.user import UserCredentials, UserResponse
+from database.statements import USER_BY_EMAIL, USER_CREDENTIALS_BY_EMAIL
 from typing import Optional
 
 
+class UserAlreadyExistsError(Exception):
+    """Raised when an insert hits the UNIQUE constraint on username or email"""
+
+    def __init__(self, field: str):
+        super().__init__(f"{field} already exists")
+        self.field = field
+
+
 class UserRepository:
     def __init__(self, db):
         self.db = db
 
     async def create_user(
-        self, username: str, email: str, password: str
+        self, username: str, email: str, password_hash: str
     ) -> UserResponse:
-        cursor = self.db.cursor()
-        cursor.execute(
-            "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
-            (username, email, hash_password(password)),
-        )
-        self.db.commit()
+        # No pre-check SELECT: the UNIQUE constraints decide, atomically
+        try:
+            cursor = await self.db.execute(
+                "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                (username, email, password_hash),
+            )
+            await self.db.commit()
+        except sqlite3.IntegrityError as exc:
+            await self.db.rollback()
+            # Any other violation (e.g. NOT NULL) is not a duplicate
+            for field in ("username", "email"):
+                if str(exc) == f"UNIQUE constraint failed: users.{field}":
+                    raise UserAlreadyExistsError(field) from exc
+            raise
+
         user_id = cursor.lastrowid
         return UserResponse(id=user_id, username=username, email=email)
 
-    async def get_user_by_email(self, email: str) -> Optional[UserResponse]:
-        cursor = self.db.cursor()
-        cursor.execute(
-            "SELECT id, username, email FROM users WHERE email = ?", (email,)
+    async def get_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        # Served by the UNIQUE index on users.email
+        row = await self.db.fetchone(USER_CREDENTIALS_BY_EMAIL, (email,))
+
+        if not row:
+            return None
+
+        return UserCredentials(id=row[0], email=row[1], password_hash=row[2])
+
+    async def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        await self.db.execute(
+            "UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (password_hash, user_id),
         )
-        row = cursor.fetchone()
+        await self.db.commit()
+
+    async def get_user_by_email(self, email: str) -> Optional[UserResponse]:
+        row = await self.db.fetchone(USER_BY_EMAIL, (email,))
 
         if not row:
             return None
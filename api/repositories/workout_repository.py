@@ -0,0 +1,171 @@
+import sqlite3
+from collections import defaultdict
+from api.models.workout_plan import WorkoutPlanResponse
+from api.models.workout_plan_exercise import (
+    WorkoutPlanExerciseCreate,
+    WorkoutPlanExerciseResponse,
+)
+from typing import Optional
+from database.statements import (
+    PLAN_BY_ID,
+    PLAN_EXERCISE_COLUMNS,
+    PLAN_EXERCISES_BY_PLAN,
+    PLAN_EXERCISES_BY_USER,
+    PLANS_BY_USER,
+)
+
+
+class WorkoutPlanInUseError(Exception):
+    """Raised when deleting a plan that recorded sessions still point to"""
+
+
+class WorkoutRepository:
+    """Workout plans and the exercises in them.
+
+    Plans are always loaded with their exercises in exactly two queries,
+    however many plans there are: one for the plans, one for all of their
+    exercises, grouped in Python.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_all_workout_plans_by_user(self, user_id: int) -> list[WorkoutPlanResponse]:
+        plans = await self.db.fetchall(PLANS_BY_USER, (user_id,))
+        if not plans:
+            return []
+
+        exercises = await self.db.fetchall(PLAN_EXERCISES_BY_USER, (user_id,))
+        return _assemble(plans, exercises)
+
+    async def get_workout_plan_by_id(
+        self, workout_id: int, user_id: int
+    ) -> Optional[WorkoutPlanResponse]:
+        plan = await self.db.fetchone(PLAN_BY_ID, (workout_id, user_id))
+        if not plan:
+            return None
+
+        return await self._with_exercises(plan)
+
+    async def create_workout_plan(
+        self, user_id: int, name: str, description: Optional[str] = None
+    ) -> Optional[WorkoutPlanResponse]:
+        try:
+            cursor = await self.db.execute(
+                "INSERT INTO workout_plans (user_id, name, description) VALUES (?, ?, ?)",
+                (user_id, name, description),
+            )
+            await self.db.commit()
+        except sqlite3.IntegrityError:
+            await self.db.rollback()
+            return None
+
+        return WorkoutPlanResponse(
+            id=cursor.lastrowid, user_id=user_id, name=name, description=description
+        )
+
+    async def update_workout_plan(
+        self, workout_id: int, user_id: int, name: str, description: Optional[str] = None
+    ) -> Optional[WorkoutPlanResponse]:
+        plan = await self.db.fetchone(
+            """
+            UPDATE workout_plans
+            SET name = ?, description = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND user_id = ?
+            RETURNING id, user_id, name, description
+            """,
+            (name, description, workout_id, user_id),
+        )
+        await self.db.commit()
+        if not plan:
+            return None
+
+        return await self._with_exercises(plan)
+
+    async def delete_workout_plan(self, workout_id: int, user_id: int) -> bool:
+        try:
+            # Explicit, so it does not depend on PRAGMA foreign_keys
+            await self.db.execute(
+                "DELETE FROM workout_plan_exercises WHERE workout_plan_id IN "
+                "(SELECT id FROM workout_plans WHERE id = ? AND user_id = ?)",
+                (workout_id, user_id),
+            )
+            cursor = await self.db.execute(
+                "DELETE FROM workout_plans WHERE id = ? AND user_id = ?",
+                (workout_id, user_id),
+            )
+            await self.db.commit()
+        except sqlite3.IntegrityError as exc:
+            await self.db.rollback()
+            raise WorkoutPlanInUseError(workout_id) from exc
+
+        return cursor.rowcount > 0
+
+    async def add_exercise_to_plan(
+        self, workout_id: int, exercise_data: WorkoutPlanExerciseCreate
+    ) -> Optional[WorkoutPlanExerciseResponse]:
+        try:
+            row = await self.db.fetchone(
+                f"""
+                INSERT INTO workout_plan_exercises
+                    (workout_plan_id, exercise_id, sets, reps, weight, notes)
+                SELECT ?, id, ?, ?, ?, ? FROM exercises WHERE id = ?
+                RETURNING {PLAN_EXERCISE_COLUMNS}
+                """,
+                (
+                    workout_id,
+                    exercise_data.sets,
+                    exercise_data.reps,
+                    exercise_data.weight,
+                    exercise_data.notes,
+                    exercise_data.exercise_id,
+                ),
+            )
+            await self.db.commit()
+        except sqlite3.IntegrityError:
+            await self.db.rollback()
+            return None
+
+        # No row: the exercise is not in the catalog
+        return _plan_exercise(row) if row else None
+
+    async def remove_exercise_from_plan(self, workout_id: int, exercise_id: int) -> bool:
+        cursor = await self.db.execute(
+            "DELETE FROM workout_plan_exercises WHERE workout_plan_id = ? AND exercise_id = ?",
+            (workout_id, exercise_id),
+        )
+        await self.db.commit()
+        return cursor.rowcount > 0
+
+    async def _with_exercises(self, plan) -> WorkoutPlanResponse:
+        exercises = await self.db.fetchall(PLAN_EXERCISES_BY_PLAN, (plan["id"],))
+        return _assemble([plan], exercises)[0]
+
+
+def _plan_exercise(row) -> WorkoutPlanExerciseResponse:
+    return WorkoutPlanExerciseResponse(
+        id=row["id"],
+        workout_plan_id=row["workout_plan_id"],
+        exercise_id=row["exercise_id"],
+        sets=row["sets"],
+        reps=row["reps"],
+        weight=row["weight"],
+        notes=row["notes"],
+    )
+
+
+def _assemble(plans, exercises) -> list[WorkoutPlanResponse]:
+    by_plan = defaultdict(list)
+    for row in exercises:
+        by_plan[row["workout_plan_id"]].append(_plan_exercise(row))
+
+    return [
+        WorkoutPlanResponse(
+            id=plan["id"],
+            user_id=plan["user_id"],
+            name=plan["name"],
+            description=plan["description"],
+            exercises=by_plan[plan["id"]],
+        )
+        for plan in plans
+    ]
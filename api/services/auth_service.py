@@ -1,57 +1,137 @@
-from api.models.user import UserCreate, UserResponse, UserLogin, Token
-from api.utils.security import hash_password
+import hashlib
+import secrets
+import time
+import uuid
+from api.models.user import UserCreate, UserResponse, UserLogin, Token, TokenData
+from api.repositories.user_repository import UserAlreadyExistsError
+from api.utils.security import PasswordHasherBusy, password_hasher
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
-from api.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from api.config import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from api.utils.denylist import access_token_denylist
+from api.utils.jwt_keys import get_key_ring
 
 class AuthService:
-    def __init__(self, user_repository):
+    def __init__(self, user_repository, refresh_token_repository=None):
         self.user_repository = user_repository
+        self.refresh_token_repository = refresh_token_repository
 
     async def create_user(self, user_data: UserCreate) -> UserResponse:
-        # Check if exists
-        existing_user = await self.user_repository.get_user_by_email(user_data.email)
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
-            )
-
-        # Hash pass
-        hashed_password = hash_password(user_data.password)
-
-        # Call repository to save user
-        user = await self.user_repository.create_user(
-            username=user_data.username,
-            email=user_data.email,
-            password=hashed_password,
+        # One hash, one INSERT; uniqueness is enforced by the constraint
+        hashed_password = await self._run_hasher(
+            password_hasher.hash_async(user_data.password)
         )
 
-        return user
+        try:
+            return await self.user_repository.create_user(
+                username=user_data.username,
+                email=user_data.email,
+                password_hash=hashed_password,
+            )
+        except UserAlreadyExistsError as exc:
+            detail = (
+                "Email already registered"
+                if exc.field == "email"
+                else "Username already taken"
+            )
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
     async def login(self, credentials: UserLogin) -> Token:
-        user = await self.user_repository.get_user_by_email(credentials.email)
+        user = await self.user_repository.get_credentials_by_email(credentials.email)
         if not user:
+            # Pay for a hash anyway, so the response time does not tell
+            # registered emails from unknown ones
+            await self._run_hasher(password_hasher.verify_dummy_async(credentials.password))
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
             )
 
         # check password
-        password = hash_password(credentials.password)
-        if user.password_hash != password:
+        valid = await self._run_hasher(
+            password_hasher.verify_async(credentials.password, user.password_hash)
+        )
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
             )
 
-        # Create JWT
+        # Upgrade legacy or outdated hashes while we hold the plain password
+        if password_hasher.needs_rehash(user.password_hash):
+            new_hash = await self._run_hasher(
+                password_hasher.hash_async(credentials.password)
+            )
+            await self.user_repository.update_password_hash(user.id, new_hash)
+
+        access_token = self._create_access_token(user.id, user.email)
+
+        refresh_token = None
+        if self.refresh_token_repository is not None:
+            refresh_token, refresh_hash = _new_refresh_token()
+            await self.refresh_token_repository.create_refresh_token(
+                user.id, refresh_hash, uuid.uuid4().hex, _refresh_expiry()
+            )
+
+        return Token(access_token=access_token, refresh_token=refresh_token)
+
+    async def refresh(self, refresh_token: str) -> Token:
+        """Spends a refresh token for a new access token and refresh token"""
+        new_token, new_hash = _new_refresh_token()
+        result = await self.refresh_token_repository.rotate_refresh_token(
+            _hash_refresh_token(refresh_token), new_hash, _refresh_expiry()
+        )
+
+        if result.status != "rotated":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token",
+            )
+
+        return Token(
+            access_token=self._create_access_token(result.user_id, result.email),
+            refresh_token=new_token,
+        )
+
+    async def logout(self, user: TokenData, refresh_token: str | None = None) -> None:
+        """Revokes the caller's access token and, if given, its refresh family"""
+        if user.jti is not None and user.exp is not None:
+            access_token_denylist.add(user.jti, user.exp)
+            await self.refresh_token_repository.revoke_access_token(user.jti, user.exp)
+
+        if refresh_token:
+            await self.refresh_token_repository.revoke_family_of(
+                _hash_refresh_token(refresh_token)
+            )
+
+    def _create_access_token(self, user_id: int, email: str) -> str:
         token_data = {
-            "user_id": user.id,
-            "email": user.email,
+            "user_id": user_id,
+            "email": email,
+            "jti": uuid.uuid4().hex,
             "exp": datetime.now(timezone.utc)
             + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
         }
+        return get_key_ring().sign(token_data)
+
+    async def _run_hasher(self, job):
+        try:
+            return await job
+        except PasswordHasherBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+
+def _new_refresh_token() -> tuple[str, bytes]:
+    token = secrets.token_urlsafe(32)
+    return token, _hash_refresh_token(token)
+
+
+def _hash_refresh_token(token: str) -> bytes:
+    # 256 random bits: a fast hash is enough, unlike passwords
+    return hashlib.sha256(token.encode()).digest()
 
-        access_token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
 
-        return Token(access_token=access_token)
+def _refresh_expiry() -> int:
+    return int(time.time()) + REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
@@ -1,5 +1,7 @@
 from api.models.exercise import ExerciseCreate, ExerciseResponse
-from typing import List
+from api.repositories.exercise_repository import EXERCISE_COLUMNS
+from api.utils.pagination import decode_cursor, encode_cursor
+from typing import List, Optional
 from fastapi import HTTPException, status
 
 
@@ -11,6 +13,53 @@ class ExerciseService:
         exercises = await self.exercise_repository.get_all_exercises()
         return exercises
 
+    async def get_exercises_page(
+        self,
+        category: Optional[str] = None,
+        muscle_group: Optional[str] = None,
+        fields: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Returns one page of exercises and the cursor for the next one"""
+        columns = EXERCISE_COLUMNS
+        if fields:
+            columns = tuple(field.strip() for field in fields.split(",") if field.strip())
+            unknown = set(columns) - set(EXERCISE_COLUMNS)
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+                )
+
+        after_id = 0
+        if cursor:
+            try:
+                after_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+
+        # Fetch one extra row to know whether another page exists
+        items = await self.exercise_repository.get_exercises_page(
+            category=category,
+            muscle_group=muscle_group,
+            after_id=after_id,
+            limit=limit + 1,
+            columns=columns,
+        )
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1]["id"])
+
+        return items, next_cursor
+
+    async def search_exercises(self, query: str, limit: int = 20) -> List[ExerciseResponse]:
+        return await self.exercise_repository.search_exercises(query, limit)
+
     async def get_exercise_by_id(self, exercise_id: int) -> ExerciseResponse:
         exercise = await self.exercise_repository.get_exercise_by_id(exercise_id)
 
@@ -20,3 +69,6 @@ class ExerciseService:
             )
 
         return exercise
+
+    async def create_exercise(self, exercise_data: ExerciseCreate) -> ExerciseResponse:
+        return await self.exercise_repository.create_exercise(exercise_data)
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from api.config import EXPORT_CHUNK_SIZE
+from api.repositories.session_repository import HISTORY_COLUMNS, SessionRepository, history_key
+from database.db import get_pool, pooled_connection
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _read_connection():
+    return pooled_connection(get_pool("read"))
+
+
+class ExportService:
+    """Streams a user's training history without materializing it.
+
+    The history is read in keyset pages of ``chunk_size`` sessions. Each
+    page checks a read connection out and hands it back before the chunk
+    is sent, so a client reading slowly holds neither a pooled connection
+    nor a read snapshot (which would stall WAL checkpoints) between chunks.
+    Request-scoped dependencies are torn down while a StreamingResponse
+    body is still being sent, hence the generator's own checkouts. Memory
+    use is one page at a time, whatever the size of the history; sessions
+    recorded while an export runs are included if they sort after the
+    page being read.
+    """
+
+    def __init__(self, connect=None, chunk_size: int = EXPORT_CHUNK_SIZE):
+        self.connect = connect
+        self.chunk_size = chunk_size
+
+    async def export_history(self, user_id: int, fmt: str = "ndjson"):
+        encode = _encode_csv if fmt == "csv" else _encode_ndjson
+        connect = self.connect or _read_connection
+
+        if fmt == "csv":
+            yield _csv_line(HISTORY_COLUMNS)
+
+        after = None
+        while True:
+            async with connect() as db:
+                rows = await SessionRepository(db).get_history_page(
+                    user_id, after, self.chunk_size
+                )
+            if not rows:
+                return
+            yield encode(rows)
+            after = history_key(rows[-1])
+
+
+def _encode_ndjson(rows) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(HISTORY_COLUMNS, row)), separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(tuple(row) for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_line(values) -> bytes:
+    return _encode_csv([values])
@@ -0,0 +1,109 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from api.models.leaderboard import Leaderboard, LeaderboardEntry
+from api.utils.leaderboard import RankIndex, leaderboards
+from typing import Iterable, Optional
+from fastapi import HTTPException, status
+
+MAX_LEADERBOARD_LIMIT = 100
+
+
+class LeaderboardService:
+    """Weekly volume leaderboards served from an in-memory rank index.
+
+    A board is loaded from the rollup the first time it is asked for.
+    After that, top-N is a slice and "my rank" is one bisect, whatever the
+    number of users on the board. Boards are global: there is no friends
+    relation to scope them by yet.
+    """
+
+    def __init__(self, leaderboard_repository, index=leaderboards):
+        self.leaderboard_repository = leaderboard_repository
+        self.index = index
+
+    async def get_weekly_leaderboard(
+        self,
+        user_id: int,
+        week: Optional[date] = None,
+        exercise_id: Optional[int] = None,
+        limit: int = 10,
+    ) -> Leaderboard:
+        if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}",
+            )
+
+        week = week_start(week or datetime.now(timezone.utc).date())
+        board = await self._board(week.isoformat(), exercise_id)
+
+        top = board.top(limit)
+        mine = board.rank(user_id)
+        usernames = await self.leaderboard_repository.get_usernames(
+            [entry_user for _, entry_user, _ in top] + [user_id]
+        )
+
+        return Leaderboard(
+            week=week,
+            exercise_id=exercise_id,
+            size=len(board),
+            entries=[
+                LeaderboardEntry(
+                    rank=rank, user_id=entry_user, username=usernames.get(entry_user), score=score
+                )
+                for rank, entry_user, score in top
+            ],
+            me=LeaderboardEntry(
+                rank=mine[0], user_id=user_id, username=usernames.get(user_id), score=mine[1]
+            )
+            if mine
+            else None,
+        )
+
+    async def record_sessions(self, user_id: int, weeks: Iterable[str]) -> None:
+        """Brings loaded boards up to date after ``user_id`` wrote sessions"""
+        weeks = set(weeks) & self.index.weeks()
+        if not weeks:
+            return
+
+        totals = defaultdict(float)
+        for week, exercise_id, volume in await self.leaderboard_repository.get_user_scores(
+            user_id, weeks
+        ):
+            totals[week] += volume
+            board = self.index.get((week, exercise_id))
+            if board is not None:
+                board.set(user_id, volume)
+
+        for week in weeks:
+            board = self.index.get((week, None))
+            if board is not None and week in totals:
+                board.set(user_id, totals[week])
+
+    async def rebuild(self) -> int:
+        """Reloads every loaded board from the rollup; returns how many changed.
+
+        Each board is one range scan of idx_volume_weekly_board. A board
+        whose scores match is left as it is; one that changed is re-sorted
+        once, in place, rather than updated user by user.
+        """
+        changed = 0
+        for week, exercise_id in self.index.keys():
+            scores = await self.leaderboard_repository.get_board_scores(week, exercise_id)
+            board = self.index.get((week, exercise_id))
+            if board is not None and board.load(scores):
+                changed += 1
+        return changed
+
+    async def _board(self, week: str, exercise_id: Optional[int]) -> RankIndex:
+        board = self.index.get((week, exercise_id))
+        if board is None:
+            scores = await self.leaderboard_repository.get_board_scores(week, exercise_id)
+            board = RankIndex(scores)
+            self.index.put((week, exercise_id), board)
+        return board
+
+
+def week_start(day: date) -> date:
+    """The Monday of ``day``'s week, matching the volume_weekly buckets"""
+    return day - timedelta(days=day.weekday())
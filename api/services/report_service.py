@@ -0,0 +1,130 @@
+import math
+from datetime import date, timedelta
+from api.models.report import E1RMPoint, E1RMTrend, PersonalRecord, VolumeReport
+from api.repositories.report_repository import GROUPINGS, ROLLUP_TABLES
+from api.utils.analytics import E1RM_FORMULAS, e1rm_trend, personal_records
+from typing import Optional
+from fastapi import HTTPException, status
+
+# Range used when the client gives no start date
+DEFAULT_SPAN = {"daily": timedelta(days=30), "weekly": timedelta(weeks=12)}
+
+MAX_TREND_WINDOW = 365
+
+
+class ReportService:
+    def __init__(self, report_repository):
+        self.report_repository = report_repository
+
+    async def get_volume_report(
+        self,
+        user_id: int,
+        period: str = "weekly",
+        group_by: str = "total",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> VolumeReport:
+        if period not in ROLLUP_TABLES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"period must be one of: {', '.join(ROLLUP_TABLES)}",
+            )
+        if group_by not in GROUPINGS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"group_by must be one of: {', '.join(GROUPINGS)}",
+            )
+
+        end = end or date.today()
+        start = start or end - DEFAULT_SPAN[period]
+        if start > end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start must not be after end",
+            )
+        if period == "weekly":
+            # Include the week that contains ``start``
+            start -= timedelta(days=start.weekday())
+
+        buckets = await self.report_repository.get_volume(
+            user_id, period, group_by, start.isoformat(), end.isoformat()
+        )
+        return VolumeReport(
+            period=period, group_by=group_by, start=start, end=end, buckets=buckets
+        )
+
+    async def get_personal_records(
+        self, user_id: int, formula: str = "epley"
+    ) -> list[PersonalRecord]:
+        _check_formula(formula)
+        history = await self.report_repository.get_lift_history(user_id)
+        records = personal_records(history, formula)
+
+        return [
+            PersonalRecord(
+                exercise_id=exercise_id,
+                max_weight=max_weight,
+                max_weight_date=max_weight_day,
+                max_reps=max_reps,
+                best_e1rm=None if math.isnan(best_e1rm) else best_e1rm,
+                best_e1rm_date=None if math.isnan(best_e1rm) else best_e1rm_day,
+                best_set_volume=best_set_volume,
+            )
+            for (
+                exercise_id,
+                max_weight,
+                max_weight_day,
+                max_reps,
+                best_e1rm,
+                best_e1rm_day,
+                best_set_volume,
+            ) in zip(
+                records["exercise_id"].tolist(),
+                records["max_weight"].tolist(),
+                records["max_weight_day"].tolist(),
+                records["max_reps"].tolist(),
+                records["best_e1rm"].tolist(),
+                records["best_e1rm_day"].tolist(),
+                records["best_set_volume"].tolist(),
+            )
+        ]
+
+    async def get_e1rm_trend(
+        self, user_id: int, exercise_id: int, formula: str = "epley", window: int = 7
+    ) -> E1RMTrend:
+        _check_formula(formula)
+        if not 1 <= window <= MAX_TREND_WINDOW:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"window must be between 1 and {MAX_TREND_WINDOW}",
+            )
+
+        history = await self.report_repository.get_lift_history(user_id)
+        trend = e1rm_trend(history, exercise_id, formula, window)
+        if not len(trend["day"]):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No recorded sets for this exercise",
+            )
+
+        return E1RMTrend(
+            exercise_id=exercise_id,
+            formula=formula,
+            window=window,
+            points=[
+                E1RMPoint(date=day, e1rm=e1rm, rolling_mean=mean)
+                for day, e1rm, mean in zip(
+                    trend["day"].tolist(),
+                    trend["e1rm"].tolist(),
+                    trend["rolling_mean"].tolist(),
+                )
+            ],
+        )
+
+
+def _check_formula(formula: str) -> None:
+    if formula not in E1RM_FORMULAS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"formula must be one of: {', '.join(E1RM_FORMULAS)}",
+        )
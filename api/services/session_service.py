@@ -0,0 +1,149 @@
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from pydantic import TypeAdapter, ValidationError
+from api.config import BULK_SESSIONS_MAX_ITEMS, IDEMPOTENCY_KEY_TTL_HOURS
+from api.models.workout_session import (
+    BulkSessionResult,
+    WorkoutSessionCreate,
+)
+from api.repositories.session_repository import Idempotency, IdempotencyKeyMismatch
+from api.services.leaderboard_service import week_start
+from typing import Any, List, Optional
+from fastapi import HTTPException, status
+
+_session_adapter = TypeAdapter(WorkoutSessionCreate)
+
+
+class SessionService:
+    def __init__(self, session_repository, leaderboard_service=None):
+        self.session_repository = session_repository
+        self.leaderboard_service = leaderboard_service
+
+    async def bulk_create_sessions(
+        self,
+        user_id: int,
+        items: List[Any],
+        idempotency_key: Optional[str] = None,
+    ) -> BulkSessionResult:
+        """Validates each item on its own and writes the valid ones at once.
+
+        Invalid items are reported by index and skipped; they never abort
+        the batch. With an idempotency key, a retry of the same batch gets
+        the first response back instead of inserting again.
+        """
+        if len(items) > BULK_SESSIONS_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {BULK_SESSIONS_MAX_ITEMS} sessions per request",
+            )
+
+        idempotency = None
+        if idempotency_key:
+            idempotency = Idempotency(
+                key=idempotency_key,
+                request_hash=_request_hash(items),
+                expires_before=int(time.time()) - IDEMPOTENCY_KEY_TTL_HOURS * 3600,
+            )
+            # Cheap early exit for retries, before any validation work
+            stored = await self._guard(
+                self.session_repository.get_idempotent_response(user_id, idempotency)
+            )
+            if stored is not None:
+                return _result(stored, replayed=True)
+
+        sessions, errors = await self._validate(user_id, items)
+
+        if not sessions:
+            return _result({"session_ids": [], "errors": errors}, replayed=False)
+
+        # A completed session needs a date to land in the volume reports
+        now = datetime.now(timezone.utc)
+        sessions = [
+            session.model_copy(update={"completed_at": now})
+            if session.status == "completed"
+            and session.completed_at is None
+            and session.scheduled_date is None
+            else session
+            for session in sessions
+        ]
+
+        response, replayed = await self._guard(
+            self.session_repository.bulk_create_sessions(
+                user_id, sessions, errors, idempotency
+            )
+        )
+        if self.leaderboard_service is not None and not replayed:
+            weeks = {_week(s) for s in sessions if s.status == "completed"}
+            await self.leaderboard_service.record_sessions(user_id, weeks)
+        return _result(response, replayed)
+
+    async def _validate(self, user_id, items):
+        parsed = {}
+        problems = {}
+        for index, item in enumerate(items):
+            try:
+                parsed[index] = _session_adapter.validate_python(item)
+            except ValidationError as exc:
+                problems[index] = [
+                    f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+                    for error in exc.errors()
+                ]
+
+        # Referential checks for the whole batch: two queries, not two per item
+        owned_plans = await self.session_repository.get_owned_plan_ids(
+            user_id, {session.workout_plan_id for session in parsed.values()}
+        )
+        known_exercises = await self.session_repository.get_existing_exercise_ids(
+            {e.exercise_id for session in parsed.values() for e in session.exercises}
+        )
+
+        for index, session in parsed.items():
+            item_errors = []
+            if session.workout_plan_id not in owned_plans:
+                item_errors.append("workout_plan_id: Workout plan not found")
+            for position, exercise in enumerate(session.exercises):
+                if exercise.exercise_id not in known_exercises:
+                    item_errors.append(
+                        f"exercises.{position}.exercise_id: Exercise not found"
+                    )
+            if item_errors:
+                problems[index] = item_errors
+
+        valid = [index for index in sorted(parsed) if index not in problems]
+        errors = [
+            {"index": index, "errors": problems[index]} for index in sorted(problems)
+        ]
+        return [parsed[index] for index in valid], errors
+
+    async def _guard(self, job):
+        try:
+            return await job
+        except IdempotencyKeyMismatch:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+
+
+def _week(session: WorkoutSessionCreate) -> str:
+    """The volume_weekly bucket a completed session is counted in"""
+    when = session.completed_at or session.scheduled_date
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc)
+    return week_start(when.date()).isoformat()
+
+
+def _request_hash(items) -> bytes:
+    canonical = json.dumps(items, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).digest()
+
+
+def _result(response: dict, replayed: bool) -> BulkSessionResult:
+    return BulkSessionResult(
+        created=len(response["session_ids"]),
+        session_ids=response["session_ids"],
+        errors=response["errors"],
+        replayed=replayed,
+    )
@@ -0,0 +1,113 @@
+from api.models.workout_plan import WorkoutPlanResponse
+from api.models.workout_plan_exercise import (
+    WorkoutPlanExerciseCreate,
+    WorkoutPlanExerciseResponse,
+)
+from api.repositories.workout_repository import WorkoutPlanInUseError
+from typing import List, Optional
+from fastapi import HTTPException, status
+
+
+class WorkoutService:
+    def __init__(self, workout_repository):
+        self.workout_repository = workout_repository
+
+    async def get_all_workout_plans(self, user_id: int) -> List[WorkoutPlanResponse]:
+        return await self.workout_repository.get_all_workout_plans_by_user(user_id)
+
+    async def get_workout_plan_by_id(
+        self, workout_id: int, user_id: int
+    ) -> WorkoutPlanResponse:
+        workout = await self.workout_repository.get_workout_plan_by_id(workout_id, user_id)
+
+        if not workout:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Workout plan not found"
+            )
+
+        return workout
+
+    async def create_workout_plan(
+        self, user_id: int, name: str, description: Optional[str] = None
+    ) -> WorkoutPlanResponse:
+        workout = await self.workout_repository.create_workout_plan(
+            user_id=user_id, name=name, description=description
+        )
+
+        if not workout:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to create workout plan",
+            )
+
+        return workout
+
+    async def update_workout_plan(
+        self,
+        workout_id: int,
+        user_id: int,
+        name: str,
+        description: Optional[str] = None,
+    ) -> WorkoutPlanResponse:
+        workout = await self.workout_repository.update_workout_plan(
+            workout_id=workout_id, user_id=user_id, name=name, description=description
+        )
+
+        if not workout:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to update workout plan",
+            )
+
+        return workout
+
+    async def delete_workout_plan(self, workout_id: int, user_id: int) -> bool:
+        try:
+            deleted = await self.workout_repository.delete_workout_plan(workout_id, user_id)
+        except WorkoutPlanInUseError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Workout plan has recorded sessions",
+            )
+
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Workout plan not found"
+            )
+
+        return deleted
+
+    async def add_exercise_to_plan(
+        self, workout_id: int, user_id: int, exercise_data: WorkoutPlanExerciseCreate
+    ) -> WorkoutPlanExerciseResponse:
+        # Ownership check: 404 for plans that belong to someone else
+        await self.get_workout_plan_by_id(workout_id, user_id)
+
+        exercise = await self.workout_repository.add_exercise_to_plan(
+            workout_id, exercise_data
+        )
+
+        if not exercise:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to add exercise to workout plan",
+            )
+
+        return exercise
+
+    async def remove_exercise_from_plan(
+        self, workout_id: int, user_id: int, exercise_id: int
+    ) -> bool:
+        await self.get_workout_plan_by_id(workout_id, user_id)
+
+        removed = await self.workout_repository.remove_exercise_from_plan(
+            workout_id, exercise_id
+        )
+
+        if not removed:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Exercise not found in workout plan",
+            )
+
+        return removed
@@ -0,0 +1,194 @@
+"""Vectorized lift analytics over a user's training history.
+
+Everything here works on a ``LiftHistory``: one NumPy array per column,
+one element per recorded exercise row, sorted by exercise and then by
+date. Grouping is done with ``np.*.reduceat`` over the boundaries between
+exercises (or days) instead of Python loops over rows.
+"""
+
+from dataclasses import dataclass
+import numpy as np
+
+E1RM_FORMULAS = ("epley", "brzycki")
+
+# Brzycki's denominator reaches zero at 37 reps
+_BRZYCKI_MAX_REPS = 36
+
+_COLUMNS = ("exercise_id", "day", "sets", "reps", "weight")
+
+_RECORD_DTYPE = np.dtype(
+    [
+        ("exercise_id", np.int64),
+        ("day", np.int64),
+        ("sets", np.int64),
+        ("reps", np.int64),
+        ("weight", np.float64),
+    ]
+)
+
+
+@dataclass(frozen=True)
+class LiftHistory:
+    exercise_id: np.ndarray  # int64
+    day: np.ndarray  # datetime64[D]
+    sets: np.ndarray  # int64
+    reps: np.ndarray  # int64
+    weight: np.ndarray  # float64
+
+    def __post_init__(self):
+        # reduceat pairs group boundaries found in one column with values
+        # in another; a short column would silently mix up exercises
+        lengths = {len(getattr(self, column)) for column in _COLUMNS}
+        if len(lengths) > 1:
+            raise ValueError(
+                "LiftHistory columns differ in length: "
+                + ", ".join(f"{column}={len(getattr(self, column))}" for column in _COLUMNS)
+            )
+
+    @classmethod
+    def from_records(cls, records) -> "LiftHistory":
+        """Builds the arrays from an iterable of numeric
+        ``(exercise_id, day, sets, reps, weight)`` tuples, such as a cursor.
+
+        ``day`` holds days since 1970-01-01. The tuples are read into one
+        record array, so no per-column Python sequences are built; a NULL
+        raises instead of shifting the columns against each other. Any
+        order is accepted: the result is sorted by exercise, then by day.
+        """
+        table = np.fromiter(records, dtype=_RECORD_DTYPE)
+        history = cls(
+            exercise_id=table["exercise_id"],
+            day=table["day"].astype("datetime64[D]"),
+            sets=table["sets"],
+            reps=table["reps"],
+            weight=table["weight"],
+        )
+        return history.take(np.lexsort((history.day, history.exercise_id)))
+
+    def __len__(self) -> int:
+        return len(self.exercise_id)
+
+    def take(self, index) -> "LiftHistory":
+        return LiftHistory(
+            exercise_id=self.exercise_id[index],
+            day=self.day[index],
+            sets=self.sets[index],
+            reps=self.reps[index],
+            weight=self.weight[index],
+        )
+
+
+def estimated_1rm(weight: np.ndarray, reps: np.ndarray, formula: str = "epley") -> np.ndarray:
+    """Estimated one-rep max per set; NaN where reps give no estimate.
+
+    A single is its own 1RM. Sets without reps, and Brzycki beyond 36 reps,
+    have no estimate.
+    """
+    weight = np.asarray(weight, dtype=np.float64)
+    reps = np.asarray(reps, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if formula == "epley":
+            e1rm = np.where(reps == 1, weight, weight * (1 + reps / 30))
+            valid = reps >= 1
+        elif formula == "brzycki":
+            e1rm = weight * 36 / (37 - reps)
+            valid = (reps >= 1) & (reps <= _BRZYCKI_MAX_REPS)
+        else:
+            raise ValueError(f"unknown formula: {formula}")
+
+    return np.where(valid, e1rm, np.nan)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over the last ``window`` points (fewer at the start)"""
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+    values = np.asarray(values, dtype=np.float64)
+    totals = np.cumsum(values)
+    totals[window:] = totals[window:] - totals[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return totals / counts
+
+
+def personal_records(history: LiftHistory, formula: str = "epley") -> dict[str, np.ndarray]:
+    """Per exercise bests, one element per distinct exercise id.
+
+    Keys: ``exercise_id``, ``max_weight``, ``max_weight_day``, ``max_reps``,
+    ``best_e1rm``, ``best_e1rm_day`` and ``best_set_volume`` (reps x weight).
+    On ties the earliest day wins.
+    """
+    if not len(history):
+        empty = np.array([], dtype=np.float64)
+        return {
+            "exercise_id": np.array([], dtype=np.int64),
+            "max_weight": empty,
+            "max_weight_day": np.array([], dtype="datetime64[D]"),
+            "max_reps": np.array([], dtype=np.int64),
+            "best_e1rm": empty,
+            "best_e1rm_day": np.array([], dtype="datetime64[D]"),
+            "best_set_volume": empty,
+        }
+
+    starts = _group_starts(history.exercise_id)
+    e1rm = estimated_1rm(history.weight, history.reps, formula)
+    # NaN never wins a max; -inf keeps reduceat well defined
+    e1rm_or_floor = np.where(np.isnan(e1rm), -np.inf, e1rm)
+    best_e1rm = np.maximum.reduceat(e1rm_or_floor, starts)
+
+    return {
+        "exercise_id": history.exercise_id[starts],
+        "max_weight": np.maximum.reduceat(history.weight, starts),
+        "max_weight_day": history.day[_argmax_per_group(history, history.weight)],
+        "max_reps": np.maximum.reduceat(history.reps, starts),
+        "best_e1rm": np.where(np.isinf(best_e1rm), np.nan, best_e1rm),
+        "best_e1rm_day": history.day[_argmax_per_group(history, e1rm_or_floor)],
+        "best_set_volume": np.maximum.reduceat(history.reps * history.weight, starts),
+    }
+
+
+def e1rm_trend(
+    history: LiftHistory, exercise_id: int, formula: str = "epley", window: int = 7
+) -> dict[str, np.ndarray]:
+    """Best estimated 1RM per training day for one exercise, with a rolling mean.
+
+    Keys: ``day``, ``e1rm`` and ``rolling_mean`` (over the last ``window``
+    training days that have an estimate).
+    """
+    rows = history.exercise_id == exercise_id
+    day = history.day[rows]
+    e1rm = estimated_1rm(history.weight[rows], history.reps[rows], formula)
+
+    has_estimate = ~np.isnan(e1rm)
+    day, e1rm = day[has_estimate], e1rm[has_estimate]
+    if not len(day):
+        return {
+            "day": day,
+            "e1rm": e1rm,
+            "rolling_mean": e1rm,
+        }
+
+    order = np.argsort(day, kind="stable")
+    day, e1rm = day[order], e1rm[order]
+    starts = _group_starts(day)
+    best = np.maximum.reduceat(e1rm, starts)
+    return {
+        "day": day[starts],
+        "e1rm": best,
+        "rolling_mean": rolling_mean(best, window),
+    }
+
+
+def _group_starts(keys: np.ndarray) -> np.ndarray:
+    """Index of the first element of every run of equal, sorted keys"""
+    return np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+
+
+def _argmax_per_group(history: LiftHistory, values: np.ndarray) -> np.ndarray:
+    """Index of each exercise's largest value, earliest day first on ties"""
+    # lexsort keys go from least to most significant: the last row of each
+    # exercise is its largest value, and among equals the earliest day
+    order = np.lexsort((-history.day.astype(np.int64), values, history.exercise_id))
+    ends = np.append(_group_starts(history.exercise_id[order])[1:], len(order)) - 1
+    return order[ends]
@@ -0,0 +1,56 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+from api.config import TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL
+from api.models.user import TokenData
+from api.utils.denylist import access_token_denylist
+from api.utils.jwt_keys import get_key_ring
+from api.utils.token_cache import VerifiedTokenCache
+
+bearer_scheme = HTTPBearer(auto_error=False)
+token_cache = VerifiedTokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> TokenData:
+    """Dependency for FastAPI: the caller identified by its bearer token"""
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+
+    token = credentials.credentials
+    user = token_cache.get(token)
+    if user is None:
+        user = _verify(token)
+        token_cache.put(token, user, user.exp)
+
+    # Checked on cache hits too: a revoked token may still be cached
+    if user.jti is not None and user.jti in access_token_denylist:
+        raise _unauthorized("Token has been revoked")
+
+    return user
+
+
+def _verify(token: str) -> TokenData:
+    try:
+        claims = get_key_ring().verify(token)
+    except JWTError:
+        raise _unauthorized("Invalid or expired token")
+
+    if not isinstance(claims.get("user_id"), int):
+        raise _unauthorized("Invalid or expired token")
+
+    return TokenData(
+        user_id=claims["user_id"],
+        email=claims.get("email"),
+        jti=claims.get("jti"),
+        exp=claims.get("exp"),
+    )
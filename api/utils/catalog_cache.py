@@ -0,0 +1,140 @@
+import gzip
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pydantic import TypeAdapter
+from api.models.exercise import ExerciseResponse
+
+try:
+    import brotli
+except ImportError:  # optional: without it only the gzip variant is built
+    brotli = None
+
+_catalog_adapter = TypeAdapter(list[ExerciseResponse])
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the whole exercise catalog at one version.
+
+    Besides the models it carries the encoded JSON body and its compressed
+    variants, so serving the catalog is a dictionary lookup.
+    """
+
+    version: int
+    # catalog_version in the database when the rows were read
+    source_version: int | None
+    exercises: tuple[ExerciseResponse, ...]
+    by_id: dict[int, ExerciseResponse] = field(repr=False)
+    etag: str
+    body: bytes = field(repr=False)
+    encoded_bodies: dict[str, bytes] = field(repr=False)
+
+    def negotiate(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """Picks the best pre-encoded body for an Accept-Encoding header"""
+        accepted = _accepted_codings(accept_encoding)
+        for coding in ("br", "gzip"):
+            if coding in accepted and coding in self.encoded_bodies:
+                return self.encoded_bodies[coding], coding
+        return self.body, None
+
+
+class ExerciseCatalogCache:
+    """Process-wide read-through cache of the exercise catalog.
+
+    Writers in this process call ``invalidate()``, which bumps the version
+    and drops the snapshot. A reader that loaded rows at an older version
+    cannot store them, so a slow read racing a write never resurrects stale
+    data. Writes made by other processes are noticed by ``sync()``, which
+    compares the database's catalog_version with the one the snapshot was
+    loaded at; until the next sync such a process serves the old catalog.
+    Cached models are shared between requests and must be treated as
+    read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self) -> CatalogSnapshot | None:
+        return self._snapshot
+
+    def store(
+        self, exercises, version: int, source_version: int | None = None
+    ) -> CatalogSnapshot | None:
+        """Caches ``exercises`` loaded at ``version``; ignored if a write happened since.
+
+        ``source_version`` is the database catalog_version, read before the rows.
+        """
+        exercises = tuple(exercises)
+        body = _catalog_adapter.dump_json(list(exercises))
+
+        encoded_bodies = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encoded_bodies["br"] = brotli.compress(body)
+
+        snapshot = CatalogSnapshot(
+            version=version,
+            source_version=source_version,
+            exercises=exercises,
+            by_id={exercise.id: exercise for exercise in exercises},
+            # Weak: the identity and compressed bodies are equivalent
+            # representations and share a validator. Derived from content
+            # so every worker process agrees on it.
+            etag='W/"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+            body=body,
+            encoded_bodies=encoded_bodies,
+        )
+
+        with self._lock:
+            if version != self._version:
+                return None
+            self._snapshot = snapshot
+
+        return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def sync(self, source_version: int) -> bool:
+        """Drops the snapshot if the catalog changed in the database since
+        it was loaded; returns whether it did"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.source_version == source_version:
+            return False
+        self.invalidate()
+        return True
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)"""
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or _opaque(etag) in {_opaque(tag) for tag in candidates}
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _accepted_codings(accept_encoding: str | None) -> set[str]:
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.lower())
+    return accepted
+
+
+exercise_catalog = ExerciseCatalogCache()
@@ -0,0 +1,71 @@
+import heapq
+import threading
+import time
+
+
+class TokenDenylist:
+    """In-memory set of revoked access-token ids (``jti``).
+
+    Membership is a single dict lookup, so every authenticated request can
+    check it without touching the database. Entries only matter until the
+    token would have expired anyway; a min-heap ordered by expiry lets
+    ``add`` and ``__contains__`` drop stale entries as they go. Ids are
+    stored as 16 raw bytes when they are UUID hex strings.
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._expiry = {}
+        self._heap = []
+
+    def add(self, jti: str, exp: float) -> None:
+        key = _compact(jti)
+        with self._lock:
+            self._purge()
+            if exp <= self._clock():
+                return
+            self._expiry[key] = exp
+            heapq.heappush(self._heap, (exp, key))
+
+    def load(self, entries) -> None:
+        """Bulk-adds ``(jti, exp)`` pairs, e.g. the persisted list at startup"""
+        for jti, exp in entries:
+            self.add(jti, exp)
+
+    def __contains__(self, jti: str) -> bool:
+        exp = self._expiry.get(_compact(jti))
+        if exp is None:
+            return False
+        if exp > self._clock():
+            return True
+
+        with self._lock:
+            self._purge()
+        return False
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+            self._heap.clear()
+
+    def _purge(self) -> None:
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            exp, key = heapq.heappop(self._heap)
+            # A re-added id has a newer expiry and must stay
+            if self._expiry.get(key) == exp:
+                del self._expiry[key]
+
+
+def _compact(jti: str):
+    try:
+        return bytes.fromhex(jti) if len(jti) == 32 else jti
+    except ValueError:
+        return jti
+
+
+access_token_denylist = TokenDenylist()
@@ -0,0 +1,183 @@
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+from jose.utils import base64url_encode
+from api.config import (
+    ALGORITHM,
+    SECRET_KEY,
+    JWT_PREVIOUS_SECRET_KEYS,
+    JWT_PRIVATE_KEY_PATH,
+    JWT_PREVIOUS_PUBLIC_KEY_PATHS,
+)
+
+HMAC_ALGORITHMS = ("HS256", "HS384", "HS512")
+
+
+class Ed25519Key(Key):
+    """EdDSA (Ed25519) support for python-jose, which has no OKP keys.
+
+    Accepts PEM data or a cryptography key object; registered with jose
+    below so jwt.encode/jwt.decode handle ``alg: EdDSA`` natively.
+    """
+
+    def __init__(self, key, algorithm):
+        if isinstance(key, (str, bytes)):
+            data = key.encode() if isinstance(key, str) else key
+            if b"PRIVATE KEY" in data:
+                key = serialization.load_pem_private_key(data, password=None)
+            else:
+                key = serialization.load_pem_public_key(data)
+
+        if not isinstance(key, (Ed25519PrivateKey, Ed25519PublicKey)):
+            raise TypeError("EdDSA needs an Ed25519 key")
+
+        self._algorithm = algorithm
+        self._key = key
+
+    def sign(self, msg):
+        return self._key.sign(msg)
+
+    def verify(self, msg, sig):
+        public = self._key if isinstance(self._key, Ed25519PublicKey) else self._key.public_key()
+        try:
+            public.verify(sig, msg)
+        except InvalidSignature:
+            return False
+        return True
+
+    def public_key(self):
+        if isinstance(self._key, Ed25519PublicKey):
+            return self
+        return type(self)(self._key.public_key(), self._algorithm)
+
+    def to_pem(self):
+        if isinstance(self._key, Ed25519PublicKey):
+            return self._key.public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        return self._key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+    def to_dict(self):
+        public = self.public_key()._key.public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        return {
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "alg": self._algorithm,
+            "x": base64url_encode(public).decode(),
+        }
+
+
+jwk.register_key("EdDSA", Ed25519Key)
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """A parsed key, ready to use: nothing is decoded per request"""
+
+    kid: str
+    algorithm: str
+    verifier: Key
+    signer: Key | None = None
+
+
+def hmac_key(secret: str, algorithm: str = "HS256") -> SigningKey:
+    key = jwk.construct(secret, algorithm)
+    # Short digest of the secret, so rotated secrets get distinct kids
+    kid = "hs-" + hashlib.sha256(secret.encode()).hexdigest()[:12]
+    return SigningKey(kid=kid, algorithm=algorithm, verifier=key, signer=key)
+
+
+def pem_key(pem: bytes, algorithm: str) -> SigningKey:
+    """Builds a key from PEM; private keys can sign, public keys only verify"""
+    key = jwk.construct(pem, algorithm)
+    public = key.public_key()
+    kid = hashlib.sha256(public.to_pem()).hexdigest()[:16]
+    signer = key if b"PRIVATE KEY" in pem else None
+    return SigningKey(kid=kid, algorithm=algorithm, verifier=public, signer=signer)
+
+
+class KeyRing:
+    """Signs with one active key and verifies against every key it holds.
+
+    Tokens carry the ``kid`` of the key that signed them, so verification is
+    a dictionary lookup plus one signature check. Rotation is: make the new
+    key active and keep the old one as retired until its tokens expire.
+    Tokens without a ``kid`` (issued before key ids) are checked against
+    the active key.
+    """
+
+    def __init__(self, active: SigningKey, retired: tuple[SigningKey, ...] = ()):
+        if active.signer is None:
+            raise ValueError("The active key must be able to sign")
+
+        self.active = active
+        self._keys = {key.kid: key for key in retired}
+        self._keys[active.kid] = active
+
+    @property
+    def kids(self) -> list[str]:
+        return list(self._keys)
+
+    def sign(self, claims: dict) -> str:
+        return jwt.encode(
+            claims,
+            self.active.signer,
+            algorithm=self.active.algorithm,
+            headers={"kid": self.active.kid},
+        )
+
+    def verify(self, token: str) -> dict:
+        """Returns the token's claims; raises JWTError if it is not valid"""
+        header = jwt.get_unverified_header(token)
+        key = self._keys.get(header.get("kid", self.active.kid))
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, key.verifier, algorithms=[key.algorithm])
+
+
+def build_key_ring(
+    algorithm: str = ALGORITHM,
+    secret: str = SECRET_KEY,
+    previous_secrets: list[str] = JWT_PREVIOUS_SECRET_KEYS,
+    private_key_path: str | None = JWT_PRIVATE_KEY_PATH,
+    previous_public_key_paths: list[str] = JWT_PREVIOUS_PUBLIC_KEY_PATHS,
+) -> KeyRing:
+    if algorithm in HMAC_ALGORITHMS:
+        return KeyRing(
+            hmac_key(secret, algorithm),
+            tuple(hmac_key(previous, algorithm) for previous in previous_secrets),
+        )
+
+    if not private_key_path:
+        raise ValueError(f"{algorithm} needs JWT_PRIVATE_KEY_PATH")
+
+    return KeyRing(
+        pem_key(_read(private_key_path), algorithm),
+        tuple(pem_key(_read(path), algorithm) for path in previous_public_key_paths),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_key_ring() -> KeyRing:
+    """Process-wide key ring, parsed once (main.lifespan loads it at startup)"""
+    return build_key_ring()
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
@@ -0,0 +1,43 @@
+import json
+import logging
+import sys
+from api.config import LOG_FORMAT, LOG_LEVEL
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_STANDARD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra={...}`` fields become keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Sets up the root logger once; later calls only change the level"""
+    root = logging.getLogger()
+    root.setLevel(level)
+    if any(getattr(handler, "_workout_tracker", False) for handler in root.handlers):
+        return
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler._workout_tracker = True
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+    root.addHandler(handler)
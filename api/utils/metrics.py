@@ -0,0 +1,328 @@
+"""Process-local metrics rendered in the Prometheus text format.
+
+Metrics are plain counters and histograms keyed by label values, updated
+under a lock. Values that already live elsewhere (pool statistics, hash
+queue depth) are read by collectors at scrape time instead of being
+mirrored on every change. With METRICS_ENABLED off, ``registry.enabled``
+is False and the hot-path hooks are never installed.
+
+Under the pre-fork server every worker has its own registry, and a scrape
+through the shared socket lands on whichever worker accepts it. With
+METRICS_DIR set (``manage.py prod`` sets one up), each worker writes a
+snapshot of its registry there every METRICS_FLUSH_SECONDS, and a scrape
+renders the sum over all of them: counters and histograms add up across
+workers, and a worker that exits has its counts folded into an archive
+file so totals never go backwards. Collector samples describe live state
+(pool connections, queue depth) and are reported per worker with a
+``pid`` label instead of being summed.
+"""
+
+import json
+import math
+import os
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from api.config import METRICS_DIR, METRICS_ENABLED
+
+_ARCHIVE = "archive.json"
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _labels(self, values) -> dict:
+        return dict(zip(self.labelnames, values))
+
+    def values(self) -> dict:
+        with self._lock:
+            return {labels: _copy(value) for labels, value in self._values.items()}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self, values=None):
+        values = self.values() if values is None else values
+        for labels, value in values.items():
+            yield self.name, self._labels(labels), value
+
+    @staticmethod
+    def merge(total, value):
+        return total + value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # per-bucket counts (not cumulative), then sum
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self, values=None):
+        values = self.values() if values is None else values
+        for labels, series in values.items():
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": _number(bound)}, cumulative
+            yield f"{self.name}_sum", base, series[-1]
+            yield f"{self.name}_count", base, cumulative
+
+    @staticmethod
+    def merge(total, series):
+        if len(total) != len(series):
+            # Bucket layout changed across a reload; keep the newer one
+            return list(series)
+        return [a + b for a, b in zip(total, series)]
+
+
+class Registry:
+    def __init__(self, enabled: bool = True, directory: str | None = None):
+        self.enabled = enabled
+        self.directory = directory
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def collector(self, fn):
+        """Registers ``fn() -> [(name, kind, help, [(labels, value), ...])]``"""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        if self.directory is None:
+            values = {metric.name: metric.values() for metric in self._metrics}
+            collected = [entry for collect in self._collectors for entry in collect()]
+        else:
+            values, collected = self._merge_workers()
+
+        lines = []
+        for metric in self._metrics:
+            _header(lines, metric.name, metric.kind, metric.help)
+            for name, labels, value in metric.samples(values.get(metric.name, {})):
+                lines.append(_sample(name, labels, value))
+        for name, kind, help, samples in collected:
+            _header(lines, name, kind, help)
+            for labels, value in samples:
+                lines.append(_sample(name, labels, value))
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        """Writes this process's snapshot to ``directory`` (atomically)"""
+        if self.directory is None:
+            return
+        snapshot = {
+            "metrics": {
+                metric.name: [[list(labels), value] for labels, value in metric.values().items()]
+                for metric in self._metrics
+            },
+            "collected": [
+                [name, kind, help, [[labels, value] for labels, value in samples]]
+                for collect in self._collectors
+                for name, kind, help, samples in collect()
+            ],
+        }
+        _write_json(os.path.join(self.directory, f"{os.getpid()}.json"), snapshot)
+
+    def _merge_workers(self):
+        self.flush()
+        self._archive_exited_workers()
+        metrics = {metric.name: metric for metric in self._metrics}
+        values = {name: {} for name in metrics}
+        collected = {}
+
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith(".json"):
+                continue
+            snapshot = _read_json(os.path.join(self.directory, filename))
+            if snapshot is None:
+                continue
+            _merge_values(metrics, values, snapshot["metrics"])
+            pid = filename[: -len(".json")]
+            for name, kind, help, samples in snapshot.get("collected", ()):
+                entry = collected.setdefault(name, (name, kind, help, []))
+                entry[3].extend(({**labels, "pid": pid}, value) for labels, value in samples)
+        return values, list(collected.values())
+
+    def _archive_exited_workers(self) -> None:
+        """Folds the snapshots of exited workers into the archive file"""
+        import fcntl
+
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            exited = [
+                filename
+                for filename in os.listdir(self.directory)
+                if filename.endswith(".json")
+                and filename != _ARCHIVE
+                and not _alive(int(filename[: -len(".json")]))
+            ]
+            if not exited:
+                return
+
+            archive_path = os.path.join(self.directory, _ARCHIVE)
+            metrics = {metric.name: metric for metric in self._metrics}
+            archived = {name: {} for name in metrics}
+            for path in [archive_path, *(os.path.join(self.directory, f) for f in exited)]:
+                snapshot = _read_json(path)
+                if snapshot is not None:
+                    _merge_values(metrics, archived, snapshot["metrics"])
+            _write_json(
+                archive_path,
+                {
+                    "metrics": {
+                        name: [[list(labels), value] for labels, value in series.items()]
+                        for name, series in archived.items()
+                    }
+                },
+            )
+            for filename in exited:
+                os.unlink(os.path.join(self.directory, filename))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+def _merge_values(metrics, values, snapshot_metrics) -> None:
+    for name, series in snapshot_metrics.items():
+        metric = metrics.get(name)
+        if metric is None:
+            continue
+        merged = values[name]
+        for labels, value in series:
+            labels = tuple(labels)
+            merged[labels] = (
+                metric.merge(merged[labels], value) if labels in merged else _copy(value)
+            )
+
+
+def _copy(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_json(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # Gone (archived meanwhile) or unreadable: skip it this scrape
+        return None
+
+
+def _write_json(path: str, data) -> None:
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def _header(lines, name, kind, help) -> None:
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _sample(name: str, labels: dict, value) -> str:
+    if not labels:
+        return f"{name} {_number(value)}"
+    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+    return f"{name}{{{rendered}}} {_number(value)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return str(value)
+
+
+registry = Registry(enabled=METRICS_ENABLED, directory=METRICS_DIR)
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests, by route template",
+    ("method", "route", "status"),
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL on the connection thread, by statement",
+    ("statement",),
+)
+db_query_rows = registry.counter(
+    "db_query_rows_total",
+    "Rows returned (reads) or changed (writes), by statement",
+    ("statement",),
+)
+db_pool_wait = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time requests waited for a pooled connection when none was idle",
+    ("profile",),
+)
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "Time spent in scrypt per hash or verify",
+    ("operation",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def record_query(sql: str, seconds: float, rows) -> None:
+    """Query hook for AsyncConnection (see database.async_db.add_query_hook)"""
+    statement = statement_label(sql)
+    db_query_duration.observe(seconds, statement)
+    if rows:
+        db_query_rows.inc(rows, statement)
+
+
+@lru_cache(maxsize=1024)
+def statement_label(sql: str) -> str:
+    """SQL with whitespace collapsed, capped so labels stay readable"""
+    statement = " ".join(sql.split())
+    return statement if len(statement) <= 200 else statement[:197] + "..."
@@ -0,0 +1,24 @@
+import base64
+import json
+
+# Cursor ids are bound as SQLite INTEGERs, which are signed 64-bit
+_MAX_ID = 2**63 - 1
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque keyset cursor pointing just past ``last_id``"""
+    payload = json.dumps({"after": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Returns the id a cursor points past; raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after = json.loads(base64.urlsafe_b64decode(padded.encode()))["after"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if type(after) is not int or not 0 <= after <= _MAX_ID:
+        raise ValueError("Invalid cursor")
+    return after
@@ -0,0 +1,218 @@
+"""Sampling profiler for single requests.
+
+A ``RequestProfile`` follows one request's asyncio task. One background
+thread (started while any profile is active) wakes every
+``interval`` seconds and records a stack for each active profile:
+
+* while the task is running, the event-loop thread's stack, cut at the
+  frame where profiling started;
+* while it is suspended, its chain of awaiting coroutines, ending in an
+  ``[await ...]`` leaf.
+
+Samples are wall-clock, so time spent waiting on SQLite, the hash pool or
+another request shows up as well as CPU time. The sampler thread needs
+the GIL, so pure-Python CPU work is sampled at most once per switch
+interval (5 ms by default), whatever ``interval`` says. SQL executed for the
+request is captured through the AsyncConnection query hook. ``write``
+produces a collapsed-stack file (one ``frame;frame;frame count`` line
+per distinct stack, as consumed by flamegraph.pl, speedscope or inferno)
+and a JSON sidecar with the request, its timings and its SQL;
+``prune_profiles`` keeps the directory to a fixed number of profiles.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self, task: asyncio.Task, root_frame, label: str):
+        self.task = task
+        self.loop = task.get_loop()
+        self.thread_id = threading.get_ident()
+        self.root_frame = root_frame
+        self.label = label
+        self.started = time.perf_counter()
+        self.finished = None
+        self.stacks = Counter()
+        self.queries = []
+        # Sorts by start time; unique across processes and reused addresses
+        now = time.time()
+        self.id = (
+            f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(now))}"
+            f".{int(now % 1 * 1_000_000):06d}-{uuid.uuid4().hex}"
+        )
+
+    def sample(self, frames: dict) -> None:
+        """Records one stack (called on the sampler thread)"""
+        if asyncio.current_task(self.loop) is self.task:
+            stack = self._running_stack(frames.get(self.thread_id))
+        else:
+            stack = self._suspended_stack()
+        if stack:
+            self.stacks[";".join(stack)] += 1
+
+    def _running_stack(self, frame) -> list[str] | None:
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            if frame is self.root_frame:
+                return stack[::-1]
+            frame = frame.f_back
+        return None  # between steps of the task; the next tick will tell
+
+    def _suspended_stack(self) -> list[str]:
+        stack = []
+        awaitable = self.task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                if stack:
+                    # asyncio Futures are awaited through a FutureIter
+                    stack.append(f"[await {type(awaitable).__name__.removesuffix('Iter')}]")
+                break
+            if frame is self.root_frame or stack:
+                stack.append(_frame_label(frame))
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(
+                awaitable, "gi_yieldfrom", None
+            )
+        return stack
+
+    def record_query(self, sql: str, seconds: float, rows) -> None:
+        self.queries.append((sql, seconds, rows))
+
+    def finish(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, directory: str, **details) -> str:
+        """Writes ``<id>.collapsed`` and ``<id>.json``; returns the base path"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.id)
+        with open(base + ".collapsed", "w") as f:
+            f.write(self.collapsed())
+        summary = {
+            "id": self.id,
+            "request": self.label,
+            **details,
+            "duration_ms": round(self.duration * 1000, 3),
+            "samples": sum(self.stacks.values()),
+            "sql_ms": round(sum(seconds for _, seconds, _ in self.queries) * 1000, 3),
+            "queries": [
+                {"sql": " ".join(sql.split()), "ms": round(seconds * 1000, 3), "rows": rows}
+                for sql, seconds, rows in self.queries
+            ],
+        }
+        with open(base + ".json", "w") as f:
+            json.dump(summary, f, indent=2)
+        return base
+
+
+def prune_profiles(directory: str, keep: int) -> int:
+    """Deletes the oldest profiles beyond the newest ``keep``; returns how many"""
+    ids = sorted(
+        filename.removesuffix(".json")
+        for filename in os.listdir(directory)
+        if filename.endswith(".json")
+    )
+    stale = ids[: max(0, len(ids) - keep)]
+    for profile_id in stale:
+        for suffix in (".json", ".collapsed"):
+            try:
+                os.unlink(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass  # pruned by another worker meanwhile
+    return len(stale)
+
+
+class Sampler:
+    """One daemon thread sampling every active profile, only while any is"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = set()
+        self._thread = None
+
+    def start(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.discard(profile)
+        profile.finish()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                # Under the lock, so a stopped profile is never sampled late
+                frames = sys._current_frames()
+                for profile in self._active:
+                    profile.sample(frames)
+
+
+def activate(profile: RequestProfile):
+    return _current_profile.set(profile)
+
+
+def deactivate(token) -> None:
+    _current_profile.reset(token)
+
+
+def record_query(sql: str, seconds: float, rows) -> None:
+    """Query hook: attributes SQL to the profiled request, if any"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record_query(sql, seconds, rows)
+
+
+def sign_token(secret: str, expires: int, path: str) -> str:
+    """``<expires>.<signature>`` for the profiling request header, valid
+    only on requests for ``path``"""
+    message = f"{expires}\n{path}".encode()
+    signature = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def verify_token(secret: str, token: str, path: str, now: float | None = None) -> bool:
+    expires, _, _ = token.partition(".")
+    if not expires.isdigit() or int(expires) < (now if now is not None else time.time()):
+        return False
+    return hmac.compare_digest(sign_token(secret, int(expires), path), token)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return _UNSAFE.sub("_", f"{module}:{code.co_qualname}")
+
+
+# ";" separates frames and " " the count in the collapsed format
+_UNSAFE = re.compile(r"[;\s]")
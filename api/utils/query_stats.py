@@ -0,0 +1,165 @@
+"""Per-statement query statistics and the slow-query log.
+
+``QueryStats.record`` is an AsyncConnection query hook: every statement
+is folded into running totals keyed by its normalized text (literals and
+placeholder lists collapsed), bounded to ``max_statements`` entries.
+``QueryStats.record_slow`` is the slow-query handler: statements over the
+threshold are logged with the shape of their parameters (types, never
+values) and their ``EXPLAIN QUERY PLAN``, captured once per normalized
+statement on the connection that ran it.
+
+Like the metrics registry, statistics are per process.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from api.config import QUERY_STATS_MAX_STATEMENTS, SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+# Statements EXPLAIN QUERY PLAN says something useful about
+EXPLAINABLE = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH"}
+
+SORT_KEYS = {
+    "total": lambda entry: entry.total,
+    "max": lambda entry: entry.max,
+    "mean": lambda entry: entry.total / entry.calls,
+    "calls": lambda entry: entry.calls,
+}
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROW_LIST = re.compile(r"(\([^()]*\))(?:\s*,\s*\([^()]*\))+")
+
+
+@dataclass
+class StatementEntry:
+    statement: str
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    rows: int = 0
+    slow_calls: int = 0
+    plan: tuple[str, ...] | None = None
+    last_slow_params: str | None = None
+
+
+class QueryStats:
+    def __init__(self, slow_seconds: float, max_statements: int = 500):
+        self.slow_seconds = slow_seconds
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._entries: dict[str, StatementEntry] = {}
+
+    def record(self, sql: str, seconds: float, rows) -> None:
+        statement = normalize_sql(sql)
+        with self._lock:
+            entry = self._entry(statement)
+            entry.calls += 1
+            entry.total += seconds
+            entry.max = max(entry.max, seconds)
+            entry.rows += rows or 0
+
+    def record_slow(self, conn, sql: str, params, seconds: float, rows) -> None:
+        statement = normalize_sql(sql)
+        shape = params_shape(params)
+        with self._lock:
+            plan = self._entries[statement].plan if statement in self._entries else None
+        if plan is None:
+            plan = explain(conn, sql, params)
+        with self._lock:
+            entry = self._entry(statement)
+            entry.slow_calls += 1
+            entry.plan = plan
+            entry.last_slow_params = shape
+
+        logger.warning(
+            "Slow query (%.1f ms, %s rows): %s | params %s | plan: %s",
+            seconds * 1000,
+            rows,
+            statement,
+            shape,
+            " / ".join(plan) if plan else "n/a",
+            extra={"statement": statement, "duration_ms": round(seconds * 1000, 3)},
+        )
+
+    def top(self, limit: int = 20, sort: str = "total") -> list[StatementEntry]:
+        with self._lock:
+            entries = list(self._entries.values())
+        return sorted(entries, key=SORT_KEYS[sort], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _entry(self, statement: str) -> StatementEntry:
+        entry = self._entries.get(statement)
+        if entry is None:
+            if len(self._entries) >= self.max_statements:
+                # Forget the statement that has cost the least so far
+                cheapest = min(self._entries.values(), key=SORT_KEYS["total"])
+                del self._entries[cheapest.statement]
+            entry = self._entries[statement] = StatementEntry(statement)
+        return entry
+
+
+query_stats = QueryStats(SLOW_QUERY_MS / 1000, QUERY_STATS_MAX_STATEMENTS)
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Statement text with comments dropped, literals replaced by ``?`` and
+    placeholder or row lists of any length collapsed"""
+    statement = _COMMENT.sub(" ", sql)
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = " ".join(statement.split())
+    statement = _PLACEHOLDER_LIST.sub("(?, ...)", statement)
+    return _ROW_LIST.sub(r"\1, ...", statement)
+
+
+def params_shape(params) -> str:
+    """Parameter types without their values: ``(int, str, NULL)``"""
+    if params is None:
+        return "n/a"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {_type_name(value)}" for key, value in params.items()) + "}"
+    names = [_type_name(value) for value in params]
+    if len(names) > 10:
+        return f"({', '.join(names[:10])}, ... {len(names)} values)"
+    return f"({', '.join(names)})"
+
+
+def explain(conn, sql: str, params) -> tuple[str, ...] | None:
+    """``EXPLAIN QUERY PLAN`` as indented lines, or None if not applicable"""
+    words = sql.split(None, 1)
+    if not words or words[0].upper() not in EXPLAINABLE:
+        return None
+    if params is None:
+        # executemany: the plan does not depend on the values
+        params = (None,) * sql.count("?")
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    except sqlite3.Error as e:
+        return (f"EXPLAIN failed: {e}",)
+
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return tuple(lines)
+
+
+def _type_name(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "blob"
+    return type(value).__name__
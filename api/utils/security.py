@@ -1,5 +1,188 @@
+import asyncio
+import base64
 import hashlib
+import hmac
+import re
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api.config import (
+    PASSWORD_SCRYPT_LOG_N,
+    PASSWORD_SCRYPT_R,
+    PASSWORD_SCRYPT_P,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+)
+from api.utils.metrics import password_hash_duration, registry
+
+# Unsalted SHA-256 hex digests written before scrypt was introduced
+_LEGACY_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+_SCRYPT_FORMAT = re.compile(
+    r"^\$scrypt\$ln=(\d+),r=(\d+),p=(\d+)\$([A-Za-z0-9+/]+)\$([A-Za-z0-9+/]+)$"
+)
+_SALT_BYTES = 16
+_KEY_BYTES = 32
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash jobs are already running or queued"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    n = 2**log_n
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=2 * 128 * r * n * p + 1024 * 1024,
+        dklen=_KEY_BYTES,
+    )
+
+
+class PasswordHasher:
+    """scrypt password hashing on a bounded worker pool.
+
+    Hashes are self-describing (``$scrypt$ln=..,r=..,p=..$salt$key``), so the
+    cost can be raised at any time: ``needs_rehash`` flags hashes made with
+    other parameters, and legacy unsalted SHA-256 digests, for upgrade on
+    the next successful login.
+
+    The ``*_async`` methods run on a dedicated thread pool (hashlib.scrypt
+    releases the GIL) so a login never stalls the event loop. At most
+    ``max_pending`` jobs may run or wait at once; past that callers get
+    ``PasswordHasherBusy`` instead of joining an ever-growing queue.
+    """
+
+    def __init__(
+        self,
+        log_n: int = PASSWORD_SCRYPT_LOG_N,
+        r: int = PASSWORD_SCRYPT_R,
+        p: int = PASSWORD_SCRYPT_P,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+    ):
+        self.log_n = log_n
+        self.r = r
+        self.p = p
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._dummy_hash = None
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(_SALT_BYTES)
+        key = _scrypt(password, salt, self.log_n, self.r, self.p)
+        return (
+            f"$scrypt$ln={self.log_n},r={self.r},p={self.p}"
+            f"${_b64encode(salt)}${_b64encode(key)}"
+        )
+
+    def verify(self, password: str, encoded: str) -> bool:
+        if _LEGACY_SHA256.match(encoded):
+            legacy = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy, encoded)
+
+        match = _SCRYPT_FORMAT.match(encoded)
+        if not match:
+            return False
+
+        log_n, r, p = (int(value) for value in match.group(1, 2, 3))
+        key = _scrypt(password, _b64decode(match.group(4)), log_n, r, p)
+        return hmac.compare_digest(key, _b64decode(match.group(5)))
+
+    def verify_dummy(self, password: str) -> bool:
+        """Costs what ``verify`` against a current hash costs, for callers
+        with no hash to check (an unknown user); always False"""
+        dummy = self._dummy_hash
+        if dummy is None:
+            dummy = self._dummy_hash = self.hash(secrets.token_urlsafe(16))
+        self.verify(password, dummy)
+        return False
+
+    def needs_rehash(self, encoded: str) -> bool:
+        match = _SCRYPT_FORMAT.match(encoded)
+        if not match:
+            return True
+        return tuple(int(value) for value in match.group(1, 2, 3)) != (
+            self.log_n,
+            self.r,
+            self.p,
+        )
+
+    async def hash_async(self, password: str) -> str:
+        return await self._submit(_timed, "hash", self.hash, password)
+
+    async def verify_async(self, password: str, encoded: str) -> bool:
+        return await self._submit(_timed, "verify", self.verify, password, encoded)
+
+    async def verify_dummy_async(self, password: str) -> bool:
+        return await self._submit(_timed, "verify", self.verify_dummy, password)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusy(
+                    f"{self._pending} password hash jobs already pending"
+                )
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+def _timed(operation: str, fn, *args):
+    """Runs one hash job, recording its duration when metrics are on"""
+    if not registry.enabled:
+        return fn(*args)
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        password_hash_duration.observe(time.perf_counter() - started, operation)
+
+
+password_hasher = PasswordHasher()
+
+
+@registry.collector
+def _hasher_metrics():
+    return [
+        (
+            "password_hash_pending",
+            "gauge",
+            "Hash jobs running or queued",
+            [({}, password_hasher.pending)],
+        ),
+    ]
 
 
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hashes synchronously with the default hasher (scripts and fixtures)"""
+    return password_hasher.hash(password)
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    return password_hasher.verify(password, encoded)
@@ -0,0 +1,146 @@
+"""Personal records and e1RM trends: row-by-row Python vs NumPy columns.
+
+"python" fetches sqlite3.Row objects and loops over them, keeping per
+exercise bests in dicts and a per-day e1RM series with a rolling mean.
+"numpy" is what the /reports endpoints run: the same rows fetched as plain
+tuples straight into a NumPy record array (LiftHistory.from_records), then
+personal_records and e1rm_trend. Timings include the query.
+
+Run with: python -m benchmarks.bench_analytics
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import deque
+from datetime import date, timedelta
+from api.repositories.report_repository import _load_lift_history
+from api.utils.analytics import e1rm_trend, personal_records
+from database.db import connect_db, create_tables, send_basic_exercises
+
+EXERCISES = 8
+
+ROW_HISTORY = """
+    SELECT se.exercise_id,
+           date(COALESCE(s.completed_at, s.scheduled_date)),
+           COALESCE(se.sets_completed, 1),
+           COALESCE(se.reps_completed, 0),
+           COALESCE(se.weight_used, 0)
+    FROM workout_sessions s
+    JOIN sessions_exercises se ON se.session_id = s.id
+    WHERE s.user_id = ?
+      AND s.status = 'completed'
+      AND COALESCE(s.completed_at, s.scheduled_date) IS NOT NULL
+    ORDER BY s.completed_at, s.id
+"""
+
+
+def seed(db_path, sessions, exercises_per_session):
+    conn = connect_db(db_path)
+    create_tables(conn)
+    send_basic_exercises(conn)
+    user_id = conn.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES ('bench', 'bench@example.com', 'x')"
+    ).lastrowid
+    plan_id = conn.execute(
+        "INSERT INTO workout_plans (user_id, name) VALUES (?, 'Bench plan')", (user_id,)
+    ).lastrowid
+
+    rng = random.Random(42)
+    start = date(2015, 1, 1)
+    conn.executemany(
+        "INSERT INTO workout_sessions (id, workout_plan_id, user_id, completed_at, status) "
+        "VALUES (?, ?, ?, ?, 'completed')",
+        [
+            (i + 1, plan_id, user_id, f"{start + timedelta(days=i)} 18:00:00")
+            for i in range(sessions)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO sessions_exercises "
+        "(session_id, exercise_id, sets_completed, reps_completed, weight_used) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                i + 1,
+                (i + e) % EXERCISES + 1,
+                rng.randint(1, 5),
+                rng.randint(1, 15),
+                rng.randint(20, 200) / 2,
+            )
+            for i in range(sessions)
+            for e in range(exercises_per_session)
+        ],
+    )
+    conn.commit()
+    return conn, user_id
+
+
+def python_baseline(conn, user_id, window):
+    rows = conn.execute(ROW_HISTORY, (user_id,)).fetchall()
+
+    records = {}
+    per_day = {}
+    for row in rows:
+        exercise_id, day, _sets, reps, weight = row[0], row[1], row[2], row[3], row[4]
+        best = records.setdefault(
+            exercise_id, {"max_weight": -1.0, "max_reps": 0, "e1rm": -1.0, "volume": 0.0}
+        )
+        if weight > best["max_weight"]:
+            best["max_weight"], best["max_weight_day"] = weight, day
+        best["max_reps"] = max(best["max_reps"], reps)
+        best["volume"] = max(best["volume"], reps * weight)
+        if reps >= 1:
+            e1rm = weight if reps == 1 else weight * (1 + reps / 30)
+            if e1rm > best["e1rm"]:
+                best["e1rm"], best["e1rm_day"] = e1rm, day
+            if exercise_id == 1:
+                per_day[day] = max(per_day.get(day, 0.0), e1rm)
+
+    trend = []
+    recent = deque(maxlen=window)
+    for day in sorted(per_day):
+        recent.append(per_day[day])
+        trend.append((day, per_day[day], sum(recent) / len(recent)))
+    return records, trend
+
+
+def numpy_path(conn, user_id, window):
+    history = _load_lift_history(conn, user_id)
+    return personal_records(history), e1rm_trend(history, 1, window=window)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="500,2000,8000", help="sessions in the history")
+    parser.add_argument("--exercises", type=int, default=6, help="exercise rows per session")
+    parser.add_argument("--window", type=int, default=7)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'mode':<7} {'p50 ms':>8} {'speedup':>8}")
+    for sessions in (int(value) for value in args.sessions.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            conn, user_id = seed(os.path.join(tmp, "bench.db"), sessions, args.exercises)
+            try:
+                timings = {}
+                for name, fn in (("python", python_baseline), ("numpy", numpy_path)):
+                    samples = []
+                    for _ in range(args.runs):
+                        started = time.perf_counter()
+                        fn(conn, user_id, args.window)
+                        samples.append(time.perf_counter() - started)
+                    timings[name] = statistics.median(samples)
+            finally:
+                conn.close()
+
+        rows = sessions * args.exercises
+        for name, p50 in timings.items():
+            print(f"{rows:>8} {name:<7} {p50 * 1000:>8.2f} {timings['python'] / p50:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""p99 latency of repository calls at 100 concurrent clients.
+
+Compares the previous behaviour, where repositories ran sqlite3 inline on the
+event loop, against the AsyncConnection executor layer. Clients fire requests
+on a fixed schedule (open loop) and latency is measured from the scheduled
+start, so time a request spends stuck behind a blocked event loop counts.
+Most requests are cheap exercise lookups and a few run a heavy aggregate;
+with inline execution the cheap lookups queue behind the heavy ones.
+
+Run with: python -m benchmarks.bench_async_db
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from api.repositories.exercise_repository import ExerciseRepository
+from database.async_db import AsyncConnection
+from database.db import connect_db, create_tables, pooled_connection
+from database.pool import ConnectionPool
+
+HEAVY_QUERY = """
+    SELECT a.category, COUNT(*)
+    FROM exercises a JOIN exercises b ON a.muscle_group = b.muscle_group
+    GROUP BY a.category
+"""
+
+
+class InlineConnection:
+    """The pre-async behaviour: same API, but runs on the calling thread"""
+
+    def __init__(self, conn):
+        self.raw = conn
+
+    async def fetchone(self, sql, params=()):
+        return self.raw.execute(sql, params).fetchone()
+
+    async def fetchall(self, sql, params=()):
+        return self.raw.execute(sql, params).fetchall()
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def reset(self):
+        return True
+
+    def close(self):
+        self.raw.close()
+
+
+def seed(db_path, exercises):
+    conn = connect_db(db_path)
+    create_tables(conn)
+    rng = random.Random(7)
+    groups = ["chest", "legs", "back", "arms", "core", "shoulders", "full_body"]
+    conn.executemany(
+        "INSERT INTO exercises (name, description, category, muscle_group) VALUES (?, ?, ?, ?)",
+        [
+            (f"Exercise {i}", "Synthetic", rng.choice(["strength", "cardio"]), rng.choice(groups))
+            for i in range(exercises)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(
+    wrapper, db_path, clients, requests, interval, pool_size, heavy_ratio, exercises
+):
+    pool = ConnectionPool(
+        lambda: wrapper(connect_db(db_path)),
+        size=pool_size,
+        timeout=60,
+        reset=wrapper.reset,
+        close=wrapper.close,
+    )
+    latencies = []
+    rng = random.Random(42)
+
+    loop = asyncio.get_running_loop()
+    begin = loop.time() + 0.05
+
+    async def client(offset):
+        for i in range(requests):
+            heavy = rng.random() < heavy_ratio
+            scheduled = begin + offset + i * interval
+            await asyncio.sleep(max(0, scheduled - loop.time()))
+            started = scheduled
+            async with pooled_connection(pool) as db:
+                if heavy:
+                    await db.fetchall(HEAVY_QUERY)
+                else:
+                    await ExerciseRepository(db).get_exercise_by_id(
+                        rng.randint(1, exercises)
+                    )
+            if not heavy:
+                latencies.append(loop.time() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client(rng.random() * interval) for _ in range(clients))
+    )
+    elapsed = time.perf_counter() - started
+    pool.close()
+
+    return {
+        "requests": clients * requests,
+        "throughput_rps": clients * requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument(
+        "--interval", type=float, default=0.1, help="seconds between a client's requests"
+    )
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--heavy-ratio", type=float, default=0.01)
+    parser.add_argument("--exercises", type=int, default=600)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        seed(db_path, args.exercises)
+
+        print(f"{'mode':<8} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for name, wrapper in (("inline", InlineConnection), ("async", AsyncConnection)):
+            result = asyncio.run(
+                run_mode(
+                    wrapper,
+                    db_path,
+                    args.clients,
+                    args.requests,
+                    args.interval,
+                    args.pool_size,
+                    args.heavy_ratio,
+                    args.exercises,
+                )
+            )
+            print(
+                f"{name:<8} {result['requests']:>9} {result['throughput_rps']:>9.0f} "
+                f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Rows/sec for uploading workout sessions: per-row commits vs one bulk write.
+
+"per-row" is the pattern UserRepository.create_user used: one INSERT and
+one COMMIT per row (every session and every exercise row). "bulk" is
+SessionRepository.bulk_create_sessions: one BEGIN IMMEDIATE, two
+executemany calls, one COMMIT. Both run on a WAL file database with the
+production "write" profile.
+
+Run with: python -m benchmarks.bench_bulk_sessions
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from api.models.workout_session import WorkoutSessionCreate
+from api.repositories.session_repository import SessionRepository, _timestamp
+from database.async_db import AsyncConnection
+from database.db import connect_db, create_tables, send_basic_exercises
+
+
+def seed(db_path):
+    conn = connect_db(db_path)
+    create_tables(conn)
+    send_basic_exercises(conn)
+    user_id = conn.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES ('bench', 'bench@example.com', 'x')"
+    ).lastrowid
+    plan_id = conn.execute(
+        "INSERT INTO workout_plans (user_id, name) VALUES (?, 'Bench plan')", (user_id,)
+    ).lastrowid
+    conn.commit()
+    conn.close()
+    return user_id, plan_id
+
+
+def make_batch(plan_id, sessions, exercises):
+    start = datetime(2024, 1, 1, 18)
+    return [
+        WorkoutSessionCreate(
+            workout_plan_id=plan_id,
+            completed_at=start + timedelta(days=i),
+            exercises=[
+                {"exercise_id": e % 10 + 1, "sets_completed": 3, "reps_completed": 10, "weight_used": 60.0}
+                for e in range(exercises)
+            ],
+        )
+        for i in range(sessions)
+    ]
+
+
+async def per_row(db, user_id, batch):
+    for session in batch:
+        cursor = await db.execute(
+            "INSERT INTO workout_sessions (workout_plan_id, user_id, completed_at, status) "
+            "VALUES (?, ?, ?, ?)",
+            (session.workout_plan_id, user_id, _timestamp(session.completed_at), session.status),
+        )
+        await db.commit()
+        for exercise in session.exercises:
+            await db.execute(
+                "INSERT INTO sessions_exercises "
+                "(session_id, exercise_id, sets_completed, reps_completed, weight_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    exercise.exercise_id,
+                    exercise.sets_completed,
+                    exercise.reps_completed,
+                    exercise.weight_used,
+                ),
+            )
+            await db.commit()
+
+
+async def bulk(db, user_id, batch):
+    await SessionRepository(db).bulk_create_sessions(user_id, batch, [])
+
+
+async def measure(db_path, mode, batch_size, exercises, batches):
+    user_id, plan_id = seed(db_path)
+    db = AsyncConnection(connect_db(db_path))
+    rows = 0
+    try:
+        started = time.perf_counter()
+        for _ in range(batches):
+            batch = make_batch(plan_id, batch_size, exercises)
+            await mode(db, user_id, batch)
+            rows += batch_size * (1 + exercises)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    return rows / elapsed, elapsed / batches * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="50,200,500", help="sessions per batch")
+    parser.add_argument("--exercises", type=int, default=5, help="exercise rows per session")
+    parser.add_argument("--batches", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8} {'mode':<8} {'rows/s':>10} {'ms/batch':>10} {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        results = {}
+        for name, mode in (("per-row", per_row), ("bulk", bulk)):
+            with tempfile.TemporaryDirectory() as tmp:
+                results[name] = asyncio.run(
+                    measure(os.path.join(tmp, "bench.db"), mode, size, args.exercises, args.batches)
+                )
+        for name, (rate, batch_ms) in results.items():
+            speedup = rate / results["per-row"][0]
+            print(f"{size:>8} {name:<8} {rate:>10.0f} {batch_ms:>10.1f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Requests/sec for GET /exercises/ with and without pre-serialized bodies.
+
+Drives the real app in-process through httpx's ASGI transport against a
+temporary catalog. Both modes serve from the warm catalog cache, so the
+difference is the per-request validation and JSON encoding that
+response_model does on the model path.
+
+Run with: python -m benchmarks.bench_catalog_response
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from api.controllers import exercise_controller
+from database.async_db import AsyncConnection
+from database.db import connect_db, create_tables, get_read_db
+from main import app
+
+MODES = (
+    ("response_model", False, "identity"),
+    ("preserialized", True, "identity"),
+    ("preserialized+gzip", True, "gzip"),
+)
+
+
+def seed(db_path, exercises):
+    conn = connect_db(db_path)
+    create_tables(conn)
+    conn.executemany(
+        "INSERT INTO exercises (name, description, category, muscle_group) VALUES (?, ?, ?, ?)",
+        [
+            (f"Exercise {i}", f"Synthetic exercise number {i}", "strength", "legs")
+            for i in range(exercises)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+async def measure(db, requests, preserialized, encoding):
+    async def override_get_read_db():
+        yield db
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    exercise_controller.CATALOG_PRESERIALIZED = preserialized
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": encoding}
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Warm the catalog cache
+            await client.get("/exercises/", headers=headers)
+
+            started = time.perf_counter()
+            for _ in range(requests):
+                response = await client.get("/exercises/", headers=headers)
+                response.raise_for_status()
+            elapsed = time.perf_counter() - started
+    finally:
+        app.dependency_overrides.clear()
+
+    return requests / elapsed, response.num_bytes_downloaded
+
+
+async def run(db_path, requests):
+    db = AsyncConnection(connect_db(db_path, profile="read"))
+    try:
+        results = []
+        for name, preserialized, encoding in MODES:
+            rps, size = await measure(db, requests, preserialized, encoding)
+            results.append((name, rps, size))
+        return results
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--exercises", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        seed(db_path, args.exercises)
+        results = asyncio.run(run(db_path, args.requests))
+
+    baseline = results[0][1]
+    print(f"{'mode':<20} {'req/s':>9} {'speedup':>8} {'wire bytes':>11}")
+    for name, rps, size in results:
+        print(f"{name:<20} {rps:>9.0f} {rps / baseline:>7.1f}x {size:>11}")
+
+
+if __name__ == "__main__":
+    main()
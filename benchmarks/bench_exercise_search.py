@@ -0,0 +1,115 @@
+"""Type-ahead search latency on a synthetic 100k-exercise catalog.
+
+Compares ExerciseRepository.search_exercises (FTS5 prefix match, bm25
+ranking) with a LIKE '%...%' scan ranked the same way (name hits first),
+using the same mix of broad and selective type-ahead queries for both.
+
+Run with: python -m benchmarks.bench_exercise_search
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from api.repositories.exercise_repository import ExerciseRepository
+from database.async_db import AsyncConnection
+from database.db import connect_db, create_tables
+
+EQUIPMENT = ["Barbell", "Dumbbell", "Kettlebell", "Cable", "Band", "Machine", "Smith", "Bodyweight"]
+STANCES = ["Incline", "Decline", "Seated", "Standing", "Kneeling", "Single-arm", "Wide", "Close-grip"]
+MOVEMENTS = [
+    "Press", "Row", "Curl", "Squat", "Lunge", "Deadlift", "Fly", "Raise",
+    "Extension", "Pulldown", "Thrust", "Carry", "Shrug", "Crunch", "Twist",
+]
+GROUPS = ["chest", "legs", "back", "arms", "core", "shoulders", "full_body"]
+QUERIES = [
+    # broad prefixes matching thousands of rows
+    "pre", "dumb", "squ", "dead",
+    # narrower as the user keeps typing
+    "dumbbell ro", "incline pr", "kettlebell shr", "cable fl",
+    # selective: only a handful of matches
+    "4242", "twist 777",
+]
+
+LIKE_SQL = """
+    SELECT id, name, description, category, muscle_group FROM exercises
+    WHERE name LIKE ? OR description LIKE ?
+    ORDER BY name LIKE ? DESC, id
+    LIMIT ?
+"""
+
+
+def seed(db_path, exercises):
+    rng = random.Random(100)
+    conn = connect_db(db_path)
+    create_tables(conn)
+    rows = []
+    for i in range(exercises):
+        name = f"{rng.choice(STANCES)} {rng.choice(EQUIPMENT)} {rng.choice(MOVEMENTS)} {i}"
+        description = f"{rng.choice(MOVEMENTS)} variation targeting the {rng.choice(GROUPS)}"
+        rows.append((name, description, "strength", rng.choice(GROUPS)))
+    conn.executemany(
+        "INSERT INTO exercises (name, description, category, muscle_group) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+async def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            started = time.perf_counter()
+            await fn(query)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(name, samples):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<8} {statistics.mean(samples) * 1000:>9.2f} "
+        f"{p99 * 1000:>9.2f} {len(samples) / sum(samples):>9.0f}"
+    )
+
+
+async def run(db_path, rounds, limit):
+    db = AsyncConnection(connect_db(db_path, profile="read"))
+    repo = ExerciseRepository(db)
+
+    async def like(query):
+        # Multi-word input has to match as one substring, which is already
+        # less forgiving than the per-word FTS query.
+        pattern = f"%{query}%"
+        return await db.fetchall(LIKE_SQL, (pattern, pattern, pattern, limit))
+
+    try:
+        print(f"{'method':<8} {'mean ms':>9} {'p99 ms':>9} {'qps':>9}")
+        report("fts5", await timed(lambda q: repo.search_exercises(q, limit), rounds))
+        report("like", await timed(like, rounds))
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--exercises", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        started = time.perf_counter()
+        seed(db_path, args.exercises)
+        print(f"seeded {args.exercises} exercises in {time.perf_counter() - started:.1f}s")
+        asyncio.run(run(db_path, args.rounds, args.limit))
+
+
+if __name__ == "__main__":
+    main()
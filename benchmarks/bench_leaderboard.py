@@ -0,0 +1,142 @@
+"""Weekly leaderboard: top-N plus "my rank" per request, three ways.
+
+"raw" aggregates sessions_exercises for the week and sorts on every
+request (the ORDER BY SUM(...) approach). "rollup" sorts the
+per-user rows of volume_weekly instead. "index" is LeaderboardService:
+the board is loaded once, then each request is a slice and a bisect.
+
+Run with: python -m benchmarks.bench_leaderboard
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date
+from api.repositories.leaderboard_repository import LeaderboardRepository
+from api.repositories.report_repository import rebuild_volume_rollups
+from api.services.leaderboard_service import LeaderboardService
+from api.utils.leaderboard import LeaderboardIndex
+from database.async_db import AsyncConnection
+from database.db import connect_db, create_tables, send_basic_exercises
+
+WEEK = "2024-03-04"
+
+RAW = """
+    SELECT s.user_id,
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)
+               * COALESCE(se.weight_used, 0)) AS score
+    FROM workout_sessions s
+    JOIN sessions_exercises se ON se.session_id = s.id
+    WHERE s.status = 'completed'
+      AND date(COALESCE(s.completed_at, s.scheduled_date)) BETWEEN ? AND date(?, '+6 days')
+    GROUP BY s.user_id
+    ORDER BY score DESC
+"""
+
+ROLLUP = """
+    SELECT user_id, SUM(volume) AS score FROM volume_weekly
+    WHERE week = ? GROUP BY user_id ORDER BY score DESC
+"""
+
+
+def seed(db_path, users, sessions_per_user):
+    conn = connect_db(db_path)
+    create_tables(conn)
+    send_basic_exercises(conn)
+    rng = random.Random(3)
+    conn.executemany(
+        "INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, 'x')",
+        [(n, f"u{n}", f"u{n}@example.com") for n in range(1, users + 1)],
+    )
+    conn.executemany(
+        "INSERT INTO workout_plans (id, user_id, name) VALUES (?, ?, 'Plan')",
+        [(n, n) for n in range(1, users + 1)],
+    )
+    sessions = [
+        (n * sessions_per_user + i, n, n, f"2024-03-0{4 + i % 7} 18:00:00")
+        for n in range(1, users + 1)
+        for i in range(sessions_per_user)
+    ]
+    conn.executemany(
+        "INSERT INTO workout_sessions (id, workout_plan_id, user_id, completed_at, status) "
+        "VALUES (?, ?, ?, ?, 'completed')",
+        sessions,
+    )
+    conn.executemany(
+        "INSERT INTO sessions_exercises "
+        "(session_id, exercise_id, sets_completed, reps_completed, weight_used) "
+        "VALUES (?, ?, 3, ?, ?)",
+        [
+            (session[0], e + 1, rng.randint(5, 12), rng.randint(20, 150))
+            for session in sessions
+            for e in range(5)
+        ],
+    )
+    conn.commit()
+    rebuild_volume_rollups(conn)
+    return conn
+
+
+def sql_board(conn, sql, params, user_id, limit):
+    rows = conn.execute(sql, params).fetchall()
+    top = rows[:limit]
+    rank = next(i + 1 for i, row in enumerate(rows) if row[0] == user_id)
+    return top, rank
+
+
+async def index_requests(conn, users, limit, runs):
+    service = LeaderboardService(LeaderboardRepository(AsyncConnection(conn)), LeaderboardIndex(8))
+    board_week = date.fromisoformat(WEEK)
+
+    started = time.perf_counter()
+    await service._board(WEEK, None)
+    load = time.perf_counter() - started
+
+    rng = random.Random(1)
+    samples = []
+    for _ in range(runs):
+        user_id = rng.randint(1, users)
+        started = time.perf_counter()
+        board = await service._board(board_week.isoformat(), None)
+        board.top(limit)
+        board.rank(user_id)
+        samples.append(time.perf_counter() - started)
+    return load, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=4, help="sessions per user that week")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = seed(os.path.join(tmp, "bench.db"), args.users, args.sessions)
+        rng = random.Random(1)
+        results = {}
+        for name, sql, params in (("raw", RAW, (WEEK, WEEK)), ("rollup", ROLLUP, (WEEK,))):
+            samples = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                sql_board(conn, sql, params, rng.randint(1, args.users), args.limit)
+                samples.append(time.perf_counter() - started)
+            results[name] = statistics.median(samples)
+        load, samples = asyncio.run(index_requests(conn, args.users, args.limit, args.runs * 50))
+        results["index"] = statistics.median(samples)
+        conn.close()
+
+    print(f"{args.users} users, {args.users * args.sessions * 5} exercise rows in the week")
+    print(f"{'mode':<7} {'p50 ms':>9} {'speedup':>9}")
+    for name, p50 in results.items():
+        print(f"{name:<7} {p50 * 1000:>9.3f} {results['raw'] / p50:>8.0f}x")
+    print(f"index board load (once per rebuild): {load * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
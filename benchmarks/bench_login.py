@@ -0,0 +1,126 @@
+"""Login throughput, p99 latency and event-loop lag with scrypt hashing.
+
+Drives AuthService.login on a fixed arrival schedule (open loop) with the
+production hash cost, and runs a heartbeat task that ticks every few
+milliseconds to measure how long the event loop is blocked. Compares
+hashing inline on the loop against the bounded password-hash pool; the
+interesting number is the heartbeat lag, which every other request on the
+server would pay too.
+
+Run with: python -m benchmarks.bench_login
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+from api.models.user import UserLogin
+from api.services import auth_service
+from api.services.auth_service import AuthService
+from api.utils.security import PasswordHasher
+
+HEARTBEAT = 0.005
+
+
+class InlineHasher(PasswordHasher):
+    """Same hashes, but computed on the calling (event loop) thread"""
+
+    async def hash_async(self, password):
+        return self.hash(password)
+
+    async def verify_async(self, password, encoded):
+        return self.verify(password, encoded)
+
+
+class StaticUserRepository:
+    """Serves one stored user so the benchmark measures hashing, not SQL"""
+
+    def __init__(self, password_hash):
+        self.user = SimpleNamespace(id=1, email="bench@example.com", password_hash=password_hash)
+
+    async def get_user_by_email(self, email):
+        return self.user
+
+    async def update_password_hash(self, user_id, password_hash):
+        self.user.password_hash = password_hash
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(hasher, rate, duration):
+    repo = StaticUserRepository(hasher.hash("benchpass"))
+    service = AuthService(repo)
+    credentials = UserLogin(email="bench@example.com", password="benchpass")
+
+    loop = asyncio.get_running_loop()
+    latencies, lags = [], []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            expected = loop.time() + HEARTBEAT
+            await asyncio.sleep(HEARTBEAT)
+            lags.append(max(0.0, loop.time() - expected))
+
+    async def login(scheduled):
+        await asyncio.sleep(max(0, scheduled - loop.time()))
+        await service.login(credentials)
+        latencies.append(loop.time() - scheduled)
+
+    beat = asyncio.create_task(heartbeat())
+    begin = loop.time() + 0.05
+    total = int(rate * duration)
+    started = time.perf_counter()
+    with patch.object(auth_service, "password_hasher", hasher):
+        await asyncio.gather(*(login(begin + i / rate) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await beat
+
+    return {
+        "logins": total,
+        "throughput": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "lag_p99_ms": percentile(lags, 99) * 1000,
+        "lag_max_ms": max(lags) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=10, help="logins per second")
+    parser.add_argument("--duration", type=float, default=5, help="seconds of load")
+    parser.add_argument("--log-n", type=int, default=14)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--slo-ms", type=float, default=250, help="login p99 target")
+    args = parser.parse_args()
+
+    modes = (
+        ("inline", InlineHasher(log_n=args.log_n, workers=1)),
+        ("pool", PasswordHasher(log_n=args.log_n, workers=args.workers)),
+    )
+
+    print(f"scrypt ln={args.log_n}, {args.rate:g} logins/s for {args.duration:g}s, SLO p99 {args.slo_ms:g} ms")
+    print(
+        f"{'mode':<8} {'logins/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'lag p99':>9} {'lag max':>9} {'SLO':>5}"
+    )
+    for name, hasher in modes:
+        result = asyncio.run(run_mode(hasher, args.rate, args.duration))
+        verdict = "ok" if result["p99_ms"] <= args.slo_ms else "MISS"
+        print(
+            f"{name:<8} {result['throughput']:>9.1f} {result['p50_ms']:>9.1f} "
+            f"{result['p99_ms']:>9.1f} {result['lag_p99_ms']:>9.1f} "
+            f"{result['lag_max_ms']:>9.1f} {verdict:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Weekly volume report latency: aggregating raw history vs reading rollups.
+
+"on-the-fly" groups workout_sessions joined to sessions_exercises and
+exercises for one user on every request. "rollup" is
+ReportRepository.get_volume, which reads volume_weekly by primary key.
+Both answer the same year-long, per-muscle-group weekly report for one
+user of many.
+
+Run with: python -m benchmarks.bench_reports
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from api.models.workout_session import WorkoutSessionCreate
+from api.repositories.report_repository import ReportRepository
+from api.repositories.session_repository import SessionRepository
+from database.async_db import AsyncConnection
+from database.db import connect_db, create_tables, send_basic_exercises
+
+ON_THE_FLY = """
+    SELECT date(COALESCE(s.completed_at, s.scheduled_date), 'weekday 0', '-6 days') AS week,
+           e.muscle_group,
+           SUM(COALESCE(se.sets_completed, 1)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)
+               * COALESCE(se.weight_used, 0))
+    FROM workout_sessions s
+    JOIN sessions_exercises se ON se.session_id = s.id
+    JOIN exercises e ON e.id = se.exercise_id
+    WHERE s.user_id = ? AND s.status = 'completed'
+      AND date(COALESCE(s.completed_at, s.scheduled_date)) BETWEEN ? AND ?
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+
+async def seed(db_path, users, sessions_per_user, exercises):
+    conn = connect_db(db_path)
+    create_tables(conn)
+    send_basic_exercises(conn)
+    conn.commit()
+    db = AsyncConnection(conn)
+    repo = SessionRepository(db)
+    start = datetime(2024, 1, 1, 18)
+    for n in range(users):
+        user_id = conn.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES (?, ?, 'x')",
+            (f"bench{n}", f"bench{n}@example.com"),
+        ).lastrowid
+        plan_id = conn.execute(
+            "INSERT INTO workout_plans (user_id, name) VALUES (?, 'Bench plan')", (user_id,)
+        ).lastrowid
+        conn.commit()
+        batch = [
+            WorkoutSessionCreate(
+                workout_plan_id=plan_id,
+                completed_at=start + timedelta(hours=i * 365 * 24 // sessions_per_user),
+                exercises=[
+                    {
+                        "exercise_id": (i + e) % 8 + 1,
+                        "sets_completed": 3,
+                        "reps_completed": 10,
+                        "weight_used": 60.0,
+                    }
+                    for e in range(exercises)
+                ],
+            )
+            for i in range(sessions_per_user)
+        ]
+        await repo.bulk_create_sessions(user_id, batch, [])
+    return db, user_id
+
+
+async def measure(db, user_id, runs):
+    repo = ReportRepository(db)
+    timings = {"on-the-fly": [], "rollup": []}
+    for _ in range(runs):
+        started = time.perf_counter()
+        await db.fetchall(ON_THE_FLY, (user_id, "2024-01-01", "2024-12-31"))
+        timings["on-the-fly"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await repo.get_volume(user_id, "weekly", "muscle_group", "2024-01-01", "2024-12-31")
+        timings["rollup"].append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=1000, help="sessions per user")
+    parser.add_argument("--exercises", type=int, default=6, help="exercise rows per session")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = asyncio.run(
+            seed(os.path.join(tmp, "bench.db"), args.users, args.sessions, args.exercises)
+        )
+        try:
+            timings = asyncio.run(measure(db, user_id, args.runs))
+        finally:
+            db.close()
+
+    print(
+        f"{args.users} users x {args.sessions} sessions x {args.exercises} exercises; "
+        "weekly report by muscle group for one user"
+    )
+    print(f"{'mode':<11} {'p50 ms':>8} {'p95 ms':>8} {'speedup':>8}")
+    baseline = statistics.median(timings["on-the-fly"])
+    for name, samples in timings.items():
+        samples.sort()
+        p50 = statistics.median(samples)
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{name:<11} {p50 * 1000:>8.2f} {p95 * 1000:>8.2f} {baseline / p50:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
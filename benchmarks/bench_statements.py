@@ -0,0 +1,156 @@
+"""Per-query cost of the hot lookups: statement cache and cursor reuse.
+
+Each registered lookup (exercise.by_id, user.by_email) is timed on its own,
+with ``--between`` other distinct statements run on the connection between
+two lookups, standing in for the filtered pages and reports a long-lived
+pooled connection serves in the meantime. The statement cache is an LRU:
+once more distinct statements than it holds run between two uses of a
+lookup, the lookup has been evicted and is parsed and planned again.
+
+* "uncached":  cached_statements=0, a prepare on every call
+* "default":   the stock 128-entry cache, evicted by the working set
+* "sized":     cached_statements=DB_STATEMENT_CACHE_SIZE
+* "+cursor":   sized cache and one cursor reused for every call
+
+"async" is the same lookup through AsyncConnection.fetchone with the sized
+cache, to put the raw numbers next to the cost of the hop to the
+connection thread.
+
+Run with: python -m benchmarks.bench_statements
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from api.config import DB_STATEMENT_CACHE_SIZE
+from database.async_db import AsyncConnection
+from database.db import create_tables, send_basic_exercises
+from database.statements import EXERCISE_BY_ID, USER_BY_EMAIL, prepare_statements
+
+LOOKUPS = {
+    "exercise.by_id": (EXERCISE_BY_ID, lambda i, users: (i % 8 + 1,)),
+    "user.by_email": (USER_BY_EMAIL, lambda i, users: (f"user{i % users}@example.com",)),
+}
+
+
+def seed(db_path, users):
+    conn = sqlite3.connect(db_path)
+    create_tables(conn)
+    send_basic_exercises(conn)
+    conn.executemany(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, 'x')",
+        [(f"user{i}", f"user{i}@example.com") for i in range(users)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def filler(count):
+    return [
+        f"SELECT id, name FROM exercises WHERE id > ? ORDER BY id LIMIT {n + 1}"
+        for n in range(count)
+    ]
+
+
+def open_db(db_path, cached_statements):
+    conn = sqlite3.connect(db_path, cached_statements=cached_statements, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    prepare_statements(conn)
+    return conn
+
+
+def per_query(conn, sql, params_for, others, iterations, users, reuse_cursor=False):
+    """Mean microseconds per lookup, with every other statement run in between"""
+    cursor = conn.cursor()
+    elapsed = 0
+    for i in range(iterations):
+        for other in others:
+            conn.execute(other, (0,)).fetchall()
+        params = params_for(i, users)
+        started = time.perf_counter_ns()
+        if reuse_cursor:
+            cursor.execute(sql, params).fetchone()
+        else:
+            conn.execute(sql, params).fetchone()
+        elapsed += time.perf_counter_ns() - started
+    return elapsed / iterations / 1000
+
+
+def run_others(conn, others):
+    for other in others:
+        conn.execute(other, (0,)).fetchall()
+
+
+async def per_query_async(conn, sql, params_for, others, iterations, users):
+    db = AsyncConnection(conn)
+    elapsed = 0
+    try:
+        for i in range(iterations):
+            await db.run(run_others, others)
+            params = params_for(i, users)
+            started = time.perf_counter_ns()
+            await db.fetchone(sql, params)
+            elapsed += time.perf_counter_ns() - started
+    finally:
+        db.reset()
+    return elapsed / iterations / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument(
+        "--between", type=int, default=150, help="distinct statements run between two lookups"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        seed(db_path, args.users)
+        others = filler(args.between)
+        configs = {
+            "uncached": 0,
+            "default": 128,
+            "sized": DB_STATEMENT_CACHE_SIZE,
+        }
+
+        print(
+            f"{args.between} other statements between lookups, "
+            f"cache size {DB_STATEMENT_CACHE_SIZE}, us per lookup"
+        )
+        print(
+            f"{'lookup':<16} {'uncached':>9} {'default':>9} {'sized':>9} "
+            f"{'+cursor':>9} {'async':>9} {'gain':>6}"
+        )
+        for name, (sql, params_for) in LOOKUPS.items():
+            results = {}
+            for label, size in configs.items():
+                conn = open_db(db_path, size)
+                results[label] = per_query(
+                    conn, sql, params_for, others, args.iterations, args.users
+                )
+                if label == "sized":
+                    results["+cursor"] = per_query(
+                        conn, sql, params_for, others, args.iterations, args.users, True
+                    )
+                    results["async"] = asyncio.run(
+                        per_query_async(
+                            conn, sql, params_for, others, args.iterations // 4, args.users
+                        )
+                    )
+                conn.close()
+
+            print(
+                f"{name:<16} {results['uncached']:>9.2f} {results['default']:>9.2f} "
+                f"{results['sized']:>9.2f} {results['+cursor']:>9.2f} "
+                f"{results['async']:>9.2f} "
+                f"{results['default'] / results['+cursor']:>5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
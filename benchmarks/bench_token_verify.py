@@ -0,0 +1,86 @@
+"""Bearer-token verifications per second, per algorithm, cold vs cached.
+
+"verify" is a full KeyRing.verify (header parse, kid lookup, signature
+check, claim validation) on every call. "cached" goes through the
+get_current_user dependency with a warm VerifiedTokenCache, which is what a
+client reusing its access token costs after the first request.
+
+Run with: python -m benchmarks.bench_token_verify
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from fastapi.security import HTTPAuthorizationCredentials
+from api.utils import auth
+from api.utils.jwt_keys import KeyRing, hmac_key, pem_key
+
+
+def pem(private):
+    return private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def key_rings():
+    return {
+        "HS256": KeyRing(hmac_key("bench-secret")),
+        "RS256": KeyRing(
+            pem_key(pem(rsa.generate_private_key(public_exponent=65537, key_size=2048)), "RS256")
+        ),
+        "ES256": KeyRing(pem_key(pem(ec.generate_private_key(ec.SECP256R1())), "ES256")),
+        "EdDSA": KeyRing(pem_key(pem(ed25519.Ed25519PrivateKey.generate()), "EdDSA")),
+    }
+
+
+def run_sync(coro):
+    """Drives a coroutine that never suspends, without event-loop overhead"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("dependency suspended")
+
+
+def rate(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    claims = {
+        "user_id": 1,
+        "email": "bench@example.com",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+    }
+
+    print(f"{'alg':<6} {'verify/s':>10} {'cached/s':>10} {'speedup':>8}")
+    for name, ring in key_rings().items():
+        token = ring.sign(claims)
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        cold = rate(lambda: ring.verify(token), args.iterations)
+
+        with patch.object(auth, "get_key_ring", lambda: ring):
+            auth.token_cache.clear()
+            cached = rate(
+                lambda: run_sync(auth.get_current_user(credentials)), args.iterations
+            )
+            auth.token_cache.clear()
+
+        print(f"{name:<6} {cold:>10.0f} {cached:>10.0f} {cached / cold:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Load test of the API hot paths, in-process through httpx's ASGI transport.
+
+Seeds a SQLite file with synthetic history (database.generator) at a
+named scale (the number of ``sessions_exercises`` rows), then runs
+``--concurrency`` virtual users against the real application for
+``--duration`` seconds. Each virtual user logs in as one of the seeded
+users, picked as often as that user trains, and keeps picking scenarios
+from the chosen mix:
+
+* login:   POST /auth/login (scrypt at the production cost)
+* browse:  the exercise catalog, one exercise, a catalog search
+* log:     POST /sessions/bulk with one five-exercise session
+* report:  weekly volume report, personal records, weekly leaderboard
+
+Requests go through routing, dependencies, the connection pools and the
+metrics middleware exactly as in production; only the network is
+missing. Seeded databases are kept under ``benchmarks/data`` and reused,
+since the larger scales take a while to build.
+
+The result is printed (and with ``--output`` written) as JSON: overall
+and per-scenario throughput and latency percentiles. ``manage.py bench``
+runs the suite and compares the result against a saved baseline.
+
+Run with: python -m benchmarks.suite --scale 100k --mix default
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Target sessions_exercises rows
+SCALES = {"1k": 1_000, "100k": 100_000, "10m": 10_000_000}
+
+# Relative weights per scenario
+MIXES = {
+    "default": {"login": 2, "browse": 50, "log": 18, "report": 30},
+    "read": {"browse": 60, "report": 40},
+    "write": {"log": 80, "browse": 20},
+    "login": {"login": 100},
+}
+
+BENCH_PASSWORD = "bench-password"
+EXERCISES_PER_SESSION = 5
+SEARCH_TERMS = ("press", "squat", "run", "pull", "stretch")
+
+# A p50/p99 rise or throughput drop beyond this fraction is a regression
+DEFAULT_TOLERANCE = 0.20
+
+
+def database_path(scale: str) -> Path:
+    return DATA_DIR / f"bench-{scale}.db"
+
+
+def seed(path: Path, rows: int) -> None:
+    """Builds a fresh database with ``rows`` exercise rows of synthetic
+    history (see database.generator)"""
+    from database.db import connect_db, create_tables, send_basic_exercises
+    from database.generator import generate
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    conn = connect_db(str(path))
+    create_tables(conn)
+    send_basic_exercises(conn)
+    generate(conn, rows, seed=1, password=BENCH_PASSWORD)
+    conn.close()
+
+
+def seeded_users(path: Path) -> list[tuple[int, int, int]]:
+    """``(user_id, plan_id, sessions)`` per user, so virtual users pick
+    accounts as skewed as the history itself"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            """
+            SELECT p.user_id, MIN(p.id),
+                   (SELECT COUNT(*) FROM workout_sessions s WHERE s.user_id = p.user_id)
+            FROM workout_plans p
+            GROUP BY p.user_id
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+class VirtualUser:
+    def __init__(self, client, rng: random.Random, users: list, exercise_ids: list[int]):
+        self.client = client
+        self.rng = rng
+        self.user_id, self.plan_id, _ = rng.choices(users, [1 + row[2] for row in users])[0]
+        self.exercise_ids = exercise_ids
+        self.headers = {}
+        # Report windows end where the generated history does, not today
+        from database.generator import DEFAULT_END
+
+        self.history_end = DEFAULT_END.isoformat()
+
+    async def login(self):
+        response = await self.client.post(
+            "/auth/login",
+            json={"email": f"user{self.user_id}@example.com", "password": BENCH_PASSWORD},
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def browse(self):
+        choice = self.rng.random()
+        if choice < 0.4:
+            return await self.client.get("/exercises/")
+        if choice < 0.8:
+            return await self.client.get(f"/exercises/{self.rng.choice(self.exercise_ids)}")
+        return await self.client.get(
+            "/exercises/search", params={"q": self.rng.choice(SEARCH_TERMS)}
+        )
+
+    async def log(self):
+        body = {
+            "sessions": [
+                {
+                    "workout_plan_id": self.plan_id,
+                    "completed_at": datetime.now(timezone.utc).isoformat(),
+                    "exercises": [
+                        {
+                            "exercise_id": self.rng.choice(self.exercise_ids),
+                            "sets_completed": 3,
+                            "reps_completed": self.rng.randint(5, 12),
+                            "weight_used": float(self.rng.randint(20, 140)),
+                        }
+                        for _ in range(EXERCISES_PER_SESSION)
+                    ],
+                }
+            ]
+        }
+        return await self.client.post("/sessions/bulk", json=body, headers=self.headers)
+
+    async def report(self):
+        choice = self.rng.random()
+        if choice < 0.5:
+            return await self.client.get(
+                "/reports/volume",
+                params={
+                    "period": "weekly",
+                    "group_by": "muscle_group",
+                    "end": self.history_end,
+                },
+                headers=self.headers,
+            )
+        if choice < 0.75:
+            return await self.client.get("/reports/records", headers=self.headers)
+        return await self.client.get(
+            "/leaderboards/weekly",
+            params={"week": self.history_end},
+            headers=self.headers,
+        )
+
+
+async def run_load(app, users: list, mix: dict, concurrency: int, duration: float, seed_value: int):
+    import httpx
+
+    samples = {name: [] for name in mix}
+    errors = {name: 0 for name in mix}
+    names, weights = list(mix), list(mix.values())
+
+    async def record(name, call):
+        started = time.perf_counter()
+        try:
+            response = await call()
+            failed = response.status_code >= 400
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - started
+        samples.setdefault(name, []).append(elapsed)
+        if failed:
+            errors[name] = errors.get(name, 0) + 1
+
+    async def virtual_user(n, client, exercise_ids, deadline):
+        vu = VirtualUser(client, random.Random(seed_value + n), users, exercise_ids)
+        await record("login", vu.login)
+        while time.perf_counter() < deadline:
+            name = vu.rng.choices(names, weights)[0]
+            await record(name, getattr(vu, name))
+
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        exercise_ids = [item["id"] for item in (await client.get("/exercises/")).json()]
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(virtual_user(n, client, exercise_ids, deadline) for n in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+    return samples, errors, elapsed
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(ordered, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def run(scale: str, mix: str, concurrency: int, duration: float, seed_value: int = 1,
+        reseed: bool = False) -> dict:
+    """Seeds (or reuses) the scale's database, runs the mix, returns the result"""
+    path = database_path(scale)
+    # Must be set before the application (and so api.config) is imported
+    os.environ.setdefault("ENV", "bench")
+    os.environ["DB_PATH"] = str(path)
+    if "api.config" in sys.modules and sys.modules["api.config"].DB_PATH != str(path):
+        raise RuntimeError("benchmarks.suite must run before the application is imported")
+
+    if reseed or not path.exists():
+        started = time.perf_counter()
+        seed(path, SCALES[scale])
+        print(f"Seeded {path} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    from main import app
+    from database.db import close_pool
+
+    try:
+        samples, errors, elapsed = asyncio.run(
+            run_load(app, seeded_users(path), MIXES[mix], concurrency, duration, seed_value)
+        )
+    finally:
+        close_pool()
+
+    everything = [value for values in samples.values() for value in values]
+    return {
+        "scale": scale,
+        "rows": SCALES[scale],
+        "mix": mix,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "overall": summarize(everything, sum(errors.values()), elapsed),
+        "scenarios": {
+            name: summarize(values, errors.get(name, 0), elapsed)
+            for name, values in sorted(samples.items())
+        },
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[dict]:
+    """Per-scenario changes against a baseline; ``regression`` marks the
+    ones worse than ``tolerance`` (latency up or throughput down)"""
+    rows = []
+    current = {"overall": result["overall"], **result["scenarios"]}
+    previous = {"overall": baseline["overall"], **baseline["scenarios"]}
+    for name in current.keys() & previous.keys():
+        for metric, higher_is_worse in (("p50_ms", True), ("p99_ms", True), ("throughput_rps", False)):
+            before, after = previous[name][metric], current[name][metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            rows.append(
+                {
+                    "scenario": name,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "change": round(change, 4),
+                    "regression": change > tolerance if higher_is_worse else change < -tolerance,
+                }
+            )
+    return sorted(rows, key=lambda row: (row["scenario"] != "overall", row["scenario"], row["metric"]))
+
+
+def print_comparison(rows: list[dict]) -> None:
+    print(f"{'scenario':<10} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['scenario']:<10} {row['metric']:<15} {row['baseline']:>10.2f} "
+            f"{row['current']:>10.2f} {row['change']:>+7.1%}{flag}"
+        )
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--mix", choices=MIXES, default="default")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--seed", type=int, default=1, help="virtual user random seed")
+    parser.add_argument("--reseed", action="store_true", help="rebuild the database first")
+    parser.add_argument("--output", type=Path, help="also write the JSON result here")
+    return parser
+
+
+def main(argv=None) -> dict:
+    args = parser().parse_args(argv)
+    result = run(args.scale, args.mix, args.concurrency, args.duration, args.seed, args.reseed)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n")
+    print(text)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import asyncio
+import contextvars
+import math
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from database.pool import rollback_open_transaction
+
+# Hooks are called as hook(statement, seconds, rows) after every SQL call
+# made through AsyncConnection, on the connection thread but in the
+# caller's context (contextvars are carried over). A run() job is not
+# reported as a whole: the statements it executes are, one by one, and so
+# are its commits and rollbacks (as "COMMIT" / "ROLLBACK"), so durations
+# add up without counting anything twice. A slow-query handler, if set,
+# is also called as handler(conn, statement, params, seconds, rows) for
+# statements taking at least its threshold, still on the connection
+# thread, so it may use the connection. With neither, _observing is False
+# and the hot path does no timing at all.
+_query_hooks = ()
+_query_hook = None
+_slow_query_handler = None
+_slow_query_seconds = math.inf
+_observing = False
+
+
+def add_query_hook(hook) -> None:
+    global _query_hooks
+    if hook not in _query_hooks:
+        _query_hooks = (*_query_hooks, hook)
+        _refresh()
+
+
+def remove_query_hook(hook) -> None:
+    global _query_hooks
+    _query_hooks = tuple(h for h in _query_hooks if h is not hook)
+    _refresh()
+
+
+def set_slow_query_handler(handler, threshold: float = math.inf) -> None:
+    """Installs (or with None, removes) the handler for statements taking
+    at least ``threshold`` seconds"""
+    global _slow_query_handler, _slow_query_seconds
+    _slow_query_handler = handler
+    _slow_query_seconds = threshold if handler is not None else math.inf
+    _refresh()
+
+
+def _refresh() -> None:
+    global _query_hook, _observing
+    _query_hook = _combine(_query_hooks)
+    _observing = _query_hook is not None or _slow_query_handler is not None
+
+
+def _combine(hooks):
+    if not hooks:
+        return None
+    if len(hooks) == 1:
+        return hooks[0]
+
+    def fan_out(sql, seconds, rows):
+        for hook in hooks:
+            hook(sql, seconds, rows)
+
+    return fan_out
+
+
+def _observe(conn, sql, params, started, rows) -> None:
+    seconds = time.perf_counter() - started
+    hook = _query_hook
+    if hook is not None:
+        hook(sql, seconds, rows)
+    if seconds >= _slow_query_seconds:
+        handler = _slow_query_handler
+        if handler is not None:
+            handler(conn, sql, params, seconds, rows)
+
+
+def _execute(conn, sql, params):
+    if not _observing:
+        return conn.execute(sql, params)
+    started = time.perf_counter()
+    cursor = conn.execute(sql, params)
+    _observe(conn, sql, params, started, max(cursor.rowcount, 0))
+    return cursor
+
+
+def _executemany(conn, sql, seq_of_params):
+    if not _observing:
+        return conn.executemany(sql, seq_of_params)
+    started = time.perf_counter()
+    cursor = conn.executemany(sql, seq_of_params)
+    # The parameter rows may have been a one-shot iterator
+    _observe(conn, sql, None, started, max(cursor.rowcount, 0))
+    return cursor
+
+
+def _fetchone(conn, cursor, sql, params):
+    if not _observing:
+        return cursor.execute(sql, params).fetchone()
+    started = time.perf_counter()
+    row = cursor.execute(sql, params).fetchone()
+    _observe(conn, sql, params, started, 0 if row is None else 1)
+    return row
+
+
+def _fetchall(conn, cursor, sql, params):
+    if not _observing:
+        return cursor.execute(sql, params).fetchall()
+    started = time.perf_counter()
+    rows = cursor.execute(sql, params).fetchall()
+    _observe(conn, sql, params, started, len(rows))
+    return rows
+
+
+def _end_transaction(conn, method):
+    """``method`` is sqlite3.Connection.commit or .rollback"""
+    if not _observing:
+        return method(conn)
+    started = time.perf_counter()
+    method(conn)
+    _observe(conn, method.__name__.upper(), None, started, 0)
+
+
+class _ObservedConnection:
+    """The raw connection as handed to run() jobs while observing, so the
+    statements a job executes are timed one by one"""
+
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def execute(self, sql, params=()):
+        return _execute(self._conn, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return _executemany(self._conn, sql, seq_of_params)
+
+    def commit(self):
+        _end_transaction(self._conn, sqlite3.Connection.commit)
+
+    def rollback(self):
+        _end_transaction(self._conn, sqlite3.Connection.rollback)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _observed_job(conn, fn, *args, **kwargs):
+    # sqlite3.Connection methods need the real thing
+    if getattr(fn, "__objclass__", None) is not sqlite3.Connection:
+        conn = _ObservedConnection(conn)
+    return fn(conn, *args, **kwargs)
+
+
+class AsyncConnection:
+    """Awaitable wrapper around one sqlite3 connection.
+
+    Every call is shipped to a dedicated single-thread executor owned by the
+    connection, so queries never run on the event loop thread and calls for
+    the same connection are still executed strictly in order. sqlite3
+    releases the GIL while SQLite does its work, which lets other requests
+    make progress in the meantime.
+
+    ``fetchone`` and ``fetchall`` reuse one cursor, which lives until the
+    connection goes back to the pool. A ``fetchone`` that leaves rows
+    unread keeps its statement (and read snapshot) open until the next
+    fetch or the release, just as a caller holding a cursor would.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.raw = conn
+        self._cursor = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite-conn"
+        )
+
+    async def run(self, fn, *args, **kwargs):
+        """Runs ``fn(raw_connection, *args, **kwargs)`` on the connection thread"""
+        if _observing:
+            return await self._submit(_observed_job, fn, *args, **kwargs)
+        return await self._submit(fn, *args, **kwargs)
+
+    async def _submit(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = partial(fn, self.raw, *args, **kwargs)
+        if _observing:
+            # Let hooks see the request's context variables
+            call = partial(contextvars.copy_context().run, call)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        return await self._submit(_execute, sql, params)
+
+    async def executemany(self, sql: str, seq_of_params) -> sqlite3.Cursor:
+        return await self._submit(_executemany, sql, seq_of_params)
+
+    async def fetchone(self, sql: str, params=()) -> sqlite3.Row | None:
+        return await self._submit(_fetchone, self._shared_cursor(), sql, params)
+
+    async def fetchall(self, sql: str, params=()) -> list[sqlite3.Row]:
+        return await self._submit(_fetchall, self._shared_cursor(), sql, params)
+
+    def _shared_cursor(self) -> sqlite3.Cursor:
+        cursor = self._cursor
+        if cursor is None:
+            # Created lazily so it picks up the connection's row_factory
+            cursor = self._cursor = self.raw.cursor()
+        return cursor
+
+    async def commit(self) -> None:
+        await self._submit(_end_transaction, sqlite3.Connection.commit)
+
+    async def rollback(self) -> None:
+        await self._submit(_end_transaction, sqlite3.Connection.rollback)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self.raw.in_transaction
+
+    def reset(self) -> bool:
+        """Blocking pool hook: roll back leftover work on the connection thread"""
+        # Nothing runs on the connection between checkouts, so the shared
+        # cursor can be dropped (and its statement reset) right here
+        self._cursor = None
+        if not self.raw.in_transaction:
+            return True
+        return self._executor.submit(rollback_open_transaction, self.raw).result()
+
+    def close(self) -> None:
+        """Blocking pool hook: close the connection and stop its thread"""
+        self._cursor = None
+        try:
+            self._executor.submit(self.raw.close).result()
+        finally:
+            self._executor.shutdown(wait=True)
@@ -1,7 +1,49 @@
+import asyncio
+import logging
 import sqlite3
 import os
-import hashlib
-from api.config import ENV, DB_PATH
+import threading
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from api.config import (
+    ENV,
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_READ_POOL_SIZE,
+    DB_PROFILES,
+    DB_STATEMENT_CACHE_SIZE,
+)
+from api.utils.log import configure_logging
+from api.utils.metrics import db_pool_wait, registry
+from api.utils.security import hash_password
+from database.async_db import AsyncConnection
+from database.statements import prepare_statements
+from database.migrations import current_version, migrate
+from database.pool import ConnectionPool, PoolTimeoutError
+
+# Every plain ":memory:" connection is its own private database, so pooled
+# connections in test mode share one named in-memory database instead.
+SHARED_MEMORY_URI = "file:workout_tracker?mode=memory&cache=shared"
+
+# PRAGMA values are spliced into SQL text (PRAGMA takes no parameters), so
+# keyword-valued ones are checked against what SQLite accepts.
+PRAGMA_KEYWORDS = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY", "0", "1", "2"},
+    "foreign_keys": {"ON", "OFF", "1", "0"},
+    "query_only": {"ON", "OFF", "1", "0"},
+}
+PRAGMA_INTEGERS = {"cache_size", "mmap_size", "busy_timeout"}
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
 
 def setup_db():
     """Creates the folder and sets up the database"""
@@ -11,131 +53,85 @@ def setup_db():
     # Create database folder if it doesn't exist
     os.makedirs("database", exist_ok=True)
 
-    print(f"📁 Folder created: database/")
-    print(f"🗄️  Database: {DB_PATH}")
+    logger.info("Database folder ready: %s", DB_PATH)
 
     return DB_PATH
 
 
-def connect_db(db_path):
-    """Connects to the SQLite database"""
+def validate_profile(profile: dict) -> list[tuple[str, object]]:
+    """A bootstrap profile as (PRAGMA, value) pairs in the order to apply
+    them; raises ValueError for anything SQLite should not be handed"""
 
-    try:
-        conn = sqlite3.connect(db_path)
+    pragmas = []
+    # journal_mode goes first: switching to WAL is a write, which a
+    # query_only connection would refuse.
+    for name in sorted(profile, key=lambda name: name != "journal_mode"):
+        value = profile[name]
+        if name in PRAGMA_INTEGERS:
+            value = int(value)
+        elif name in PRAGMA_KEYWORDS:
+            value = str(value).upper()
+            if value not in PRAGMA_KEYWORDS[name]:
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value}")
+        else:
+            raise ValueError(f"Unsupported PRAGMA in profile: {name}")
+        pragmas.append((name, value))
+    return pragmas
 
-        conn.row_factory = sqlite3.Row  # Allows column access by name
 
-        print("✅ Database connection successful")
-        return conn
-    except sqlite3.Error as e:
-        print(f"❌ Error connecting to database: {e}")
-        return None
+def apply_profile(conn, profile: dict):
+    """Applies a bootstrap profile (PRAGMA name -> value) to a connection"""
 
+    for name, value in validate_profile(profile):
+        conn.execute(f"PRAGMA {name} = {value}")
 
-def create_tables(conn):
-    """Creates the initial tables in the database"""
 
-    try:
-        # Users table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        )
+# A bad DB_* setting stops startup here rather than failing every connection
+for _profile in DB_PROFILES.values():
+    validate_profile(_profile)
 
-        # Exercises table (catalog)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS exercises (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                category TEXT NOT NULL,
-                muscle_group TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-        )
 
-        # Workout plans table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS workout_plans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-            )
-            """
-        )
+def connect_db(db_path, profile: str = "write"):
+    """Connects to the SQLite database using a bootstrap profile"""
 
-        # Exercises in workout plans table (many-to-many relationship)
-        conn.execute(
-            """
-                CREATE TABLE IF NOT EXISTS workout_plan_exercises (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                workout_plan_id INTEGER NOT NULL,
-                exercise_id INTEGER NOT NULL,
-                sets INTEGER NOT NULL DEFAULT 1,
-                reps INTEGER,
-                weight REAL,
-                notes TEXT,
-                FOREIGN KEY (workout_plan_id) REFERENCES workout_plans (id) ON DELETE CASCADE,
-                FOREIGN KEY (exercise_id) REFERENCES exercises (id)
-            )
-            """
+    try:
+        # Pooled connections are opened on one thread and then driven from
+        # their AsyncConnection worker thread, so they must not be
+        # thread-bound.
+        conn = sqlite3.connect(
+            db_path,
+            uri=db_path.startswith("file:"),
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
         )
 
-        # Workout sessions table (completed workouts - for tracking and reports)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS workout_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                workout_plan_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                scheduled_date TIMESTAMP,
-                completed_at TIMESTAMP,
-                status TEXT DEFAULT 'completed',
-                notes TEXT,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                FOREIGN KEY (workout_plan_id) REFERENCES workout_plans (id)
-            )
-            """
-        )
+        conn.row_factory = sqlite3.Row  # Allows column access by name
+        try:
+            apply_profile(conn, DB_PROFILES[profile])
+        except BaseException:
+            conn.close()
+            raise
+
+        # Every pooled connection passes through here: debug level only
+        logger.debug("Database connection opened (%s profile)", profile)
+        return conn
+    except sqlite3.Error as e:
+        logger.error("Error connecting to database: %s", e)
+        return None
 
-        # Session exercises table (performed exercises - for tracking)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS sessions_exercises (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                exercise_id INTEGER NOT NULL,
-                sets_completed INTEGER,
-                reps_completed INTEGER,
-                weight_used REAL,
-                notes TEXT,
-                FOREIGN KEY (session_id) REFERENCES workout_sessions (id) ON DELETE CASCADE,
-                FOREIGN KEY (exercise_id) REFERENCES exercises (id)
-            )
-            """
-        )
 
-        conn.commit()
-        print("✅ Tables created successfully")
+def create_tables(conn):
+    """Brings the schema up to date by applying pending migrations"""
+
+    try:
+        applied = migrate(conn)
+        for migration in applied:
+            logger.info("Migration %s applied: %s", migration.version, migration.name)
+        logger.info("Schema at version %s", current_version(conn))
 
         return conn
     except sqlite3.Error as e:
-        print(f"❌ Error creating tables: {e}")
+        logger.error("Error migrating database: %s", e)
         return None
 
 
@@ -166,23 +162,172 @@ def send_basic_exercises(conn):
     )
 
     conn.commit()
-    print("✅ Basic exercises inserted successfully")
+    logger.info("Basic exercises inserted")
+
 
+def _open_pooled_connection(profile):
+    db_path = SHARED_MEMORY_URI if DB_PATH == ":memory:" else DB_PATH
+    conn = connect_db(db_path, profile)
+    if conn is None:
+        raise sqlite3.OperationalError(f"Could not open database {db_path}")
+    # Compile the hot lookups now rather than on the first request served
+    prepare_statements(conn)
+    return AsyncConnection(conn)
+
+
+def get_pool(profile: str = "write") -> ConnectionPool:
+    """Returns the process-wide pool for a profile, creating it on first use"""
+
+    with _pool_lock:
+        pool = _pools.get(profile)
+        if pool is None or pool.closed:
+            pool = ConnectionPool(
+                lambda: _open_pooled_connection(profile),
+                size=DB_READ_POOL_SIZE if profile == "read" else DB_POOL_SIZE,
+                timeout=DB_POOL_TIMEOUT,
+                reset=AsyncConnection.reset,
+                close=AsyncConnection.close,
+            )
+            _pools[profile] = pool
+        return pool
+
+
+def close_pool():
+    """Closes all pooled connections (called on application shutdown)"""
+
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+@asynccontextmanager
+async def pooled_connection(pool: ConnectionPool | None = None):
+    """Checks an AsyncConnection out of the pool without blocking the loop.
+
+    A free connection is taken inline; only when the pool is exhausted does
+    the wait move to the threadpool. Release always happens inline so it
+    never needs a threadpool slot, which would deadlock once every slot is
+    held by a waiting checkout.
+    """
+    pool = pool or get_pool()
+    conn = pool.try_acquire()
+    if conn is None:
+        started = time.perf_counter()
+        waiter = asyncio.ensure_future(run_in_threadpool(pool.acquire))
+        try:
+            conn = await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The worker thread may still get a connection; hand it back
+            waiter.add_done_callback(partial(_release_acquired, pool))
+            raise
+        if registry.enabled:
+            db_pool_wait.observe(time.perf_counter() - started, _profile_of(pool))
 
-def get_db():
-    """Dependency for FastAPI: open and close connection per-request"""
-    db_path = "database/app.db"
-    conn = connect_db(db_path)
     try:
         yield conn
     finally:
-        conn.close()
+        try:
+            if conn.in_transaction:
+                await conn.rollback()
+        finally:
+            pool.release(conn)
+
+
+def _release_acquired(pool: ConnectionPool, waiter: asyncio.Future) -> None:
+    if not waiter.cancelled() and waiter.exception() is None:
+        pool.release(waiter.result())
+
+
+def _profile_of(pool: ConnectionPool) -> str:
+    for profile, candidate in list(_pools.items()):
+        if candidate is pool:
+            return profile
+    return "other"
+
+
+@registry.collector
+def _pool_metrics():
+    stats = {profile: pool.stats() for profile, pool in list(_pools.items())}
+    return [
+        (
+            "db_pool_connections",
+            "gauge",
+            "Pooled connections by state",
+            [
+                ({"profile": profile, "state": state}, getattr(stat, state))
+                for profile, stat in stats.items()
+                for state in ("idle", "in_use")
+            ],
+        ),
+        (
+            "db_pool_size",
+            "gauge",
+            "Maximum connections per pool",
+            [({"profile": profile}, stat.size) for profile, stat in stats.items()],
+        ),
+        *(
+            (
+                f"db_pool_{field}_total",
+                "counter",
+                f"Pool {field} since the pool was created",
+                [({"profile": profile}, getattr(stat, field)) for profile, stat in stats.items()],
+            )
+            for field in ("checkouts", "waits", "timeouts", "discarded")
+        ),
+    ]
+
+
+@asynccontextmanager
+async def _checkout(profile: str):
+    try:
+        async with pooled_connection(get_pool(profile)) as conn:
+            yield conn
+    except PoolTimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is busy, try again later",
+        )
+
+
+async def get_db():
+    """Dependency for FastAPI: check a pooled AsyncConnection out per-request"""
+    async with _checkout("write") as conn:
+        yield conn
+
+
+async def get_read_db():
+    """Dependency for FastAPI: read-only connection for endpoints that never write"""
+    async with _checkout("read") as conn:
+        yield conn
+
+
+class LazyConnection:
+    """Checks a pooled connection out on the first ``await lazy()``, if any;
+    it is released when the request ends"""
+
+    def __init__(self, stack: AsyncExitStack, profile: str):
+        self._stack = stack
+        self._profile = profile
+        self._conn = None
+
+    async def __call__(self):
+        if self._conn is None:
+            self._conn = await self._stack.enter_async_context(_checkout(self._profile))
+        return self._conn
+
+
+async def get_lazy_read_db():
+    """Dependency for FastAPI: read connection for endpoints that can often
+    answer from memory, checked out only when actually needed"""
+    async with AsyncExitStack() as stack:
+        yield LazyConnection(stack, "read")
 
 
 def create_demo_user(conn):
     """Demo user"""
 
-    password_hash = hashlib.sha256("demo123".encode()).hexdigest()
+    password_hash = hash_password("demo123")
     try:
         conn.execute(
             """
@@ -193,9 +338,9 @@ def create_demo_user(conn):
         )
 
         conn.commit()
-        print("✅ Demo user created successfully")
+        logger.info("Demo user created")
     except sqlite3.IntegrityError:
-        print("⚠️  Demo user already exists")
+        logger.warning("Demo user already exists")
 
 
 def show_minimal_info(conn):
@@ -226,6 +371,7 @@ def show_minimal_info(conn):
 
 def main():
     """Minimal setup according to requirements"""
+    configure_logging()
     print("🚀 MINIMAL SETUP - WORKOUT TRACKER")
     print("-" * 40)
 
@@ -0,0 +1,380 @@
+"""Synthetic training history at production scale.
+
+Fills ``users``, ``workout_plans``, ``workout_plan_exercises``,
+``workout_sessions`` and ``sessions_exercises`` with data shaped like real
+usage, deterministically for a given seed:
+
+* Activity is power-law: per-user weights are Pareto distributed (shape
+  ~1.16, the "80/20" tail), so a few users log most sessions and many
+  log a handful.
+* Users sign up over the span and some stop training (exponential
+  lifetime). Their sessions fall between those two days.
+* Session days follow seasonal weights: a January surge, a summer and
+  December dip, Monday peaks and quiet weekends. Times of day cluster
+  around mornings and evenings.
+* Loads follow each user's strength and drift upwards over the span, so
+  records and e1RM trends have something to find.
+
+Rows are generated with NumPy and written with ``executemany`` in large
+transactions. Secondary indexes on the generated tables are dropped for
+the load and rebuilt afterwards, and the journal and fsyncs are relaxed
+until the end. The volume rollups are then rebuilt from the new history.
+
+Run with: python -m database.generator --rows 10000000 --seed 1
+"""
+
+import argparse
+import sqlite3
+import time
+from datetime import date, timedelta
+import numpy as np
+from api.config import DB_PATH
+from api.repositories.report_repository import rebuild_volume_rollups
+from api.utils.security import hash_password
+from database.db import connect_db, create_tables, send_basic_exercises
+
+DEFAULT_PASSWORD = "password123"
+# Last day of history unless told otherwise: a fixed date, so a seed
+# builds the same database whenever it is run
+DEFAULT_END = date(2024, 12, 31)
+GENERATED_TABLES = (
+    "users",
+    "workout_plans",
+    "workout_plan_exercises",
+    "workout_sessions",
+    "sessions_exercises",
+)
+
+# Average sessions_exercises rows per user, used when no user count is given
+ROWS_PER_USER = 500
+EXERCISES_PER_SESSION = 5  # mean; drawn as 1 + Poisson(4), capped
+MAX_EXERCISES_PER_SESSION = 12
+
+PARETO_SHAPE = 1.16
+MAX_ACTIVITY = 50.0  # caps the tail so no single user trains several times a day
+
+# Relative session volume by month (Jan..Dec) and weekday (Mon..Sun)
+MONTH_FACTORS = (1.35, 1.2, 1.1, 1.0, 1.0, 0.9, 0.8, 0.8, 1.05, 1.0, 0.9, 0.75)
+WEEKDAY_FACTORS = (1.25, 1.15, 1.1, 1.0, 0.85, 0.75, 0.7)
+
+PLAN_NAMES = ("Push day", "Pull day", "Leg day", "Full body", "Upper body", "Conditioning")
+
+# Sessions per transaction (and per NumPy batch of exercise rows)
+SESSION_CHUNK = 100_000
+
+# Trade durability for load speed; the previous values come back afterwards
+LOAD_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -262144,
+    "temp_store": "MEMORY",
+}
+
+
+def seasonal_weights(start: date, days: int) -> np.ndarray:
+    """Relative likelihood of a session on each day of the span"""
+    day = np.arange(np.datetime64(start, "D"), np.datetime64(start, "D") + days)
+    month = day.astype("datetime64[M]").astype(np.int64) % 12
+    # 1970-01-01 was a Thursday
+    weekday = (day.astype(np.int64) + 3) % 7
+    return np.asarray(MONTH_FACTORS)[month] * np.asarray(WEEKDAY_FACTORS)[weekday]
+
+
+def generate(
+    conn,
+    rows: int,
+    seed: int = 0,
+    users: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    password: str = DEFAULT_PASSWORD,
+) -> dict[str, int]:
+    """Appends about ``rows`` sessions_exercises rows of synthetic history.
+
+    Expects a migrated database with the exercise catalog in place. Users
+    are named ``user<id>`` and all share ``password`` (hashed once).
+    Returns the number of rows written per table.
+    """
+    end = end or DEFAULT_END
+    start = start or end - timedelta(days=365 * 2)
+    if start >= end:
+        raise ValueError("start must be before end")
+
+    catalog = conn.execute(
+        "SELECT id, category FROM exercises ORDER BY id"
+    ).fetchall()
+    if not catalog:
+        raise ValueError("The exercise catalog is empty; seed it first")
+
+    rng = np.random.default_rng(seed)
+    users = users or max(10, rows // ROWS_PER_USER)
+    days = (end - start).days + 1
+    sessions = max(users, rows // EXERCISES_PER_SESSION)
+
+    previous = {name: _pragma(conn, name) for name in LOAD_PRAGMAS}
+    for name, value in LOAD_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    try:
+        indexes = _drop_indexes(conn)
+        try:
+            counts = _load(conn, rng, seed, users, sessions, start, days, catalog, password)
+        finally:
+            for sql in indexes:
+                conn.execute(sql)
+        # Needs the session index back; still benefits from the load PRAGMAs
+        rebuild_volume_rollups(conn)
+        conn.execute("ANALYZE")
+    finally:
+        for name, value in previous.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+    return counts
+
+
+def _load(conn, rng, seed, users, sessions, start, days, catalog, password):
+    ids = {table: _max_id(conn, table) for table in GENERATED_TABLES}
+    exercise_ids = np.array([row[0] for row in catalog], dtype=np.int64)
+    strength = np.array([row[1] == "strength" for row in catalog])
+    cardio = np.array([row[1] == "cardio" for row in catalog])
+    epoch = np.datetime64(start, "D")
+
+    # Users: sign-up day, last active day, activity weight, strength
+    signup = rng.integers(0, int(days * 0.8), users)
+    lifetime = rng.exponential(days * 0.6, users).astype(np.int64) + 28
+    last_day = np.minimum(signup + lifetime, days - 1)
+    activity = np.minimum(rng.pareto(PARETO_SHAPE, users) + 1, MAX_ACTIVITY)
+    user_strength = rng.lognormal(0.0, 0.3, users)
+    user_ids = ids["users"] + 1 + np.arange(users)
+
+    # Plans: one to three per user, three to six catalog exercises each
+    plans_per_user = 1 + rng.binomial(2, 0.3, users)
+    plan_user = np.repeat(np.arange(users), plans_per_user)
+    plan_count = len(plan_user)
+    plan_ids = ids["workout_plans"] + 1 + np.arange(plan_count)
+    plan_first = np.concatenate(([0], np.cumsum(plans_per_user)[:-1]))
+    plan_size = rng.integers(3, min(6, len(exercise_ids)) + 1, plan_count)
+    plan_order = np.argsort(rng.random((plan_count, len(exercise_ids))), axis=1)
+
+    # Sessions: per-user counts follow the activity weights; days are
+    # drawn from the seasonal distribution restricted to the active span
+    per_user = rng.multinomial(sessions, activity / activity.sum())
+    session_user = np.repeat(np.arange(users), per_user)
+    cdf = np.cumsum(seasonal_weights(start, days))
+    cdf /= cdf[-1]
+    low = np.where(signup > 0, cdf[np.maximum(signup - 1, 0)], 0.0)[session_user]
+    high = cdf[last_day][session_user]
+    session_day = np.searchsorted(cdf, low + (high - low) * rng.random(len(session_user)))
+    session_day = np.clip(session_day, signup[session_user], last_day[session_user])
+    session_seconds = _time_of_day(rng, len(session_user))
+    session_plan = plan_first[session_user] + (
+        rng.random(len(session_user)) * plans_per_user[session_user]
+    ).astype(np.int64)
+
+    # Ids follow time, as they would from real inserts
+    order = np.lexsort((session_seconds, session_day))
+    session_user = session_user[order]
+    session_day = session_day[order]
+    session_seconds = session_seconds[order]
+    session_plan = session_plan[order]
+    session_count = len(order)
+    session_ids = ids["workout_sessions"] + 1 + np.arange(session_count)
+    completed_at = _timestamps(epoch, session_day, session_seconds)
+
+    password_hash = hash_password(password)
+    signup_at = _timestamps(epoch, signup, np.full(users, 12 * 3600))
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(
+            "INSERT INTO users (id, username, email, password_hash, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (user_id, f"user{user_id}", f"user{user_id}@example.com",
+                 password_hash, created, created)
+                for user_id, created in zip(user_ids.tolist(), signup_at)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO workout_plans (id, user_id, name, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (plan_id, int(user_ids[owner]), PLAN_NAMES[plan_id % len(PLAN_NAMES)],
+                 signup_at[owner], signup_at[owner])
+                for plan_id, owner in zip(plan_ids.tolist(), plan_user.tolist())
+            ),
+        )
+        plan_rows = [
+            (int(plan_ids[plan]), int(exercise_ids[plan_order[plan, slot]]))
+            for plan in range(plan_count)
+            for slot in range(plan_size[plan])
+        ]
+        conn.executemany(
+            "INSERT INTO workout_plan_exercises (workout_plan_id, exercise_id, sets, reps) "
+            "VALUES (?, ?, 3, 10)",
+            plan_rows,
+        )
+        conn.executemany(
+            "INSERT INTO workout_sessions "
+            "(id, workout_plan_id, user_id, completed_at, status) "
+            "VALUES (?, ?, ?, ?, 'completed')",
+            zip(
+                session_ids.tolist(),
+                plan_ids[session_plan].tolist(),
+                user_ids[session_user].tolist(),
+                completed_at,
+            ),
+        )
+        conn.commit()
+
+        exercise_rows = 0
+        base_load = np.random.default_rng([seed, 1]).uniform(20.0, 100.0, len(exercise_ids))
+        for chunk, first in enumerate(range(0, session_count, SESSION_CHUNK)):
+            # Each chunk has its own stream, so chunks are reproducible alone
+            chunk_rng = np.random.default_rng([seed, 2, chunk])
+            part = slice(first, min(first + SESSION_CHUNK, session_count))
+            conn.execute("BEGIN")
+            exercise_rows += _load_session_exercises(
+                conn,
+                chunk_rng,
+                session_ids[part],
+                session_user[part],
+                session_plan[part],
+                (session_day[part] - signup[session_user[part]]) / days,
+                plan_size,
+                plan_order,
+                exercise_ids,
+                strength,
+                cardio,
+                base_load,
+                user_strength,
+            )
+            conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    return {
+        "users": users,
+        "workout_plans": plan_count,
+        "workout_plan_exercises": len(plan_rows),
+        "workout_sessions": session_count,
+        "sessions_exercises": exercise_rows,
+    }
+
+
+def _load_session_exercises(
+    conn, rng, session_ids, session_user, session_plan, progress,
+    plan_size, plan_order, exercise_ids, strength, cardio, base_load, user_strength,
+) -> int:
+    per_session = np.minimum(
+        1 + rng.poisson(EXERCISES_PER_SESSION - 1, len(session_ids)), MAX_EXERCISES_PER_SESSION
+    )
+    row_session = np.repeat(np.arange(len(session_ids)), per_session)
+    count = len(row_session)
+    plan = session_plan[row_session]
+
+    # Mostly exercises from the session's plan, sometimes anything
+    slot = (rng.random(count) * plan_size[plan]).astype(np.int64)
+    exercise = plan_order[plan, slot]
+    off_plan = rng.random(count) < 0.2
+    exercise[off_plan] = rng.integers(0, len(exercise_ids), int(off_plan.sum()))
+
+    is_strength = strength[exercise]
+    sets = np.where(is_strength, rng.integers(2, 6, count), 1)
+    reps = np.where(
+        is_strength,
+        rng.integers(3, 13, count),
+        np.where(cardio[exercise], rng.integers(15, 61, count), 10),
+    )
+    load = (
+        base_load[exercise]
+        * user_strength[session_user[row_session]]
+        * (1 + 0.3 * progress[row_session])
+        * rng.normal(1.0, 0.05, count)
+    )
+    weight = (np.round(load / 2.5) * 2.5).tolist()
+    for index in np.flatnonzero(~is_strength).tolist():
+        weight[index] = None
+
+    conn.executemany(
+        "INSERT INTO sessions_exercises "
+        "(session_id, exercise_id, sets_completed, reps_completed, weight_used) "
+        "VALUES (?, ?, ?, ?, ?)",
+        zip(
+            session_ids[row_session].tolist(),
+            exercise_ids[exercise].tolist(),
+            sets.tolist(),
+            reps.tolist(),
+            weight,
+        ),
+    )
+    return count
+
+
+def _time_of_day(rng, count: int) -> np.ndarray:
+    """Seconds after midnight: a morning peak, an evening peak, a flat midday"""
+    kind = rng.choice(3, count, p=(0.35, 0.5, 0.15))
+    hours = np.select(
+        [kind == 0, kind == 1],
+        [rng.normal(7.0, 1.2, count), rng.normal(18.5, 1.5, count)],
+        rng.uniform(10.0, 16.0, count),
+    )
+    return (np.clip(hours, 5.0, 23.5) * 3600).astype(np.int64)
+
+
+def _timestamps(epoch, day: np.ndarray, seconds: np.ndarray) -> list[str]:
+    """SQLite CURRENT_TIMESTAMP-style strings ("YYYY-MM-DD HH:MM:SS")"""
+    moments = epoch.astype("datetime64[s]") + day * 86400 + seconds
+    return [text.replace("T", " ") for text in np.datetime_as_string(moments, unit="s").tolist()]
+
+
+def _pragma(conn, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def _max_id(conn, table: str) -> int:
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+
+
+def _drop_indexes(conn) -> list[str]:
+    """Drops the generated tables' secondary indexes, returning their SQL"""
+    placeholders = ", ".join("?" * len(GENERATED_TABLES))
+    indexes = conn.execute(
+        f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        f"AND tbl_name IN ({placeholders})",
+        GENERATED_TABLES,
+    ).fetchall()
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    return [sql for _, sql in indexes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="sessions_exercises rows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--users", type=int, help=f"default: rows / {ROWS_PER_USER}")
+    parser.add_argument("--start", type=date.fromisoformat, help="default: two years before --end")
+    parser.add_argument("--end", type=date.fromisoformat, help=f"default: {DEFAULT_END}")
+    parser.add_argument("--path", default=DB_PATH, help="database file (default: DB_PATH)")
+    args = parser.parse_args()
+
+    conn = connect_db(args.path)
+    if conn is None or create_tables(conn) is None:
+        return
+    send_basic_exercises(conn)
+
+    started = time.perf_counter()
+    try:
+        counts = generate(conn, args.rows, args.seed, args.users, args.start, args.end)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"❌ Generation failed: {e}")
+        return
+    finally:
+        conn.close()
+
+    print(f"✅ Generated in {time.perf_counter() - started:.1f}s → {args.path}")
+    for table, count in counts.items():
+        print(f"  • {table}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+import sqlite3
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[str, ...]
+
+
+# Append-only: never edit a migration once it has shipped, add a new one.
+MIGRATIONS = [
+    Migration(
+        1,
+        "initial schema",
+        (
+            # Users table
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password_hash TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Exercises table (catalog)
+            """
+            CREATE TABLE IF NOT EXISTS exercises (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                description TEXT,
+                category TEXT NOT NULL,
+                muscle_group TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Workout plans table
+            """
+            CREATE TABLE IF NOT EXISTS workout_plans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            )
+            """,
+            # Exercises in workout plans table (many-to-many relationship)
+            """
+            CREATE TABLE IF NOT EXISTS workout_plan_exercises (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                workout_plan_id INTEGER NOT NULL,
+                exercise_id INTEGER NOT NULL,
+                sets INTEGER NOT NULL DEFAULT 1,
+                reps INTEGER,
+                weight REAL,
+                notes TEXT,
+                FOREIGN KEY (workout_plan_id) REFERENCES workout_plans (id) ON DELETE CASCADE,
+                FOREIGN KEY (exercise_id) REFERENCES exercises (id)
+            )
+            """,
+            # Workout sessions table (completed workouts - for tracking and reports)
+            """
+            CREATE TABLE IF NOT EXISTS workout_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                workout_plan_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                scheduled_date TIMESTAMP,
+                completed_at TIMESTAMP,
+                status TEXT DEFAULT 'completed',
+                notes TEXT,
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+                FOREIGN KEY (workout_plan_id) REFERENCES workout_plans (id)
+            )
+            """,
+            # Session exercises table (performed exercises - for tracking)
+            """
+            CREATE TABLE IF NOT EXISTS sessions_exercises (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id INTEGER NOT NULL,
+                exercise_id INTEGER NOT NULL,
+                sets_completed INTEGER,
+                reps_completed INTEGER,
+                weight_used REAL,
+                notes TEXT,
+                FOREIGN KEY (session_id) REFERENCES workout_sessions (id) ON DELETE CASCADE,
+                FOREIGN KEY (exercise_id) REFERENCES exercises (id)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "foreign key and history indexes",
+        (
+            # A user's plans, and plan -> exercises for batched plan loading
+            "CREATE INDEX IF NOT EXISTS idx_workout_plans_user "
+            "ON workout_plans (user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_workout_plan_exercises_plan "
+            "ON workout_plan_exercises (workout_plan_id, exercise_id)",
+            # A user's session history in date order (rowid rides along, so
+            # "ids of my sessions in a date range" never touches the table)
+            "CREATE INDEX IF NOT EXISTS idx_workout_sessions_user_completed "
+            "ON workout_sessions (user_id, completed_at)",
+            "CREATE INDEX IF NOT EXISTS idx_workout_sessions_plan "
+            "ON workout_sessions (workout_plan_id)",
+            # Covers the volume columns so per-session reports are index-only
+            "CREATE INDEX IF NOT EXISTS idx_sessions_exercises_session "
+            "ON sessions_exercises "
+            "(session_id, exercise_id, sets_completed, reps_completed, weight_used)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_exercises_exercise "
+            "ON sessions_exercises (exercise_id)",
+        ),
+    ),
+    Migration(
+        3,
+        "exercise catalog filter indexes",
+        (
+            # Each filter combination walks an index already in id order, so
+            # keyset pages (id > cursor ORDER BY id LIMIT n) never sort.
+            "CREATE INDEX IF NOT EXISTS idx_exercises_category "
+            "ON exercises (category, id)",
+            "CREATE INDEX IF NOT EXISTS idx_exercises_muscle_group "
+            "ON exercises (muscle_group, id)",
+            "CREATE INDEX IF NOT EXISTS idx_exercises_category_muscle_group "
+            "ON exercises (category, muscle_group, id)",
+        ),
+    ),
+    Migration(
+        4,
+        "exercise full-text search",
+        (
+            # External-content FTS5 index over the catalog; the prefix
+            # indexes make 2- and 3-character type-ahead lookups direct.
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS exercises_fts USING fts5(
+                name,
+                description,
+                content='exercises',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS exercises_fts_insert AFTER INSERT ON exercises
+            BEGIN
+                INSERT INTO exercises_fts (rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS exercises_fts_delete AFTER DELETE ON exercises
+            BEGIN
+                INSERT INTO exercises_fts (exercises_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS exercises_fts_update
+            AFTER UPDATE OF name, description ON exercises
+            BEGIN
+                INSERT INTO exercises_fts (exercises_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO exercises_fts (rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """,
+            # Index whatever the catalog already holds
+            "INSERT INTO exercises_fts (exercises_fts) VALUES ('rebuild')",
+        ),
+    ),
+    Migration(
+        5,
+        "refresh tokens and revoked access tokens",
+        (
+            # Only the SHA-256 of a refresh token is stored. Every rotation
+            # stays in the login's family, so replaying a rotated token can
+            # revoke the whole chain.
+            """
+            CREATE TABLE IF NOT EXISTS refresh_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                token_hash BLOB UNIQUE NOT NULL,
+                family_id TEXT NOT NULL,
+                expires_at INTEGER NOT NULL,
+                revoked_at INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family "
+            "ON refresh_tokens (family_id)",
+            "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user "
+            "ON refresh_tokens (user_id)",
+            # Durable copy of the in-memory denylist, reloaded at startup
+            """
+            CREATE TABLE IF NOT EXISTS revoked_access_tokens (
+                jti TEXT PRIMARY KEY,
+                expires_at INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """,
+        ),
+    ),
+    Migration(
+        6,
+        "idempotency keys",
+        (
+            # The stored response is written in the same transaction as the
+            # rows it describes, so a retry sees both or neither.
+            """
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                user_id INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                request_hash BLOB NOT NULL,
+                response TEXT NOT NULL,
+                created_at INTEGER NOT NULL,
+                PRIMARY KEY (user_id, key),
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created "
+            "ON idempotency_keys (created_at)",
+        ),
+    ),
+    Migration(
+        7,
+        "volume rollups",
+        (
+            # Per user, bucket and exercise; muscle_group is copied from the
+            # catalog so muscle-group reports need no join. Weeks start on
+            # Monday. Kept current by the session write transaction.
+            """
+            CREATE TABLE IF NOT EXISTS volume_daily (
+                user_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                exercise_id INTEGER NOT NULL,
+                muscle_group TEXT,
+                sets INTEGER NOT NULL DEFAULT 0,
+                reps INTEGER NOT NULL DEFAULT 0,
+                volume REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, day, exercise_id)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS volume_weekly (
+                user_id INTEGER NOT NULL,
+                week TEXT NOT NULL,
+                exercise_id INTEGER NOT NULL,
+                muscle_group TEXT,
+                sets INTEGER NOT NULL DEFAULT 0,
+                reps INTEGER NOT NULL DEFAULT 0,
+                volume REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, week, exercise_id)
+            ) WITHOUT ROWID
+            """,
+            # Backfill from the history recorded so far
+            """
+            INSERT INTO volume_daily (user_id, day, exercise_id, muscle_group, sets, reps, volume)
+            SELECT s.user_id,
+                   date(COALESCE(s.completed_at, s.scheduled_date)),
+                   se.exercise_id, e.muscle_group,
+                   SUM(COALESCE(se.sets_completed, 1)),
+                   SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)),
+                   SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)
+                       * COALESCE(se.weight_used, 0))
+            FROM workout_sessions s
+            JOIN sessions_exercises se ON se.session_id = s.id
+            JOIN exercises e ON e.id = se.exercise_id
+            WHERE s.status = 'completed'
+              AND COALESCE(s.completed_at, s.scheduled_date) IS NOT NULL
+            GROUP BY 1, 2, 3
+            """,
+            """
+            INSERT INTO volume_weekly (user_id, week, exercise_id, muscle_group, sets, reps, volume)
+            SELECT user_id, date(day, 'weekday 0', '-6 days'), exercise_id, muscle_group,
+                   SUM(sets), SUM(reps), SUM(volume)
+            FROM volume_daily
+            GROUP BY 1, 2, 3
+            """,
+        ),
+    ),
+    Migration(
+        8,
+        "leaderboard index",
+        (
+            # Loads a week's leaderboard (one exercise or all of them)
+            # without touching other users' weeks
+            "CREATE INDEX IF NOT EXISTS idx_volume_weekly_board "
+            "ON volume_weekly (week, exercise_id, user_id, volume)",
+        ),
+    ),
+    Migration(
+        9,
+        "catalog version",
+        (
+            # Bumped by every change to the exercise catalog, whichever
+            # process makes it; worker processes poll it to drop a stale
+            # cached catalog
+            """
+            CREATE TABLE IF NOT EXISTS catalog_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+            """,
+            "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)",
+            """
+            CREATE TRIGGER IF NOT EXISTS exercises_catalog_version_insert
+            AFTER INSERT ON exercises BEGIN
+                UPDATE catalog_version SET version = version + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS exercises_catalog_version_update
+            AFTER UPDATE ON exercises BEGIN
+                UPDATE catalog_version SET version = version + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS exercises_catalog_version_delete
+            AFTER DELETE ON exercises BEGIN
+                UPDATE catalog_version SET version = version + 1;
+            END
+            """,
+        ),
+    ),
+    Migration(
+        10,
+        "revoked access token ids",
+        (
+            # Workers sync the denylist incrementally (id > last seen).
+            # AUTOINCREMENT: ids are never reused once expired rows are
+            # pruned, so a revocation can never hide behind a synced id.
+            """
+            CREATE TABLE revoked_access_tokens_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                jti TEXT NOT NULL UNIQUE,
+                expires_at INTEGER NOT NULL
+            )
+            """,
+            """
+            INSERT INTO revoked_access_tokens_new (jti, expires_at)
+            SELECT jti, expires_at FROM revoked_access_tokens ORDER BY expires_at
+            """,
+            "DROP TABLE revoked_access_tokens",
+            "ALTER TABLE revoked_access_tokens_new RENAME TO revoked_access_tokens",
+        ),
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn) -> int:
+    """Returns the highest applied migration version (0 for a fresh database)"""
+    _ensure_version_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn, target: int | None = None) -> list[Migration]:
+    """Applies pending migrations in order, each in its own transaction.
+
+    Databases created before migrations existed (tables present, no version
+    recorded) are adopted by migration 1, which only creates what is missing.
+    Returns the migrations that were applied.
+    """
+    target = LATEST_VERSION if target is None else target
+    applied = []
+
+    for migration in MIGRATIONS:
+        if migration.version > target or migration.version <= current_version(conn):
+            continue
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                (migration.version, migration.name),
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        applied.append(migration)
+
+    return applied
+
+
+def _ensure_version_table(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
@@ -0,0 +1,216 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class PoolClosedError(Exception):
+    """Raised when checking out from a pool that has been closed"""
+
+
+def rollback_open_transaction(conn) -> bool:
+    """Default release hook: discard uncommitted work, report health"""
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def close_connection(conn) -> None:
+    """Default close hook: close the connection, ignoring errors"""
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time snapshot of pool usage"""
+
+    size: int
+    created: int
+    idle: int
+    in_use: int
+    checkouts: int
+    waits: int
+    timeouts: int
+    discarded: int
+
+
+class ConnectionPool:
+    """Bounded pool of warm SQLite connections.
+
+    Connections are opened lazily up to ``size`` and handed out LIFO so the
+    most recently used (hottest) connection is reused first. When every
+    connection is checked out, callers block for up to ``timeout`` seconds
+    before a ``PoolTimeoutError`` is raised.
+
+    ``reset`` is called on every released connection and returns whether it
+    is still usable; ``close`` disposes of one. Both default to plain
+    ``sqlite3`` behaviour so wrapped connections can supply their own.
+    """
+
+    def __init__(
+        self,
+        factory,
+        size: int = 5,
+        timeout: float = 30.0,
+        reset=rollback_open_transaction,
+        close=close_connection,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._factory = factory
+        self._reset = reset
+        self._close_connection = close
+        self.size = size
+        self.timeout = timeout
+
+        self._idle = []
+        self._available = threading.Condition()
+        self._closed = False
+
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._waiting = 0
+
+    def acquire(self, timeout: float | None = None):
+        """Check out a connection, opening a new one if the pool has room"""
+        return self._checkout(self.timeout if timeout is None else timeout)
+
+    def try_acquire(self):
+        """Non-blocking checkout: a connection, or None if the pool is exhausted.
+
+        Defers to callers already blocked in ``acquire`` so they are not
+        starved by a stream of non-blocking checkouts.
+        """
+        return self._checkout(None)
+
+    def release(self, conn) -> None:
+        """Return a connection to the pool, resetting any open transaction"""
+        healthy = self._reset(conn)
+
+        with self._available:
+            self._in_use -= 1
+            keep = healthy and not self._closed
+            if keep:
+                self._idle.append(conn)
+            else:
+                self._created -= 1
+                self._discarded += 1
+            self._available.notify()
+
+        if not keep:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None):
+        """Context manager that checks a connection out and always returns it"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self) -> PoolStats:
+        with self._available:
+            return PoolStats(
+                size=self.size,
+                created=self._created,
+                idle=len(self._idle),
+                in_use=self._in_use,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                timeouts=self._timeouts,
+                discarded=self._discarded,
+            )
+
+    def close(self) -> None:
+        """Close idle connections; busy ones are closed when released"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._available.notify_all()
+
+        for conn in idle:
+            self._close_quietly(conn)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _checkout(self, timeout: float | None):
+        # ``timeout=None`` means "don't wait": return None when exhausted.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        conn = None
+
+        with self._available:
+            if deadline is None and self._waiting:
+                return None
+
+            waited = False
+            while True:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    # Reserve the slot before connecting so concurrent callers
+                    # can never open more than ``size`` connections.
+                    self._created += 1
+                    break
+                if deadline is None:
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {timeout:.1f}s "
+                        f"(pool size {self.size})"
+                    )
+                if not waited:
+                    self._waits += 1
+                    waited = True
+                self._waiting += 1
+                try:
+                    self._available.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            self._in_use += 1
+            self._checkouts += 1
+
+        if conn is None:
+            try:
+                conn = self._factory()
+            except Exception:
+                with self._available:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._checkouts -= 1
+                    self._available.notify()
+                raise
+
+        return conn
+
+    def _close_quietly(self, conn) -> None:
+        try:
+            self._close_connection(conn)
+        except Exception:
+            pass
@@ -0,0 +1,137 @@
+"""Named lookup statements shared by the repositories.
+
+sqlite3 keeps a per-connection LRU cache of prepared statements keyed by
+SQL text (``DB_STATEMENT_CACHE_SIZE`` entries). Every statement declared
+here is a side-effect-free SELECT run on most requests; ``prepare_statements``
+executes each one once with NULL parameters on every new pooled connection,
+so they are compiled before the first request is served rather than by it,
+and a repository never spells the same lookup two slightly different ways.
+
+Dynamic SQL (filtered pages, reports) and writes stay next to their
+repository code.
+"""
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Statement:
+    name: str
+    sql: str
+    # Parameters used to prepare it; NULL for every placeholder by default
+    probe: tuple | None = None
+
+    @property
+    def probe_params(self) -> tuple:
+        return self.probe if self.probe is not None else (None,) * self.sql.count("?")
+
+
+STATEMENTS: dict[str, Statement] = {}
+
+
+def statement(name: str, sql: str, probe: tuple | None = None) -> str:
+    """Registers a lookup under ``name`` and returns its SQL text"""
+    if name in STATEMENTS:
+        raise ValueError(f"Statement {name!r} is already registered")
+    if sql.split(None, 1)[0].upper() != "SELECT":
+        raise ValueError(f"Statement {name!r} is not a SELECT and cannot be prepared")
+    STATEMENTS[name] = Statement(name, sql, probe)
+    return sql
+
+
+def prepare_statements(conn: sqlite3.Connection) -> int:
+    """Puts every registered statement in the connection's statement cache.
+
+    Returns how many were prepared; a statement whose tables do not exist
+    yet is skipped.
+    """
+    prepared = 0
+    for entry in STATEMENTS.values():
+        try:
+            # Probes match nothing: a prepare plus one index lookup each
+            conn.execute(entry.sql, entry.probe_params).fetchall()
+        except sqlite3.Error as e:
+            logger.debug("Statement %s not prepared: %s", entry.name, e)
+            continue
+        prepared += 1
+    return prepared
+
+
+PLAN_EXERCISE_COLUMNS = "id, workout_plan_id, exercise_id, sets, reps, weight, notes"
+
+# users
+USER_CREDENTIALS_BY_EMAIL = statement(
+    "user.credentials_by_email",
+    "SELECT id, email, password_hash FROM users WHERE email = ?",
+)
+USER_BY_EMAIL = statement(
+    "user.by_email",
+    "SELECT id, username, email FROM users WHERE email = ?",
+)
+
+# exercises
+EXERCISE_BY_ID = statement(
+    "exercise.by_id",
+    "SELECT * FROM exercises WHERE id = ?",
+)
+EXERCISE_SEARCH = statement(
+    "exercise.search",
+    """
+    SELECT e.id, e.name, e.description, e.category, e.muscle_group
+    FROM exercises_fts
+    JOIN exercises e ON e.id = exercises_fts.rowid
+    WHERE exercises_fts MATCH ?
+    ORDER BY bm25(exercises_fts, ?, ?)
+    LIMIT ?
+    """,
+    # bm25() rejects NULL weights
+    probe=("probe", 1.0, 1.0, 0),
+)
+CATALOG_VERSION = statement(
+    "catalog.version",
+    "SELECT version FROM catalog_version",
+)
+
+# workout plans
+PLANS_BY_USER = statement(
+    "plan.by_user",
+    "SELECT id, user_id, name, description FROM workout_plans "
+    "WHERE user_id = ? ORDER BY id",
+)
+PLAN_BY_ID = statement(
+    "plan.by_id",
+    "SELECT id, user_id, name, description FROM workout_plans "
+    "WHERE id = ? AND user_id = ?",
+)
+# The subquery repeats the plan filter instead of binding every id, so the
+# batch never runs into SQLite's bound-parameter limit.
+PLAN_EXERCISES_BY_USER = statement(
+    "plan_exercise.by_user",
+    f"SELECT {PLAN_EXERCISE_COLUMNS} FROM workout_plan_exercises "
+    "WHERE workout_plan_id IN (SELECT id FROM workout_plans WHERE user_id = ?) "
+    "ORDER BY workout_plan_id, id",
+)
+PLAN_EXERCISES_BY_PLAN = statement(
+    "plan_exercise.by_plan",
+    f"SELECT {PLAN_EXERCISE_COLUMNS} FROM workout_plan_exercises "
+    "WHERE workout_plan_id = ? ORDER BY id",
+)
+
+# sessions and tokens
+IDEMPOTENT_RESPONSE = statement(
+    "idempotency.response",
+    "SELECT request_hash, response FROM idempotency_keys "
+    "WHERE user_id = ? AND key = ? AND created_at >= ?",
+)
+REFRESH_TOKEN_BY_HASH = statement(
+    "refresh_token.by_hash",
+    """
+    SELECT rt.id, rt.user_id, rt.family_id, rt.expires_at, rt.revoked_at, u.email
+    FROM refresh_tokens rt JOIN users u ON u.id = rt.user_id
+    WHERE rt.token_hash = ?
+    """,
+)
@@ -1,18 +1,160 @@
+import asyncio
+import logging
+import sqlite3
 from fastapi import FastAPI
 from api.controllers.auth_controller import router as user_router
 from api.controllers.exercise_controller import router as exercise_router
-from api.config import ENV, DB_PATH
-from contextlib import asynccontextmanager
+from api.controllers.workout_controller import router as workout_router
+from api.controllers.session_controller import router as session_router
+from api.controllers.report_controller import router as report_router
+from api.controllers.leaderboard_controller import router as leaderboard_router
+from api.controllers.metrics_controller import router as metrics_router
+from api.controllers.admin_controller import router as admin_router
+from api.config import (
+    ENV,
+    CATALOG_SYNC_SECONDS,
+    DB_PATH,
+    DENYLIST_SYNC_SECONDS,
+    LEADERBOARD_REBUILD_SECONDS,
+    METRICS_FLUSH_SECONDS,
+    PROFILING_ENABLED,
+    PROFILING_SECRET,
+    QUERY_STATS_ENABLED,
+)
+from api.middleware.metrics import MetricsMiddleware
+from api.middleware.profiling import ProfilingMiddleware
+from api.repositories.exercise_repository import ExerciseRepository
+from api.repositories.leaderboard_repository import LeaderboardRepository
+from api.repositories.refresh_token_repository import RefreshTokenRepository
+from api.services.leaderboard_service import LeaderboardService
+from api.utils.catalog_cache import exercise_catalog
+from api.utils.denylist import access_token_denylist
+from api.utils.jwt_keys import get_key_ring
+from api.utils.log import configure_logging
+from api.utils import profiler
+from api.utils.metrics import record_query, registry
+from api.utils.query_stats import query_stats
+from database.async_db import add_query_hook, set_slow_query_handler
+from database.db import close_pool, get_pool, pooled_connection
+from contextlib import asynccontextmanager, suppress
+from starlette.concurrency import run_in_threadpool
 
-app = FastAPI(title="Workout Tracker API")
+configure_logging()
+logger = logging.getLogger(__name__)
 
-app.include_router(user_router)
-app.include_router(exercise_router)
+async def rebuild_leaderboards(interval: float):
+    """Periodically reloads the in-memory leaderboards from the rollups.
+
+    Writes in this process update loaded boards directly; the rebuild
+    repairs any drift and picks up writes made by other processes.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with pooled_connection(get_pool("read")) as db:
+                await LeaderboardService(LeaderboardRepository(db)).rebuild()
+        except sqlite3.Error as e:
+            logger.warning("Leaderboard rebuild failed: %s", e)
+
+async def load_denylist(after_id: int = 0) -> int:
+    """Adds revocations recorded after ``after_id``; returns the last id seen"""
+    async with pooled_connection(get_pool("read")) as db:
+        revoked = await RefreshTokenRepository(db).get_revoked_access_tokens(after_id)
+    access_token_denylist.load((jti, expires_at) for _, jti, expires_at in revoked)
+    return revoked[-1][0] if revoked else after_id
+
+async def prune_denylist():
+    async with pooled_connection(get_pool()) as db:
+        pruned = await RefreshTokenRepository(db).prune_revoked_access_tokens()
+    logger.info("Pruned %d expired token revocations", pruned)
+
+async def sync_denylist(interval: float, after_id: int):
+    """Picks up revocations made by other worker processes"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            after_id = await load_denylist(after_id)
+        except sqlite3.Error as e:
+            logger.warning("Revoked tokens not refreshed: %s", e)
+
+async def sync_catalog(interval: float):
+    """Drops the cached catalog once another process has changed it"""
+    while True:
+        await asyncio.sleep(interval)
+        if exercise_catalog.get() is None:
+            continue
+        try:
+            async with pooled_connection(get_pool("read")) as db:
+                version = await ExerciseRepository(db).get_catalog_version()
+        except sqlite3.Error as e:
+            logger.warning("Catalog version not checked: %s", e)
+            continue
+        exercise_catalog.sync(version)
+
+async def flush_metrics(interval: float):
+    """Publishes this worker's metrics for /metrics in the other workers"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(registry.flush)
+        except OSError as e:
+            logger.warning("Metrics not flushed: %s", e)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print(f"📦 Config loaded → ENV={ENV}, DB_PATH={DB_PATH}")
+    logger.info("Config loaded: ENV=%s, DB_PATH=%s", ENV, DB_PATH)
+    # Parse signing keys once; a bad key file fails startup, not a request
+    get_key_ring()
+    # Revocations outlive restarts; requests then check them in memory only.
+    # Expired ones are pruned here, at startup, and nowhere else.
+    synced_id = 0
+    try:
+        await prune_denylist()
+        synced_id = await load_denylist()
+    except sqlite3.OperationalError as e:
+        logger.warning("Revoked tokens not loaded (%s); run the database migrations", e)
+    tasks = [
+        asyncio.create_task(rebuild_leaderboards(LEADERBOARD_REBUILD_SECONDS)),
+        asyncio.create_task(sync_denylist(DENYLIST_SYNC_SECONDS, synced_id)),
+        asyncio.create_task(sync_catalog(CATALOG_SYNC_SECONDS)),
+    ]
+    if registry.enabled and registry.directory:
+        tasks.append(asyncio.create_task(flush_metrics(METRICS_FLUSH_SECONDS)))
     yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    if registry.enabled and registry.directory:
+        # Counts since the last flush, kept in the archive once this exits
+        with suppress(OSError):
+            registry.flush()
+    close_pool()
+
+app = FastAPI(title="Workout Tracker API", lifespan=lifespan)
+
+if registry.enabled:
+    app.add_middleware(MetricsMiddleware)
+    add_query_hook(record_query)
+
+if QUERY_STATS_ENABLED:
+    add_query_hook(query_stats.record)
+    set_slow_query_handler(query_stats.record_slow, query_stats.slow_seconds)
+
+# Added last so it is outermost: profiles include the metrics middleware
+if PROFILING_ENABLED or PROFILING_SECRET:
+    app.add_middleware(ProfilingMiddleware)
+    add_query_hook(profiler.record_query)
+
+app.include_router(user_router)
+app.include_router(exercise_router)
+app.include_router(workout_router)
+app.include_router(session_router)
+app.include_router(report_router)
+app.include_router(leaderboard_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
 
 @app.get("/")
 def read_root():
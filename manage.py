@@ -1,6 +1,10 @@
 import os
 import sys
 import subprocess
+from pathlib import Path
+
+# Set when run_server created METRICS_DIR itself and must remove it
+OWNED_METRICS_DIR_ENV = "WEB_OWNED_METRICS_DIR"
 
 
 def set_env(env_name: str):
@@ -16,11 +20,122 @@ def run_uvicorn(reload=True):
     subprocess.run(cmd, check=True)
 
 
+def run_server():
+    """Pre-fork workers on one shared socket (see server.py)"""
+    if not hasattr(os, "fork"):
+        print("⚠️  No fork() on this platform; running a single process")
+        run_uvicorn(reload=False)
+        return
+
+    # Workers merge their metrics through a shared directory; set before
+    # the config is imported. A SIGHUP re-exec inherits the directory and,
+    # through OWNED_METRICS_DIR_ENV, the duty to remove it on the final exit
+    if not os.environ.get("METRICS_DIR"):
+        import tempfile
+
+        os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="workout-metrics-")
+        os.environ[OWNED_METRICS_DIR_ENV] = os.environ["METRICS_DIR"]
+    metrics_dir = os.environ.get(OWNED_METRICS_DIR_ENV)
+
+    from api import config
+    from server import Arbiter
+
+    try:
+        Arbiter(
+            "main:app",
+            host=config.WEB_HOST,
+            port=config.WEB_PORT,
+            workers=config.WEB_WORKERS,
+            backlog=config.WEB_BACKLOG,
+            max_requests=config.WEB_MAX_REQUESTS,
+            max_requests_jitter=config.WEB_MAX_REQUESTS_JITTER,
+            graceful_timeout=config.WEB_GRACEFUL_TIMEOUT,
+        ).run()
+    finally:
+        if metrics_dir:
+            import shutil
+
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
 def run_tests():
     cmd = [sys.executable, "-m", "pytest", "-v", "-s"]
     subprocess.run(cmd, check=True)
 
 
+def rebuild_rollups():
+    """Recomputes the volume rollups (and so every leaderboard) from history"""
+    from api.config import DB_PATH
+    from api.repositories.report_repository import rebuild_volume_rollups
+    from database.db import connect_db
+
+    conn = connect_db(DB_PATH)
+    try:
+        rebuild_volume_rollups(conn)
+    finally:
+        conn.close()
+    print("✅ Volume rollups rebuilt")
+
+
+def run_bench(argv):
+    """Runs the load suite and compares it against the saved baseline"""
+    import json
+    from benchmarks import suite
+
+    parser = suite.parser()
+    parser.prog = "manage.py bench"
+    parser.add_argument("--baseline", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=suite.DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    name = f"{args.scale}-{args.mix}"
+    baseline_path = args.baseline or suite.RESULTS_DIR / f"baseline-{name}.json"
+    output = args.output or suite.RESULTS_DIR / f"latest-{name}.json"
+
+    result = suite.run(args.scale, args.mix, args.concurrency, args.duration, args.seed, args.reseed)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    overall = result["overall"]
+    print(
+        f"📈 {name}: {overall['requests']} requests, {overall['throughput_rps']} req/s, "
+        f"p50 {overall['p50_ms']} ms, p99 {overall['p99_ms']} ms → {output}"
+    )
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"✅ Baseline saved to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"⚠️  No baseline at {baseline_path}; rerun with --save-baseline to create one")
+        return
+
+    rows = suite.compare(result, json.loads(baseline_path.read_text()), args.tolerance)
+    suite.print_comparison(rows)
+    if any(row["regression"] for row in rows):
+        print(f"❌ Regressions beyond {args.tolerance:.0%} against {baseline_path}")
+        sys.exit(1)
+    print(f"✅ Within {args.tolerance:.0%} of {baseline_path}")
+
+
+def profile_token(argv):
+    """Prints a signed X-Profile header value for one request path, valid
+    for N minutes (default 10)"""
+    import time
+    from api.config import PROFILING_SECRET
+    from api.utils.profiler import sign_token
+
+    if not PROFILING_SECRET:
+        print("❌ PROFILING_SECRET is not set")
+        sys.exit(1)
+    if not argv or not argv[0].startswith("/"):
+        print("❌ Usage: manage.py profile-token <path> [minutes]")
+        sys.exit(1)
+    minutes = int(argv[1]) if len(argv) > 1 else 10
+    print(sign_token(PROFILING_SECRET, int(time.time()) + minutes * 60, argv[0]))
+
+
 def print_help():
     print(
         """
@@ -29,7 +144,14 @@ Usage: python manage.py [command]
 Commands:
   dev     Run the app in development mode (with reload)
   test    Run tests in test mode
-  prod    Run the app in production mode (no reload)
+  prod    Run the app in production mode: WEB_WORKERS pre-forked workers
+          (SIGHUP reloads without downtime, SIGTERM stops gracefully)
+  rebuild-rollups  Recompute report and leaderboard tables from history
+  bench   Load-test the API in-process and compare with the saved baseline
+          (--scale 1k|100k|10m, --mix, --duration, --save-baseline; see
+          benchmarks/suite.py)
+  profile-token <path> [minutes]  Print a signed X-Profile header value;
+          requests for <path> carrying it are profiled (needs PROFILING_SECRET)
 """
     )
 
@@ -49,7 +171,13 @@ if __name__ == "__main__":
         run_tests()
     elif command == "prod":
         set_env("prod")
-        run_uvicorn(reload=False)
+        run_server()
+    elif command == "rebuild-rollups":
+        rebuild_rollups()
+    elif command == "bench":
+        run_bench(sys.argv[2:])
+    elif command == "profile-token":
+        profile_token(sys.argv[2:])
     else:
         print_help()
         sys.exit(1)
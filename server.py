@@ -0,0 +1,385 @@
+"""Pre-fork production server used by ``manage.py prod``.
+
+The master imports the application once, opens the listening socket and
+forks the workers, so they share the preloaded code pages and all accept
+on the same socket. Each worker runs a plain uvicorn ``Server`` and runs
+the application lifespan itself: database pools and background tasks
+are created after the fork, never inherited.
+
+Signals handled by the master:
+
+* SIGTERM / SIGINT: graceful stop. Workers finish in-flight requests for
+  up to ``WEB_GRACEFUL_TIMEOUT`` seconds before being killed.
+* SIGHUP: zero-downtime reload. The new code is import-checked in a
+  subprocess, then the master re-executes itself, keeping its pid, its
+  workers and the listening socket. The new master starts a fresh set of
+  workers and retires the old ones once every new one is accepting.
+
+Retiring a worker (SIGUSR1 from the master) closes its listener first,
+so pending connections stay queued for the other workers, and lets the
+connections it already accepted finish before it exits. uvicorn's own
+shutdown would close those connections before their request arrives.
+
+A worker that exits (crash or ``WEB_MAX_REQUESTS`` reached) is replaced.
+"""
+
+import asyncio
+import importlib
+import logging
+import math
+import os
+import random
+import select
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+
+import uvicorn
+
+# Set for a re-executed master: the inherited socket and the workers it
+# still has to retire
+LISTEN_FD_ENV = "WEB_LISTEN_FD"
+OLD_WORKERS_ENV = "WEB_OLD_WORKERS"
+
+# A worker that dies sooner than this after its fork is respawned with a
+# delay, so a broken deploy does not turn into a fork loop
+MIN_WORKER_LIFETIME = 1.0
+
+_PID = struct.Struct("=i")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Worker:
+    pid: int
+    started_at: float = field(default_factory=time.monotonic)
+    ready: bool = False
+
+
+class Arbiter:
+    def __init__(
+        self,
+        app: str = "main:app",
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 1,
+        backlog: int = 2048,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: float = 30,
+    ):
+        self.app_path = app
+        self.host = host
+        self.port = port
+        self.worker_count = max(1, workers)
+        self.backlog = backlog
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+
+        self.app = None
+        self.sock = None
+        self.workers: dict[int, Worker] = {}
+        self.previous: set[int] = set()  # a replaced master's workers, still serving
+        self.draining: dict[int, float] = {}  # pid -> SIGTERM deadline after SIGUSR1
+        self.retiring: dict[int, float] = {}  # pid -> SIGKILL deadline after SIGTERM
+        self.stopping = False
+        self._signals: list[int] = []
+        self._respawn_at = 0.0
+
+    # -- master ------------------------------------------------------------
+
+    def run(self) -> None:
+        self.preload()
+        self.sock = self._listen()
+        self._ready_r, self._ready_w = os.pipe()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_w, False)
+        os.set_blocking(self._ready_r, False)
+        signal.set_wakeup_fd(self._wakeup_w)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, self._on_signal)
+
+        self.previous = {
+            int(pid) for pid in os.environ.pop(OLD_WORKERS_ENV, "").split(",") if pid
+        }
+        host, port = self.sock.getsockname()[:2]
+        _log(f"🚀 Master {os.getpid()} listening on http://{host}:{port} "
+             f"with {self.worker_count} workers")
+
+        try:
+            while True:
+                self._spawn_missing()
+                self._wait(timeout=1.0)
+                self._read_ready()
+                self._reap()
+                self._retire_previous()
+                self._handle_signals()
+                if self.stopping and not self._alive():
+                    break
+        finally:
+            self._shutdown()
+
+    def preload(self) -> None:
+        """Imports the application before forking (fails fast on errors)"""
+        module_name, _, attribute = self.app_path.partition(":")
+        self.app = getattr(importlib.import_module(module_name), attribute)
+
+        # Parse signing keys once; workers inherit the parsed key ring
+        from api.utils.jwt_keys import get_key_ring
+
+        get_key_ring()
+
+        # A fresh start counts from zero; a re-exec keeps the old workers'
+        # snapshots, which are still serving
+        from api.config import METRICS_DIR
+
+        if METRICS_DIR and LISTEN_FD_ENV not in os.environ:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            for filename in os.listdir(METRICS_DIR):
+                if filename.endswith(".json"):
+                    os.unlink(os.path.join(METRICS_DIR, filename))
+
+    def _listen(self) -> socket.socket:
+        inherited = os.environ.pop(LISTEN_FD_ENV, None)
+        if inherited is not None:
+            sock = socket.socket(fileno=int(inherited))
+        else:
+            family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, self.port))
+            sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn_missing(self) -> None:
+        if self.stopping or time.monotonic() < self._respawn_at:
+            return
+        while len(self.workers) < self.worker_count:
+            pid = os.fork()
+            if pid == 0:
+                self._run_worker()  # never returns
+            self.workers[pid] = Worker(pid)
+
+    def _wait(self, timeout: float) -> None:
+        try:
+            readable, _, _ = select.select([self._wakeup_r, self._ready_r], [], [], timeout)
+        except InterruptedError:
+            return
+        if self._wakeup_r in readable:
+            try:
+                os.read(self._wakeup_r, 4096)
+            except BlockingIOError:
+                pass
+
+    def _read_ready(self) -> None:
+        try:
+            data = os.read(self._ready_r, _PID.size * 256)
+        except BlockingIOError:
+            return
+        for (pid,) in _PID.iter_unpack(data[: len(data) - len(data) % _PID.size]):
+            worker = self.workers.get(pid)
+            if worker is not None:
+                worker.ready = True
+                _log(f"✅ Worker {pid} accepting requests")
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            self.previous.discard(pid)
+            self.draining.pop(pid, None)
+            self.retiring.pop(pid, None)
+            worker = self.workers.pop(pid, None)
+            if worker is None or self.stopping:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            _log(f"♻️  Worker {pid} exited ({code}); starting a replacement")
+            if time.monotonic() - worker.started_at < MIN_WORKER_LIFETIME:
+                self._respawn_at = time.monotonic() + MIN_WORKER_LIFETIME
+
+    def _retire_previous(self) -> None:
+        """Stops the previous master's workers once the new ones accept"""
+        if self.previous and len(self.workers) == self.worker_count and all(
+            worker.ready for worker in self.workers.values()
+        ):
+            _log(f"🔁 Reload complete; retiring {len(self.previous)} previous workers")
+            deadline = time.monotonic() + self.graceful_timeout
+            for pid in self.previous:
+                _kill(pid, signal.SIGUSR1)
+                self.draining.setdefault(pid, deadline)
+            self.previous = set()
+
+        now = time.monotonic()
+        self._terminate([pid for pid, deadline in self.draining.items() if deadline <= now])
+        for pid, deadline in self.retiring.items():
+            if deadline <= now:
+                _kill(pid, signal.SIGKILL)
+                self.retiring[pid] = math.inf  # only waiting to be reaped now
+
+    def _terminate(self, pids) -> None:
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in pids:
+            _kill(pid, signal.SIGTERM)
+            self.draining.pop(pid, None)
+            self.retiring.setdefault(pid, deadline)
+
+    def _handle_signals(self) -> None:
+        signals, self._signals = self._signals, []
+        for signum in signals:
+            if self.stopping:
+                continue
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                _log("🛑 Stopping workers gracefully")
+                self.stopping = True
+                self._terminate([*self.workers, *self.previous, *self.draining])
+                self.previous = set()
+            elif signum == signal.SIGHUP:
+                self._reload()
+
+    def _reload(self) -> None:
+        check = subprocess.run(
+            [sys.executable, "-c", f"import {self.app_path.partition(':')[0]}"],
+            capture_output=True,
+            text=True,
+        )
+        if check.returncode != 0:
+            _log(f"❌ Reload aborted; the new code does not import:\n{check.stderr}")
+            return
+
+        _log("🔁 Reloading: re-executing the master")
+        os.environ[LISTEN_FD_ENV] = str(self.sock.fileno())
+        os.environ[OLD_WORKERS_ENV] = ",".join(
+            str(pid)
+            for pid in [*self.workers, *self.previous, *self.draining, *self.retiring]
+        )
+        signal.set_wakeup_fd(-1)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(sys.executable, [sys.executable, *sys.argv])
+
+    def _alive(self) -> bool:
+        return bool(self.workers or self.previous or self.draining or self.retiring)
+
+    def _shutdown(self) -> None:
+        # Normally everything is reaped by now; this covers an unexpected
+        # error in the master loop
+        self.stopping = True
+        self._terminate([*self.workers, *self.previous, *self.draining])
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._alive() and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for pid in [*self.workers, *self.previous, *self.draining, *self.retiring]:
+            _kill(pid, signal.SIGKILL)
+        self._reap()
+        self.sock.close()
+        _log("👋 Master stopped")
+
+    def _on_signal(self, signum, frame) -> None:
+        if signum != signal.SIGCHLD:
+            self._signals.append(signum)
+
+    # -- worker ------------------------------------------------------------
+
+    def _run_worker(self) -> None:
+        code = 0
+        try:
+            signal.set_wakeup_fd(-1)
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+                signal.signal(signum, signal.SIG_DFL)
+            # Until the server is up there is nothing to retire
+            signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+            for fd in (self._wakeup_r, self._wakeup_w, self._ready_r):
+                os.close(fd)
+
+            config = uvicorn.Config(
+                self.app,
+                lifespan="on",
+                limit_max_requests=self._request_limit(),
+                timeout_graceful_shutdown=self.graceful_timeout,
+                backlog=self.backlog,
+            )
+            _WorkerServer(config, self._ready_w).run(sockets=[self.sock])
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def _request_limit(self) -> int | None:
+        if self.max_requests <= 0:
+            return None
+        return self.max_requests + random.randint(0, max(0, self.max_requests_jitter))
+
+
+class _WorkerServer(uvicorn.Server):
+    """uvicorn Server that tells the master once it is accepting and can
+    retire without dropping accepted connections"""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+        self.retiring = False
+        self._drain_task = None
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets)
+        if not self.should_exit:
+            loop = asyncio.get_running_loop()
+            signal.signal(signal.SIGUSR1, lambda *_: loop.call_soon_threadsafe(self.retire))
+            os.write(self.ready_fd, _PID.pack(os.getpid()))
+
+    async def on_tick(self, counter: int) -> bool:
+        if await super().on_tick(counter) and not self.should_exit:
+            # Request limit reached: retire like a reload instead of
+            # shutting down with connections still waiting for a response
+            self.limit_max_requests = None
+            self.retire()
+        return self.should_exit
+
+    def retire(self) -> None:
+        """Stops accepting, then exits once accepted connections are done"""
+        if self.retiring:
+            return
+        self.retiring = True
+        for server in self.servers:
+            server.close()
+        self._drain_task = asyncio.ensure_future(self._drain())
+
+    async def _drain(self) -> None:
+        # Sleep first: a socket accepted just before the close is only
+        # registered in server_state a few loop iterations later
+        deadline = time.monotonic() + self.config.timeout_graceful_shutdown
+        await asyncio.sleep(0.1)
+        while self.server_state.connections and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        self.should_exit = True
+
+
+def _kill(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def _log(message: str) -> None:
+    logger.info(message)
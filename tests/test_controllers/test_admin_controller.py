@@ -0,0 +1,67 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from api.controllers import admin_controller
+from api.utils.query_stats import query_stats
+from database.db import get_db, get_read_db
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer admin-secret"}
+
+
+@pytest.fixture
+def admin_client(async_db, monkeypatch):
+    async def override():
+        yield async_db
+
+    monkeypatch.setattr(admin_controller, "ADMIN_TOKEN", "admin-secret")
+    app.dependency_overrides[get_db] = override
+    app.dependency_overrides[get_read_db] = override
+    query_stats.reset()
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.clear()
+        query_stats.reset()
+
+
+def test_query_stats_list_costliest_statements(admin_client):
+    # Arrange
+    admin_client.get("/exercises/search", params={"q": "press"})
+    admin_client.get("/exercises/search", params={"q": "squat"})
+
+    # Act
+    response = admin_client.get("/admin/queries", params={"sort": "calls"}, headers=ADMIN)
+
+    # Assert
+    assert response.status_code == 200
+    body = response.json()
+    assert body["sort"] == "calls"
+    search = next(s for s in body["statements"] if "exercises_fts" in s["statement"])
+    assert search["calls"] == 2
+    assert search["max_ms"] >= search["mean_ms"] > 0
+
+
+def test_query_stats_reset(admin_client):
+    # Arrange
+    admin_client.get("/exercises/search", params={"q": "press"})
+
+    # Act
+    response = admin_client.delete("/admin/queries", headers=ADMIN)
+
+    # Assert
+    assert response.status_code == 204
+    assert admin_client.get("/admin/queries", headers=ADMIN).json()["statements"] == []
+
+
+def test_admin_endpoints_need_the_admin_token(admin_client, monkeypatch):
+    # Act
+    anonymous = admin_client.get("/admin/queries")
+    wrong = admin_client.get("/admin/queries", headers={"Authorization": "Bearer nope"})
+    monkeypatch.setattr(admin_controller, "ADMIN_TOKEN", None)
+    unconfigured = admin_client.get("/admin/queries", headers=ADMIN)
+
+    # Assert
+    assert anonymous.status_code == 401
+    assert wrong.status_code == 401
+    assert unconfigured.status_code == 404
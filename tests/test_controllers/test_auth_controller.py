@@ -4,6 +4,9 @@ from main import app
 from api.models.user import UserResponse, Token
 from api.services.auth_service import AuthService
 from fastapi import HTTPException, status
+from api.utils.auth import token_cache
+from api.utils.denylist import access_token_denylist
+from database.db import get_db
 
 client = TestClient(app)
 
@@ -106,3 +109,58 @@ def test_login_with_invalid_credentials_returns_401(monkeypatch):
     # Assert
     assert response.status_code == 401
     assert "Invalid credentials" in response.json()["detail"]
+
+
+@pytest.fixture
+def auth_client(async_db):
+    async def override_get_db():
+        yield async_db
+
+    app.dependency_overrides[get_db] = override_get_db
+    access_token_denylist.clear()
+    token_cache.clear()
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.clear()
+        access_token_denylist.clear()
+        token_cache.clear()
+
+
+def test_refresh_rotates_and_logout_revokes(auth_client):
+    # Arrange
+    auth_client.post(
+        "/auth/register",
+        json={"username": "flow", "email": "flow@example.com", "password": "pass123"},
+    )
+    tokens = auth_client.post(
+        "/auth/login", json={"email": "flow@example.com", "password": "pass123"}
+    ).json()
+
+    # Act: rotate, then replay the spent refresh token
+    rotated = auth_client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    replayed = auth_client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+
+    # Assert
+    assert rotated.status_code == 200
+    assert rotated.json()["refresh_token"] != tokens["refresh_token"]
+    assert replayed.status_code == 401
+
+    # Act: log out with the new access token
+    headers = {"Authorization": f"Bearer {rotated.json()['access_token']}"}
+    logout = auth_client.post("/auth/logout", headers=headers, json={})
+    after = auth_client.post("/auth/logout", headers=headers, json={})
+
+    # Assert
+    assert logout.status_code == 204
+    assert after.status_code == 401
+    assert after.json()["detail"] == "Token has been revoked"
+
+
+def test_logout_requires_a_bearer_token(auth_client):
+    response = auth_client.post("/auth/logout", json={})
+    assert response.status_code == 401
@@ -4,10 +4,33 @@ from main import app
 from api.models.exercise import ExerciseResponse
 from api.services.exercise_service import ExerciseService
 from fastapi import HTTPException, status
+from database.db import get_lazy_read_db, get_read_db
 
 client = TestClient(app)
 
 
+@pytest.fixture
+def checkouts(async_db):
+    """Serves the read dependencies from async_db; lists each connection checked out"""
+    checked_out = []
+
+    async def connect():
+        checked_out.append(async_db)
+        return async_db
+
+    async def override_get_lazy_read_db():
+        yield connect
+
+    async def override_get_read_db():
+        yield await connect()
+
+    app.dependency_overrides[get_lazy_read_db] = override_get_lazy_read_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    yield checked_out
+    app.dependency_overrides.pop(get_lazy_read_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
+
+
 def test_get_all_exercise_endpoint(monkeypatch):
     # Mock service
     async def fake_get_all_exercises(self):
@@ -79,3 +102,107 @@ def test_get_exercise_by_id_not_found(monkeypatch):
     assert response.status_code == 404
     data = response.json()
     assert "not found" in data["detail"].lower()
+
+
+def test_get_all_exercises_returns_etag_and_304_on_revalidation(checkouts):
+    # Arrange
+    first = client.get("/exercises")
+    etag = first.headers["etag"]
+
+    # Act
+    revalidated = client.get("/exercises", headers={"If-None-Match": etag})
+    stale = client.get("/exercises", headers={"If-None-Match": '"outdated"'})
+
+    # Assert
+    assert first.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+    assert stale.status_code == 200
+    assert stale.json() == first.json()
+
+
+def test_cached_catalog_is_served_without_a_connection(checkouts):
+    # Arrange
+    etag = client.get("/exercises").headers["etag"]
+
+    # Act
+    revalidated = client.get("/exercises", headers={"If-None-Match": etag})
+    cached = client.get("/exercises")
+
+    # Assert
+    assert (revalidated.status_code, cached.status_code) == (304, 200)
+    assert len(checkouts) == 1
+
+
+def test_cached_exercise_is_served_without_a_connection(checkouts):
+    # Arrange
+    client.get("/exercises")
+
+    # Act
+    response = client.get("/exercises/1")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["name"] == "Push-ups"
+    assert len(checkouts) == 1
+
+
+def test_get_all_exercises_serves_preencoded_gzip_body(checkouts):
+    # Act
+    response = client.get("/exercises", headers={"Accept-Encoding": "gzip"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["content-type"] == "application/json"
+    names = [exercise["name"] for exercise in response.json()]
+    assert "Push-ups" in names
+
+
+def test_get_exercises_paginates_with_cursor(checkouts):
+    # Act
+    first = client.get("/exercises", params={"category": "strength", "limit": 3})
+    second = client.get(
+        "/exercises",
+        params={"category": "strength", "limit": 3, "cursor": first.headers["x-next-cursor"]},
+    )
+
+    # Assert
+    assert first.status_code == 200
+    assert 'rel="next"' in first.headers["link"]
+    names = [row["name"] for row in first.json() + second.json()]
+    assert names == ["Push-ups", "Squats", "Pull-ups", "Bench Press", "Deadlift"]
+    assert "x-next-cursor" not in second.headers
+
+
+def test_get_exercises_rejects_oversized_limit():
+    response = client.get("/exercises", params={"limit": 10_000})
+
+    assert response.status_code == 422
+
+
+def test_search_exercises_endpoint(monkeypatch):
+    # Mock service
+    async def fake_search_exercises(self, query, limit):
+        return [
+            ExerciseResponse(
+                id=4, name="Bench Press", description="Chest press", category="strength"
+            )
+        ]
+
+    monkeypatch.setattr(ExerciseService, "search_exercises", fake_search_exercises)
+
+    # Act
+    response = client.get("/exercises/search", params={"q": "ben"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Bench Press"
+
+
+def test_search_exercises_requires_query():
+    response = client.get("/exercises/search")
+
+    assert response.status_code == 422
@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from main import app
+from api.utils.auth import token_cache
+from api.utils.jwt_keys import get_key_ring
+from database.db import get_db, get_read_db
+
+client = TestClient(app)
+
+
+def make_user(test_db, name):
+    user_id = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        (name, f"{name}@example.com", "hash"),
+    ).lastrowid
+    plan_id = test_db.execute(
+        "INSERT INTO workout_plans (user_id, name) VALUES (?, ?)", (user_id, "Plan")
+    ).lastrowid
+    test_db.commit()
+    token = get_key_ring().sign(
+        {
+            "user_id": user_id,
+            "email": f"{name}@example.com",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        }
+    )
+    return {"id": user_id, "headers": {"Authorization": f"Bearer {token}"}, "plan_id": plan_id}
+
+
+def upload(user, weight, exercise_id=1):
+    body = {
+        "sessions": [
+            {
+                "workout_plan_id": user["plan_id"],
+                "completed_at": "2024-03-05T18:00:00Z",
+                "exercises": [
+                    {
+                        "exercise_id": exercise_id,
+                        "sets_completed": 1,
+                        "reps_completed": 10,
+                        "weight_used": weight,
+                    }
+                ],
+            }
+        ]
+    }
+    response = client.post("/sessions/bulk", json=body, headers=user["headers"])
+    assert response.status_code == 200
+
+
+@pytest.fixture
+def leaderboard_client(async_db):
+    async def override():
+        yield async_db
+
+    app.dependency_overrides[get_db] = override
+    app.dependency_overrides[get_read_db] = override
+    token_cache.clear()
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.clear()
+        token_cache.clear()
+
+
+def test_leaderboard_follows_new_sessions_without_a_rebuild(leaderboard_client, test_db):
+    # Arrange
+    alice = make_user(test_db, "alice")
+    bob = make_user(test_db, "bob")
+    upload(alice, 100)
+    upload(bob, 50)
+    params = {"week": "2024-03-07", "limit": 5}
+    before = leaderboard_client.get("/leaderboards/weekly", params=params, headers=bob["headers"])
+
+    # Act
+    upload(bob, 80, exercise_id=2)
+    after = leaderboard_client.get("/leaderboards/weekly", params=params, headers=bob["headers"])
+
+    # Assert
+    assert before.status_code == 200
+    assert before.json()["week"] == "2024-03-04"
+    assert before.json()["me"]["rank"] == 2
+    assert [(e["username"], e["score"]) for e in after.json()["entries"]] == [
+        ("bob", 1300.0),
+        ("alice", 1000.0),
+    ]
+    assert after.json()["me"] == {
+        "rank": 1,
+        "user_id": bob["id"],
+        "username": "bob",
+        "score": 1300.0,
+    }
+
+
+def test_exercise_board_and_absent_user(leaderboard_client, test_db):
+    # Arrange
+    alice = make_user(test_db, "alice")
+    carol = make_user(test_db, "carol")
+    upload(alice, 100, exercise_id=3)
+
+    # Act
+    response = leaderboard_client.get(
+        "/leaderboards/weekly",
+        params={"week": "2024-03-04", "exercise_id": 3},
+        headers=carol["headers"],
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["size"] == 1
+    assert response.json()["entries"][0]["username"] == "alice"
+    assert response.json()["me"] is None
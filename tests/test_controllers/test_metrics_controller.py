@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from api.controllers import metrics_controller
+from api.utils.metrics import registry
+from database.db import get_db, get_lazy_read_db, get_read_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def db_override(async_db):
+    async def override():
+        yield async_db
+
+    async def connect():
+        return async_db
+
+    async def override_lazy():
+        yield connect
+
+    app.dependency_overrides[get_db] = override
+    app.dependency_overrides[get_read_db] = override
+    app.dependency_overrides[get_lazy_read_db] = override_lazy
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_metrics_reports_requests_by_route_template(db_override):
+    # Arrange
+    client.get("/exercises/1")
+    client.get("/exercises/2")
+
+    # Act
+    response = client.get("/metrics")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'route="/exercises/{exercise_id}"' in response.text
+    assert 'route="/exercises/1"' not in response.text
+    assert "# TYPE db_pool_connections gauge" in response.text
+    assert "password_hash_pending 0" in response.text
+
+
+def test_metrics_requires_token_when_configured(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(metrics_controller, "METRICS_TOKEN", "scrape-secret")
+
+    # Act
+    anonymous = client.get("/metrics")
+    wrong = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+    scraper = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+    # Assert
+    assert anonymous.status_code == 401
+    assert wrong.status_code == 401
+    assert scraper.status_code == 200
+
+
+def test_metrics_endpoint_hidden_when_disabled(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(registry, "enabled", False)
+
+    # Act
+    response = client.get("/metrics")
+
+    # Assert
+    assert response.status_code == 404
@@ -0,0 +1,160 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from main import app
+from api.utils.auth import token_cache
+from api.utils.jwt_keys import get_key_ring
+from database.db import get_db, get_read_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def user(test_db):
+    user_id = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("athlete", "athlete@example.com", "hash"),
+    ).lastrowid
+    plan_id = test_db.execute(
+        "INSERT INTO workout_plans (user_id, name) VALUES (?, ?)", (user_id, "Plan")
+    ).lastrowid
+    test_db.commit()
+    token = get_key_ring().sign(
+        {
+            "user_id": user_id,
+            "email": "athlete@example.com",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        }
+    )
+    return {"headers": {"Authorization": f"Bearer {token}"}, "plan_id": plan_id}
+
+
+@pytest.fixture
+def report_client(async_db):
+    async def override():
+        yield async_db
+
+    app.dependency_overrides[get_db] = override
+    app.dependency_overrides[get_read_db] = override
+    token_cache.clear()
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.clear()
+        token_cache.clear()
+
+
+def test_uploaded_sessions_show_up_in_weekly_report(report_client, user):
+    # Arrange
+    body = {
+        "sessions": [
+            {
+                "workout_plan_id": user["plan_id"],
+                "completed_at": f"2024-03-0{day}T18:00:00Z",
+                "exercises": [
+                    {"exercise_id": 1, "sets_completed": 3, "reps_completed": 10, "weight_used": 40}
+                ],
+            }
+            for day in (5, 7)
+        ]
+    }
+    assert report_client.post("/sessions/bulk", json=body, headers=user["headers"]).status_code == 200
+
+    # Act
+    response = report_client.get(
+        "/reports/volume",
+        params={"period": "weekly", "start": "2024-03-06", "end": "2024-03-31"},
+        headers=user["headers"],
+    )
+
+    # Assert
+    assert response.status_code == 200
+    report = response.json()
+    assert report["start"] == "2024-03-04"
+    assert report["buckets"] == [
+        {
+            "period_start": "2024-03-04",
+            "exercise_id": None,
+            "muscle_group": None,
+            "sets": 6,
+            "reps": 60,
+            "volume": 2400.0,
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"period": "monthly"}, {"group_by": "colour"}, {"start": "2024-03-10", "end": "2024-03-01"}],
+)
+def test_invalid_report_parameters_are_rejected(report_client, user, params):
+    # Act
+    response = report_client.get("/reports/volume", params=params, headers=user["headers"])
+
+    # Assert
+    assert response.status_code == 400
+
+
+def test_report_requires_authentication(report_client):
+    # Act
+    response = report_client.get("/reports/volume")
+
+    # Assert
+    assert response.status_code == 401
+
+
+def test_personal_records_and_e1rm_trend(report_client, user):
+    # Arrange
+    body = {
+        "sessions": [
+            {
+                "workout_plan_id": user["plan_id"],
+                "completed_at": f"2024-03-0{day}T18:00:00Z",
+                "exercises": [
+                    {"exercise_id": 1, "sets_completed": 3, "reps_completed": reps, "weight_used": weight}
+                ],
+            }
+            for day, reps, weight in ((4, 5, 100), (6, 1, 115), (8, 10, 80))
+        ]
+    }
+    report_client.post("/sessions/bulk", json=body, headers=user["headers"])
+
+    # Act
+    records = report_client.get("/reports/records", headers=user["headers"])
+    trend = report_client.get(
+        "/reports/e1rm/1", params={"formula": "brzycki", "window": 2}, headers=user["headers"]
+    )
+    missing = report_client.get("/reports/e1rm/2", headers=user["headers"])
+
+    # Assert
+    assert records.status_code == 200
+    assert records.json() == [
+        {
+            "exercise_id": 1,
+            "max_weight": 115.0,
+            "max_weight_date": "2024-03-06",
+            "max_reps": 10,
+            "best_e1rm": pytest.approx(100 * (1 + 5 / 30)),
+            "best_e1rm_date": "2024-03-04",
+            "best_set_volume": 800.0,
+        }
+    ]
+    assert trend.status_code == 200
+    assert [point["date"] for point in trend.json()["points"]] == [
+        "2024-03-04",
+        "2024-03-06",
+        "2024-03-08",
+    ]
+    assert trend.json()["points"][1]["e1rm"] == 115.0
+    assert missing.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "path", ["/reports/records?formula=lander", "/reports/e1rm/1?window=0"]
+)
+def test_invalid_analytics_parameters_are_rejected(report_client, user, path):
+    # Act
+    response = report_client.get(path, headers=user["headers"])
+
+    # Assert
+    assert response.status_code == 400
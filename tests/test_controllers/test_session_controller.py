@@ -0,0 +1,106 @@
+import json
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from main import app
+from api.services import export_service
+from api.utils.auth import token_cache
+from api.utils.jwt_keys import get_key_ring
+from database.db import get_db, get_read_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def user(test_db):
+    user_id = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("athlete", "athlete@example.com", "hash"),
+    ).lastrowid
+    plan_id = test_db.execute(
+        "INSERT INTO workout_plans (user_id, name) VALUES (?, ?)", (user_id, "Plan")
+    ).lastrowid
+    test_db.commit()
+    token = get_key_ring().sign(
+        {
+            "user_id": user_id,
+            "email": "athlete@example.com",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        }
+    )
+    return {"headers": {"Authorization": f"Bearer {token}"}, "plan_id": plan_id}
+
+
+@pytest.fixture
+def session_client(async_db):
+    async def override():
+        yield async_db
+
+    app.dependency_overrides[get_db] = override
+    app.dependency_overrides[get_read_db] = override
+    token_cache.clear()
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.clear()
+        token_cache.clear()
+
+
+def test_bulk_upload_is_idempotent(session_client, user, test_db):
+    # Arrange
+    body = {
+        "sessions": [
+            {
+                "workout_plan_id": user["plan_id"],
+                "completed_at": "2024-03-01T18:00:00Z",
+                "exercises": [{"exercise_id": 1, "sets_completed": 3, "reps_completed": 8}],
+            },
+            {"workout_plan_id": user["plan_id"], "exercises": [{"exercise_id": -5}]},
+        ]
+    }
+    headers = {**user["headers"], "Idempotency-Key": "upload-1"}
+
+    # Act
+    first = session_client.post("/sessions/bulk", json=body, headers=headers)
+    retry = session_client.post("/sessions/bulk", json=body, headers=headers)
+
+    # Assert
+    assert first.status_code == 200
+    assert first.json()["created"] == 1
+    assert first.json()["errors"][0]["index"] == 1
+    assert retry.json()["replayed"] is True
+    assert retry.json()["session_ids"] == first.json()["session_ids"]
+    assert test_db.execute("SELECT COUNT(*) FROM workout_sessions").fetchone()[0] == 1
+
+
+def test_bulk_upload_requires_authentication(session_client):
+    response = session_client.post("/sessions/bulk", json={"sessions": [{}]})
+    assert response.status_code == 401
+
+
+def test_export_streams_ndjson(session_client, user, async_db, monkeypatch):
+    # Arrange: the export checks out its own connection, not get_read_db
+    @asynccontextmanager
+    async def connect():
+        yield async_db
+
+    monkeypatch.setattr(export_service, "_read_connection", connect)
+    session_client.post(
+        "/sessions/bulk",
+        json={"sessions": [{"workout_plan_id": user["plan_id"], "exercises": [{"exercise_id": 1}]}]},
+        headers=user["headers"],
+    )
+
+    # Act
+    response = session_client.get("/sessions/export?format=ndjson", headers=user["headers"])
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["exercise_id"] for line in response.text.splitlines()] == [1]
+
+
+def test_export_rejects_unknown_format(session_client, user):
+    response = session_client.get("/sessions/export?format=xml", headers=user["headers"])
+    assert response.status_code == 422
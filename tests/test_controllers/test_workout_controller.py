@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from main import app
+from api.utils.auth import token_cache
+from api.utils.jwt_keys import get_key_ring
+from database.db import get_db, get_read_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(test_db):
+    cursor = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("lifter", "lifter@example.com", "hash"),
+    )
+    test_db.commit()
+    token = get_key_ring().sign(
+        {
+            "user_id": cursor.lastrowid,
+            "email": "lifter@example.com",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        }
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def workout_client(async_db):
+    async def override():
+        yield async_db
+
+    app.dependency_overrides[get_db] = override
+    app.dependency_overrides[get_read_db] = override
+    token_cache.clear()
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.clear()
+        token_cache.clear()
+
+
+def test_workout_endpoints_require_authentication(workout_client):
+    response = workout_client.get("/workouts/")
+    assert response.status_code == 401
+
+
+def test_create_plan_add_exercise_and_list(workout_client, auth_headers):
+    # Act
+    created = workout_client.post(
+        "/workouts/", json={"name": "Push Day"}, headers=auth_headers
+    )
+    plan_id = created.json()["id"]
+    added = workout_client.post(
+        f"/workouts/{plan_id}/exercises",
+        json={"exercise_id": 1, "sets": 4, "reps": 8},
+        headers=auth_headers,
+    )
+    listed = workout_client.get("/workouts/", headers=auth_headers)
+
+    # Assert
+    assert created.status_code == 201
+    assert added.status_code == 201
+    assert listed.json()[0]["exercises"][0]["sets"] == 4
+
+
+def test_delete_missing_plan_returns_404(workout_client, auth_headers):
+    response = workout_client.delete("/workouts/999", headers=auth_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Workout plan not found"
@@ -0,0 +1,117 @@
+import asyncio
+import sqlite3
+import threading
+import pytest
+from database.async_db import AsyncConnection
+
+# Counts rows one at a time: slow enough that a blocked event loop would be
+# obvious.
+SLOW_QUERY = """
+    WITH RECURSIVE counter(n) AS (
+        SELECT 1 UNION ALL SELECT n + 1 FROM counter WHERE n < 500000
+    )
+    SELECT COUNT(*) FROM counter
+"""
+
+
+@pytest.mark.asyncio
+async def test_fetch_helpers_return_rows(async_db):
+    # Act
+    rows = await async_db.fetchall("SELECT * FROM exercises ORDER BY id")
+    first = await async_db.fetchone("SELECT * FROM exercises WHERE id = ?", (1,))
+    missing = await async_db.fetchone("SELECT * FROM exercises WHERE id = ?", (-1,))
+
+    # Assert
+    assert len(rows) > 0
+    assert first["name"] == rows[0]["name"]
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_execute_and_commit(test_db, async_db):
+    # Act
+    cursor = await async_db.execute(
+        "INSERT INTO exercises (name, category) VALUES (?, ?)", ("Plank", "core")
+    )
+    await async_db.commit()
+
+    # Assert
+    row = test_db.execute(
+        "SELECT name FROM exercises WHERE id = ?", (cursor.lastrowid,)
+    ).fetchone()
+    assert row["name"] == "Plank"
+    assert not async_db.in_transaction
+
+
+@pytest.mark.asyncio
+async def test_queries_run_off_the_event_loop_thread(async_db):
+    # Act
+    thread_name = await async_db.run(lambda conn: threading.current_thread().name)
+
+    # Assert
+    assert thread_name != threading.current_thread().name
+    assert thread_name.startswith("sqlite-conn")
+
+
+@pytest.mark.asyncio
+async def test_slow_query_does_not_block_event_loop(async_db):
+    # Arrange
+    ticks = 0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker_task = asyncio.create_task(ticker())
+
+    # Act
+    row = await async_db.fetchone(SLOW_QUERY)
+    done.set()
+    await ticker_task
+
+    # Assert
+    assert row[0] == 500000
+    assert ticks > 1
+
+
+def test_reset_rolls_back_uncommitted_work(test_db, async_db):
+    # Arrange
+    test_db.execute("DELETE FROM exercises")
+    assert async_db.in_transaction
+
+    # Act
+    healthy = async_db.reset()
+
+    # Assert
+    assert healthy is True
+    assert not async_db.in_transaction
+    assert test_db.execute("SELECT COUNT(*) FROM exercises").fetchone()[0] > 0
+
+
+@pytest.mark.asyncio
+async def test_release_closes_the_shared_fetch_cursor(tmp_path):
+    # Arrange
+    path = str(tmp_path / "wal.db")
+    writer = sqlite3.connect(path)
+    writer.execute("PRAGMA journal_mode = WAL")
+    writer.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+    writer.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(3)])
+    writer.commit()
+    db = AsyncConnection(sqlite3.connect(path, check_same_thread=False))
+
+    # Act: rows left unread keep the statement, and its snapshot, open
+    await db.fetchone("SELECT id FROM t")
+    writer.execute("INSERT INTO t VALUES (3)")
+    writer.commit()
+    busy_before = writer.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+    db.reset()
+    busy_after = writer.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+
+    # Assert
+    assert (busy_before, busy_after) == (1, 0)
+    assert (await db.fetchone("SELECT COUNT(*) FROM t"))[0] == 4
+    db.close()
+    writer.close()
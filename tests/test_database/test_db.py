@@ -0,0 +1,96 @@
+import sqlite3
+import pytest
+from api.config import DB_PROFILES
+from database.db import apply_profile, connect_db
+
+
+def pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_write_profile_applies_bootstrap_pragmas(tmp_path):
+    # Act
+    conn = connect_db(str(tmp_path / "write.db"))
+
+    # Assert
+    profile = DB_PROFILES["write"]
+    assert pragma(conn, "journal_mode") == "wal"
+    assert pragma(conn, "busy_timeout") == profile["busy_timeout"]
+    assert pragma(conn, "cache_size") == profile["cache_size"]
+    assert pragma(conn, "foreign_keys") == 1
+    assert pragma(conn, "temp_store") == 2
+    assert pragma(conn, "query_only") == 0
+    conn.close()
+
+
+def test_read_profile_is_query_only(tmp_path):
+    # Arrange
+    db_path = str(tmp_path / "read.db")
+    writer = connect_db(db_path)
+    writer.execute("CREATE TABLE probe (value TEXT)")
+    writer.commit()
+
+    # Act
+    reader = connect_db(db_path, profile="read")
+
+    # Assert
+    assert pragma(reader, "journal_mode") == "wal"
+    assert pragma(reader, "cache_size") == DB_PROFILES["read"]["cache_size"]
+    assert reader.execute("SELECT COUNT(*) FROM probe").fetchone()[0] == 0
+    with pytest.raises(sqlite3.OperationalError):
+        reader.execute("INSERT INTO probe (value) VALUES ('nope')")
+
+    reader.close()
+    writer.close()
+
+
+def test_reader_is_not_blocked_by_open_write_transaction(tmp_path):
+    # Arrange
+    db_path = str(tmp_path / "wal.db")
+    writer = connect_db(db_path)
+    writer.execute("CREATE TABLE probe (value TEXT)")
+    writer.execute("INSERT INTO probe (value) VALUES ('committed')")
+    writer.commit()
+    reader = connect_db(db_path, profile="read")
+
+    # Act
+    writer.execute("INSERT INTO probe (value) VALUES ('pending')")
+    rows = reader.execute("SELECT value FROM probe").fetchall()
+
+    # Assert
+    assert [row["value"] for row in rows] == ["committed"]
+    writer.rollback()
+    reader.close()
+    writer.close()
+
+
+def test_apply_profile_rejects_invalid_values():
+    conn = sqlite3.connect(":memory:")
+
+    with pytest.raises(ValueError):
+        apply_profile(conn, {"journal_mode": "WAL; DROP TABLE users"})
+    with pytest.raises(ValueError):
+        apply_profile(conn, {"page_size": 4096})
+
+    conn.close()
+
+
+def test_connect_db_closes_the_connection_when_the_profile_fails(monkeypatch):
+    # Arrange
+    opened = []
+    real_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+        opened.append(real_connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", connect)
+    monkeypatch.setitem(DB_PROFILES, "broken", {"synchronous": "SOMETIMES"})
+
+    # Act
+    with pytest.raises(ValueError):
+        connect_db(":memory:", profile="broken")
+
+    # Assert
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
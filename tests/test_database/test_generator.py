@@ -0,0 +1,90 @@
+from datetime import date
+import pytest
+from database.db import connect_db, create_tables, send_basic_exercises
+from database.generator import generate
+
+START, END = date(2023, 1, 1), date(2024, 12, 31)
+
+
+@pytest.fixture
+def fresh_db(tmp_path):
+    def open_db(name="gen.db"):
+        conn = connect_db(str(tmp_path / name))
+        create_tables(conn)
+        send_basic_exercises(conn)
+        return conn
+
+    return open_db
+
+
+def snapshot(conn):
+    return (
+        conn.execute("SELECT * FROM workout_sessions ORDER BY id").fetchall(),
+        conn.execute(
+            "SELECT session_id, exercise_id, sets_completed, reps_completed, weight_used "
+            "FROM sessions_exercises ORDER BY id"
+        ).fetchall(),
+    )
+
+
+def test_same_seed_produces_the_same_database(fresh_db):
+    # Arrange
+    first, second = fresh_db("a.db"), fresh_db("b.db")
+
+    # Act
+    generate(first, 5_000, seed=7, start=START, end=END)
+    generate(second, 5_000, seed=7, start=START, end=END)
+
+    # Assert
+    assert [list(map(tuple, part)) for part in snapshot(first)] == [
+        list(map(tuple, part)) for part in snapshot(second)
+    ]
+
+
+def test_counts_indexes_pragmas_and_rollups(fresh_db):
+    # Arrange
+    conn = fresh_db()
+    index_names = "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name"
+    indexes = [row[0] for row in conn.execute(index_names)]
+
+    # Act
+    counts = generate(conn, 20_000, seed=1, start=START, end=END)
+
+    # Assert
+    for table, count in counts.items():
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == count
+    assert 18_000 < counts["sessions_exercises"] < 22_000
+    assert [row[0] for row in conn.execute(index_names)] == indexes
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    rolled = conn.execute("SELECT SUM(sets) FROM volume_daily").fetchone()[0]
+    raw = conn.execute("SELECT SUM(sets_completed) FROM sessions_exercises").fetchone()[0]
+    assert rolled == raw
+
+
+def test_activity_is_skewed_and_seasonal(fresh_db):
+    # Arrange
+    conn = fresh_db()
+
+    # Act
+    generate(conn, 100_000, seed=3, users=400, start=START, end=END)
+
+    # Assert
+    per_user = sorted(
+        (row[0] for row in conn.execute(
+            "SELECT COUNT(*) FROM workout_sessions GROUP BY user_id"
+        )),
+        reverse=True,
+    )
+    top_fifth = sum(per_user[: len(per_user) // 5])
+    assert top_fifth > 0.45 * sum(per_user)
+
+    by_month = dict(conn.execute(
+        "SELECT strftime('%m', completed_at), COUNT(*) FROM workout_sessions "
+        "WHERE completed_at >= '2024-01-01' GROUP BY 1"
+    ).fetchall())
+    assert by_month["01"] > by_month["07"]
+    by_weekday = dict(conn.execute(
+        "SELECT strftime('%w', completed_at), COUNT(*) FROM workout_sessions GROUP BY 1"
+    ).fetchall())
+    assert by_weekday["1"] > by_weekday["0"]  # Monday over Sunday
@@ -0,0 +1,132 @@
+import sqlite3
+import pytest
+from database.migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    Migration,
+    current_version,
+    migrate,
+)
+
+
+def query_plan(conn, sql, params=()):
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " | ".join(row[3] for row in rows)
+
+
+@pytest.fixture
+def fresh_db():
+    conn = sqlite3.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+def test_migrate_fresh_database_reaches_latest_version(fresh_db):
+    # Act
+    applied = migrate(fresh_db)
+
+    # Assert
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+    assert current_version(fresh_db) == LATEST_VERSION
+
+
+def test_migrate_is_idempotent(fresh_db):
+    # Arrange
+    migrate(fresh_db)
+
+    # Act
+    applied = migrate(fresh_db)
+
+    # Assert
+    assert applied == []
+    assert current_version(fresh_db) == LATEST_VERSION
+
+
+def test_migrate_stops_at_target_version(fresh_db):
+    # Act
+    migrate(fresh_db, target=1)
+
+    # Assert
+    assert current_version(fresh_db) == 1
+    indexes = fresh_db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+    ).fetchall()
+    assert indexes == []
+
+
+def test_migrate_adopts_database_created_before_versioning(fresh_db):
+    # Arrange: tables exist with data but no version has been recorded
+    for statement in MIGRATIONS[0].statements:
+        fresh_db.execute(statement)
+    fresh_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES ('old', 'old@example.com', 'x')"
+    )
+    fresh_db.commit()
+
+    # Act
+    migrate(fresh_db)
+
+    # Assert
+    assert current_version(fresh_db) == LATEST_VERSION
+    assert fresh_db.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+
+
+def test_failed_migration_is_rolled_back(fresh_db, monkeypatch):
+    # Arrange
+    broken = MIGRATIONS + [
+        Migration(
+            LATEST_VERSION + 1,
+            "broken",
+            ("CREATE TABLE half_done (id INTEGER)", "NOT VALID SQL"),
+        )
+    ]
+    monkeypatch.setattr("database.migrations.MIGRATIONS", broken)
+
+    # Act & Assert
+    with pytest.raises(sqlite3.Error):
+        migrate(fresh_db, target=LATEST_VERSION + 1)
+
+    assert current_version(fresh_db) == LATEST_VERSION
+    tables = fresh_db.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'half_done'"
+    ).fetchall()
+    assert tables == []
+
+
+def test_user_plan_lookup_uses_index(test_db):
+    plan = query_plan(test_db, "SELECT * FROM workout_plans WHERE user_id = ?", (1,))
+
+    assert "USING INDEX idx_workout_plans_user" in plan
+
+
+def test_plan_exercises_batch_lookup_uses_index(test_db):
+    plan = query_plan(
+        test_db,
+        "SELECT * FROM workout_plan_exercises WHERE workout_plan_id IN (?, ?, ?)",
+        (1, 2, 3),
+    )
+
+    assert "USING INDEX idx_workout_plan_exercises_plan" in plan
+
+
+def test_user_session_history_is_index_only(test_db):
+    plan = query_plan(
+        test_db,
+        "SELECT id, completed_at FROM workout_sessions "
+        "WHERE user_id = ? AND completed_at >= ? ORDER BY completed_at",
+        (1, "2024-01-01"),
+    )
+
+    assert "USING COVERING INDEX idx_workout_sessions_user_completed" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_session_volume_lookup_is_index_only(test_db):
+    plan = query_plan(
+        test_db,
+        "SELECT exercise_id, sets_completed * reps_completed * weight_used "
+        "FROM sessions_exercises WHERE session_id = ?",
+        (1,),
+    )
+
+    assert "USING COVERING INDEX idx_sessions_exercises_session" in plan
@@ -0,0 +1,183 @@
+import asyncio
+import sqlite3
+import threading
+import pytest
+from database.async_db import AsyncConnection
+from database import db
+from database.db import SHARED_MEMORY_URI, connect_db, pooled_connection
+from database.pool import ConnectionPool, PoolClosedError, PoolTimeoutError
+
+
+def make_pool(size=2, timeout=0.05):
+    return ConnectionPool(lambda: connect_db(SHARED_MEMORY_URI), size=size, timeout=timeout)
+
+
+def test_released_connection_is_reused():
+    # Arrange
+    pool = make_pool()
+
+    # Act
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    # Assert
+    assert second is first
+    assert pool.stats().created == 1
+    pool.release(second)
+    pool.close()
+
+
+def test_pool_is_bounded_and_times_out():
+    # Arrange
+    pool = make_pool(size=2)
+    conns = [pool.acquire(), pool.acquire()]
+
+    # Act & Assert
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    stats = pool.stats()
+    assert stats.created == 2
+    assert stats.in_use == 2
+    assert stats.timeouts == 1
+
+    for conn in conns:
+        pool.release(conn)
+    pool.close()
+
+
+def test_try_acquire_returns_none_when_exhausted():
+    # Arrange
+    pool = make_pool(size=1)
+    conn = pool.try_acquire()
+
+    # Act
+    second = pool.try_acquire()
+
+    # Assert
+    assert conn is not None
+    assert second is None
+    assert pool.stats().timeouts == 0
+    pool.release(conn)
+    pool.close()
+
+
+def test_waiting_checkout_gets_released_connection():
+    # Arrange
+    pool = make_pool(size=1, timeout=2)
+    conn = pool.acquire()
+    result = {}
+
+    def waiter():
+        result["conn"] = pool.acquire()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+
+    # Act
+    pool.release(conn)
+    thread.join(timeout=2)
+
+    # Assert
+    assert result["conn"] is conn
+    assert pool.stats().waits == 1
+    pool.release(conn)
+    pool.close()
+
+
+def test_release_rolls_back_open_transaction():
+    # Arrange
+    pool = make_pool(size=1)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS pool_probe (value TEXT)")
+        conn.commit()
+
+    # Act
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO pool_probe (value) VALUES ('uncommitted')")
+
+    # Assert
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        count = conn.execute("SELECT COUNT(*) FROM pool_probe").fetchone()[0]
+        assert count == 0
+    pool.close()
+
+
+def test_memory_mode_connections_share_one_database():
+    # Arrange
+    pool = make_pool(size=2)
+    first, second = pool.acquire(), pool.acquire()
+
+    # Act
+    first.execute("CREATE TABLE IF NOT EXISTS shared_probe (value TEXT)")
+    first.commit()
+
+    # Assert
+    tables = second.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'shared_probe'"
+    ).fetchall()
+    assert len(tables) == 1
+
+    pool.release(first)
+    pool.release(second)
+    pool.close()
+
+
+def test_closed_pool_rejects_checkout_and_closes_idle_connections():
+    # Arrange
+    pool = make_pool()
+    conn = pool.acquire()
+    pool.release(conn)
+
+    # Act
+    pool.close()
+
+    # Assert
+    with pytest.raises(PoolClosedError):
+        pool.acquire()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiting_checkout_does_not_leak_a_connection(monkeypatch):
+    # Arrange: a wait that gives up on cancel while its thread keeps going
+    monkeypatch.setattr(
+        db,
+        "run_in_threadpool",
+        lambda fn: asyncio.get_running_loop().run_in_executor(None, fn),
+    )
+    pool = ConnectionPool(
+        lambda: AsyncConnection(connect_db(SHARED_MEMORY_URI)),
+        size=1,
+        timeout=2,
+        reset=AsyncConnection.reset,
+        close=AsyncConnection.close,
+    )
+    holder = pool.acquire()
+
+    async def waiter():
+        async with pooled_connection(pool):
+            pass
+
+    task = asyncio.create_task(waiter())
+    await asyncio.sleep(0.05)
+
+    # Act
+    task.cancel()
+    await asyncio.sleep(0)
+    pool.release(holder)
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if pool.stats().checkouts == 2 and pool.stats().in_use == 0:
+            break
+
+    # Assert
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert pool.stats().checkouts == 2
+    assert pool.stats().in_use == 0
+    assert pool.stats().idle == 1
+    pool.close()
@@ -0,0 +1,22 @@
+import pytest
+from database.statements import STATEMENTS, prepare_statements, statement
+
+
+def test_every_registered_statement_prepares_against_the_schema(test_db):
+    # Act
+    prepared = prepare_statements(test_db)
+
+    # Assert
+    assert prepared == len(STATEMENTS)
+
+
+def test_only_new_select_statements_can_be_registered():
+    # Arrange
+    registered = dict(STATEMENTS)
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="already registered"):
+        statement("exercise.by_id", "SELECT id FROM exercises WHERE id = ?")
+    with pytest.raises(ValueError, match="not a SELECT"):
+        statement("exercise.purge", "DELETE FROM exercises WHERE id = ?")
+    assert STATEMENTS == registered
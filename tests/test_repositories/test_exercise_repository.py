@@ -1,11 +1,12 @@
 import pytest
 from api.models.exercise import ExerciseCreate, ExerciseResponse
-from api.repositories.exercise_repository import ExerciseRepository
+from api.repositories.exercise_repository import ExerciseRepository, to_prefix_query
+from api.utils.catalog_cache import ExerciseCatalogCache
 
 @pytest.mark.asyncio
-async def test_get_all_exercises_return_list(test_db):
+async def test_get_all_exercises_return_list(async_db):
     # Arrange
-    repo = ExerciseRepository(test_db)
+    repo = ExerciseRepository(async_db)
     
     # Act
     exercises = await repo.get_all_exercises()
@@ -16,9 +17,9 @@ async def test_get_all_exercises_return_list(test_db):
     assert all(isinstance(ex, ExerciseResponse) for ex in exercises)
 
 @pytest.mark.asyncio
-async def test_get_all_exercises_empty_db(test_db):
+async def test_get_all_exercises_empty_db(test_db, async_db):
     # Arrange
-    repo = ExerciseRepository(test_db)
+    repo = ExerciseRepository(async_db)
     
     test_db.execute("DELETE FROM exercises")  # Clear the table for this test
     test_db.commit()
@@ -31,9 +32,9 @@ async def test_get_all_exercises_empty_db(test_db):
     assert len(exercises) == 0    
 
 @pytest.mark.asyncio
-async def test_get_exercise_by_id_returns_exercise(test_db):
+async def test_get_exercise_by_id_returns_exercise(test_db, async_db):
     # Arrange
-    repo = ExerciseRepository(test_db)
+    repo = ExerciseRepository(async_db)
     
     cursor = test_db.execute(
         "INSERT INTO exercises (name, description, category, muscle_group) VALUES (?, ?, ?, ?)",
@@ -53,13 +54,178 @@ async def test_get_exercise_by_id_returns_exercise(test_db):
     assert exercise.description == "A basic push up exercise"
 
 @pytest.mark.asyncio
-async def test_get_exercise_by_id_not_found(test_db):
+async def test_get_exercise_by_id_not_found(async_db):
     # Arrange
-    repo = ExerciseRepository(test_db)
+    repo = ExerciseRepository(async_db)
     
     # Act
     exercise = await repo.get_exercise_by_id(12)
     
     # Assert
     assert exercise is None
-    
\ No newline at end of file
+
+
+@pytest.mark.asyncio
+async def test_cached_catalog_is_served_without_querying(test_db, async_db):
+    # Arrange
+    repo = ExerciseRepository(async_db, ExerciseCatalogCache())
+    first = await repo.get_all_exercises()
+
+    statements = []
+    test_db.set_trace_callback(statements.append)
+
+    # Act
+    second = await repo.get_all_exercises()
+    exercise = await repo.get_exercise_by_id(first[0].id)
+
+    # Assert
+    test_db.set_trace_callback(None)
+    assert statements == []
+    assert [ex.id for ex in second] == [ex.id for ex in first]
+    assert exercise == first[0]
+
+
+@pytest.mark.asyncio
+async def test_create_exercise_invalidates_cached_catalog(async_db):
+    # Arrange
+    cache = ExerciseCatalogCache()
+    repo = ExerciseRepository(async_db, cache)
+    before = await repo.get_all_exercises()
+
+    # Act
+    created = await repo.create_exercise(
+        ExerciseCreate(name="Lunges", category="strength", muscle_group="legs")
+    )
+    after = await repo.get_all_exercises()
+
+    # Assert
+    assert cache.version == 1
+    assert len(after) == len(before) + 1
+    assert created.id in {ex.id for ex in after}
+
+
+@pytest.mark.asyncio
+async def test_get_exercises_page_filters_and_projects(async_db):
+    # Arrange
+    repo = ExerciseRepository(async_db)
+
+    # Act
+    rows = await repo.get_exercises_page(
+        category="strength", muscle_group="chest", columns=("name",)
+    )
+
+    # Assert
+    assert [row["name"] for row in rows] == ["Push-ups", "Bench Press"]
+    assert all(set(row) == {"id", "name"} for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_get_exercises_page_walks_keyset_in_id_order(async_db):
+    # Arrange
+    repo = ExerciseRepository(async_db)
+
+    # Act
+    first = await repo.get_exercises_page(limit=3)
+    second = await repo.get_exercises_page(after_id=first[-1]["id"], limit=3)
+
+    # Assert
+    ids = [row["id"] for row in first + second]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 6
+
+
+@pytest.mark.parametrize(
+    "where, index",
+    [
+        ("category = ?", "idx_exercises_category"),
+        ("muscle_group = ?", "idx_exercises_muscle_group"),
+        ("category = ? AND muscle_group = ?", "idx_exercises_category_muscle_group"),
+    ],
+)
+def test_filtered_pages_use_index_without_sorting(test_db, where, index):
+    # Arrange
+    params = ("strength",) * where.count("?")
+
+    # Act
+    plan = " | ".join(
+        row[3]
+        for row in test_db.execute(
+            f"EXPLAIN QUERY PLAN SELECT id, name FROM exercises "
+            f"WHERE id > ? AND {where} ORDER BY id LIMIT ?",
+            (0, *params, 10),
+        )
+    )
+
+    # Assert
+    assert f"INDEX {index} " in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_search_exercises_matches_prefixes_ranked_by_name(test_db, async_db):
+    # Arrange
+    test_db.execute(
+        "INSERT INTO exercises (name, description, category) VALUES (?, ?, ?)",
+        ("Farmer Carry", "Grip work, pairs well with a deadlift", "strength"),
+    )
+    test_db.commit()
+    repo = ExerciseRepository(async_db)
+
+    # Act
+    results = await repo.search_exercises("dead")
+
+    # Assert
+    assert [ex.name for ex in results] == ["Deadlift", "Farmer Carry"]
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates_and_deletes(test_db, async_db):
+    # Arrange
+    repo = ExerciseRepository(async_db)
+    test_db.execute("UPDATE exercises SET name = 'Goblet Squat' WHERE name = 'Squats'")
+    test_db.execute("DELETE FROM exercises WHERE name = 'Running'")
+    test_db.commit()
+
+    # Act
+    goblet = await repo.search_exercises("gob")
+    running = await repo.search_exercises("runn")
+
+    # Assert
+    assert [ex.name for ex in goblet] == ["Goblet Squat"]
+    assert running == []
+
+
+@pytest.mark.asyncio
+async def test_search_treats_fts_syntax_literally(async_db):
+    # Arrange
+    repo = ExerciseRepository(async_db)
+
+    # Act
+    results = await repo.search_exercises('push" OR name:*')
+    nothing = await repo.search_exercises("  ?! ")
+
+    # Assert
+    assert [ex.name for ex in results] == []
+    assert nothing == []
+
+
+def test_to_prefix_query_quotes_every_word():
+    assert to_prefix_query("bench pre") == '"bench"* "pre"*'
+    assert to_prefix_query("***") is None
+
+
+@pytest.mark.asyncio
+async def test_catalog_version_follows_writes_from_any_connection(test_db, async_db):
+    # Arrange
+    cache = ExerciseCatalogCache()
+    await ExerciseRepository(async_db, cache).get_all_exercises()
+    loaded = cache.get().source_version
+
+    # Act: another process edits the catalog behind this one's back
+    test_db.execute("UPDATE exercises SET description = 'changed' WHERE id = 1")
+    test_db.commit()
+    version = await ExerciseRepository(async_db).get_catalog_version()
+
+    # Assert
+    assert version == loaded + 1
+    assert cache.sync(version) is True
@@ -0,0 +1,100 @@
+import time
+import pytest
+from api.repositories.refresh_token_repository import RefreshTokenRepository
+
+
+@pytest.fixture
+def user_id(test_db):
+    cursor = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("refresh", "refresh@example.com", "hash"),
+    )
+    test_db.commit()
+    return cursor.lastrowid
+
+
+def later(days=1):
+    return int(time.time()) + days * 86400
+
+
+@pytest.mark.asyncio
+async def test_rotate_spends_token_and_issues_successor(async_db, user_id):
+    # Arrange
+    repo = RefreshTokenRepository(async_db)
+    await repo.create_refresh_token(user_id, b"first", "family", later())
+
+    # Act
+    result = await repo.rotate_refresh_token(b"first", b"second", later())
+    again = await repo.rotate_refresh_token(b"second", b"third", later())
+
+    # Assert
+    assert (result.status, result.user_id, result.email) == (
+        "rotated",
+        user_id,
+        "refresh@example.com",
+    )
+    assert again.status == "rotated"
+
+
+@pytest.mark.asyncio
+async def test_reusing_a_spent_token_revokes_the_family(test_db, async_db, user_id):
+    # Arrange
+    repo = RefreshTokenRepository(async_db)
+    await repo.create_refresh_token(user_id, b"first", "family", later())
+    await repo.rotate_refresh_token(b"first", b"second", later())
+
+    # Act: an attacker replays the spent token
+    reused = await repo.rotate_refresh_token(b"first", b"stolen", later())
+    legit = await repo.rotate_refresh_token(b"second", b"third", later())
+
+    # Assert
+    assert reused.status == "reused"
+    assert legit.status == "reused"
+    live = test_db.execute(
+        "SELECT COUNT(*) FROM refresh_tokens WHERE revoked_at IS NULL"
+    ).fetchone()[0]
+    assert live == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_and_expired_tokens_are_rejected(async_db, user_id):
+    # Arrange
+    repo = RefreshTokenRepository(async_db)
+    await repo.create_refresh_token(user_id, b"old", "family", later(days=-1))
+
+    # Act & Assert
+    assert (await repo.rotate_refresh_token(b"missing", b"x", later())).status == "unknown"
+    assert (await repo.rotate_refresh_token(b"old", b"y", later())).status == "expired"
+
+
+@pytest.mark.asyncio
+async def test_revoked_access_tokens_are_read_incrementally(async_db):
+    # Arrange
+    repo = RefreshTokenRepository(async_db)
+    await repo.revoke_access_token("first", later())
+    synced = (await repo.get_revoked_access_tokens())[-1][0]
+    await repo.revoke_access_token("second", later())
+
+    # Act
+    newer = await repo.get_revoked_access_tokens(synced)
+
+    # Assert
+    assert [jti for _, jti, _ in newer] == ["second"]
+
+
+@pytest.mark.asyncio
+async def test_pruning_never_lets_ids_be_reused(test_db, async_db):
+    # Arrange
+    repo = RefreshTokenRepository(async_db)
+    await repo.revoke_access_token("live", later())
+    await repo.revoke_access_token("stale", int(time.time()) - 10)
+    synced = (await repo.get_revoked_access_tokens())[-1][0]
+
+    # Act
+    pruned = await repo.prune_revoked_access_tokens()
+    await repo.revoke_access_token("after-prune", later())
+
+    # Assert
+    assert pruned == 1
+    assert test_db.execute("SELECT COUNT(*) FROM revoked_access_tokens").fetchone()[0] == 2
+    assert [jti for _, jti, _ in await repo.get_revoked_access_tokens(synced)] == ["after-prune"]
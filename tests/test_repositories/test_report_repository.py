@@ -0,0 +1,203 @@
+import pytest
+from datetime import datetime, timezone
+from api.models.workout_session import WorkoutSessionCreate
+from api.repositories.report_repository import ReportRepository, rebuild_volume_rollups
+from api.repositories.session_repository import SessionRepository
+from database.migrations import migrate
+
+# What the rollups replace: aggregating the raw history on every request
+ON_THE_FLY_WEEKLY = """
+    SELECT date(COALESCE(s.completed_at, s.scheduled_date), 'weekday 0', '-6 days') AS week,
+           se.exercise_id,
+           SUM(COALESCE(se.sets_completed, 1)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)),
+           SUM(COALESCE(se.sets_completed, 1) * COALESCE(se.reps_completed, 0)
+               * COALESCE(se.weight_used, 0))
+    FROM workout_sessions s
+    JOIN sessions_exercises se ON se.session_id = s.id
+    WHERE s.user_id = ? AND s.status = 'completed'
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+
+@pytest.fixture
+def user_and_plan(test_db):
+    user_id = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("athlete", "athlete@example.com", "hash"),
+    ).lastrowid
+    plan_id = test_db.execute(
+        "INSERT INTO workout_plans (user_id, name) VALUES (?, ?)", (user_id, "Plan")
+    ).lastrowid
+    test_db.commit()
+    return user_id, plan_id
+
+
+def make_sessions(plan_id, days, status="completed"):
+    return [
+        WorkoutSessionCreate(
+            workout_plan_id=plan_id,
+            completed_at=datetime(2024, 3, day, 18, tzinfo=timezone.utc),
+            status=status,
+            exercises=[
+                {"exercise_id": 1, "sets_completed": 3, "reps_completed": 10, "weight_used": 50},
+                {"exercise_id": 2, "sets_completed": 4, "reps_completed": 8, "weight_used": 20},
+            ],
+        )
+        for day in days
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rollups_match_on_the_fly_aggregation(test_db, async_db, user_and_plan):
+    # Arrange
+    user_id, plan_id = user_and_plan
+    sessions = SessionRepository(async_db)
+    # Two uploads touching the same weeks exercise the upsert path
+    await sessions.bulk_create_sessions(user_id, make_sessions(plan_id, [4, 5, 12]), [])
+    await sessions.bulk_create_sessions(user_id, make_sessions(plan_id, [5, 13, 20]), [])
+    await sessions.bulk_create_sessions(user_id, make_sessions(plan_id, [6], "skipped"), [])
+    expected = [tuple(row) for row in test_db.execute(ON_THE_FLY_WEEKLY, (user_id,))]
+
+    # Act
+    buckets = await ReportRepository(async_db).get_volume(
+        user_id, "weekly", "exercise", "2024-01-01", "2024-12-31"
+    )
+
+    # Assert
+    actual = [
+        (b.period_start.isoformat(), b.exercise_id, b.sets, b.reps, b.volume) for b in buckets
+    ]
+    assert actual == expected
+    assert [b.period_start.isoformat() for b in buckets[::2]] == [
+        "2024-03-04",
+        "2024-03-11",
+        "2024-03-18",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_daily_totals_respect_the_date_range(async_db, user_and_plan):
+    # Arrange
+    user_id, plan_id = user_and_plan
+    sessions = SessionRepository(async_db)
+    await sessions.bulk_create_sessions(user_id, make_sessions(plan_id, [4, 5, 5, 12]), [])
+
+    # Act
+    buckets = await ReportRepository(async_db).get_volume(
+        user_id, "daily", "total", "2024-03-05", "2024-03-11"
+    )
+
+    # Assert
+    assert len(buckets) == 1
+    assert buckets[0].period_start.isoformat() == "2024-03-05"
+    assert buckets[0].sets == 14
+    assert buckets[0].volume == 2 * (3 * 10 * 50 + 4 * 8 * 20)
+
+
+@pytest.mark.parametrize("period, table", [("daily", "volume_daily"), ("weekly", "volume_weekly")])
+def test_report_query_reads_only_the_rollup_primary_key(test_db, period, table):
+    # Arrange
+    bucket = "day" if period == "daily" else "week"
+    sql = (
+        f"SELECT {bucket}, muscle_group, SUM(volume) FROM {table} "
+        f"WHERE user_id = ? AND {bucket} BETWEEN ? AND ? "
+        f"GROUP BY {bucket}, muscle_group"
+    )
+
+    # Act
+    plan = " ".join(
+        row[3] for row in test_db.execute(f"EXPLAIN QUERY PLAN {sql}", (1, "a", "b"))
+    )
+
+    # Assert
+    assert f"SEARCH {table} USING PRIMARY KEY" in plan
+    assert "workout_sessions" not in plan
+    assert "sessions_exercises" not in plan
+
+
+def test_migration_backfills_existing_history(test_db, user_and_plan):
+    # Arrange
+    user_id, plan_id = user_and_plan
+    test_db.execute("DROP TABLE volume_daily")
+    test_db.execute("DROP TABLE volume_weekly")
+    test_db.execute("DELETE FROM schema_migrations WHERE version >= 7")
+    session_id = test_db.execute(
+        "INSERT INTO workout_sessions (workout_plan_id, user_id, completed_at, status) "
+        "VALUES (?, ?, '2024-03-06 07:00:00', 'completed')",
+        (plan_id, user_id),
+    ).lastrowid
+    test_db.execute(
+        "INSERT INTO sessions_exercises "
+        "(session_id, exercise_id, sets_completed, reps_completed, weight_used) "
+        "VALUES (?, 1, 5, 5, 100)",
+        (session_id,),
+    )
+    test_db.commit()
+
+    # Act
+    migrate(test_db)
+
+    # Assert
+    row = test_db.execute(
+        "SELECT week, sets, reps, volume FROM volume_weekly WHERE user_id = ?", (user_id,)
+    ).fetchone()
+    assert tuple(row) == ("2024-03-04", 5, 25, 2500.0)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_drifted_rollups(test_db, async_db, user_and_plan):
+    # Arrange
+    user_id, plan_id = user_and_plan
+    await SessionRepository(async_db).bulk_create_sessions(
+        user_id, make_sessions(plan_id, [4, 12]), []
+    )
+    expected = [tuple(row) for row in test_db.execute("SELECT * FROM volume_weekly ORDER BY 2, 3")]
+    test_db.execute("UPDATE volume_weekly SET volume = 0")
+    test_db.execute("DELETE FROM volume_daily")
+    test_db.commit()
+
+    # Act
+    rebuild_volume_rollups(test_db)
+
+    # Assert
+    actual = [tuple(row) for row in test_db.execute("SELECT * FROM volume_weekly ORDER BY 2, 3")]
+    assert actual == expected
+    assert test_db.execute("SELECT COUNT(*) FROM volume_daily").fetchone()[0] == 4
+
+
+@pytest.mark.asyncio
+async def test_lift_history_keeps_columns_aligned_in_day_order(test_db, async_db, user_and_plan):
+    # Arrange: a NULL-heavy set on a scheduled-only session, an earlier
+    # completed one inserted after it, and a date SQLite cannot parse
+    user_id, plan_id = user_and_plan
+    sessions = [
+        (None, "2024-03-10", [(1, None, 5, None)]),
+        ("2024-03-04 18:00:00", None, [(1, 3, 10, 50.0), (2, 4, 8, 20.0)]),
+        ("not a date", None, [(1, 3, 3, 3.0)]),
+    ]
+    for completed_at, scheduled_date, exercises in sessions:
+        session_id = test_db.execute(
+            "INSERT INTO workout_sessions "
+            "(workout_plan_id, user_id, scheduled_date, completed_at, status) "
+            "VALUES (?, ?, ?, ?, 'completed')",
+            (plan_id, user_id, scheduled_date, completed_at),
+        ).lastrowid
+        test_db.executemany(
+            "INSERT INTO sessions_exercises "
+            "(session_id, exercise_id, sets_completed, reps_completed, weight_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(session_id, *exercise) for exercise in exercises],
+        )
+    test_db.commit()
+
+    # Act
+    history = await ReportRepository(async_db).get_lift_history(user_id)
+
+    # Assert
+    assert history.exercise_id.tolist() == [1, 1, 2]
+    assert history.day.astype(str).tolist() == ["2024-03-04", "2024-03-10", "2024-03-04"]
+    assert history.sets.tolist() == [3, 1, 4]
+    assert history.reps.tolist() == [10, 5, 8]
+    assert history.weight.tolist() == [50.0, 0.0, 20.0]
@@ -0,0 +1,111 @@
+import time
+import pytest
+from datetime import datetime, timezone
+from api.models.workout_session import WorkoutSessionCreate
+from api.repositories.session_repository import (
+    Idempotency,
+    IdempotencyKeyMismatch,
+    SessionRepository,
+)
+
+
+@pytest.fixture
+def user_and_plan(test_db):
+    user_id = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("athlete", "athlete@example.com", "hash"),
+    ).lastrowid
+    plan_id = test_db.execute(
+        "INSERT INTO workout_plans (user_id, name) VALUES (?, ?)", (user_id, "Plan")
+    ).lastrowid
+    test_db.commit()
+    return user_id, plan_id
+
+
+def make_sessions(plan_id, count, exercises=2):
+    return [
+        WorkoutSessionCreate(
+            workout_plan_id=plan_id,
+            completed_at=datetime(2024, 1, 1 + i % 28, 18, tzinfo=timezone.utc),
+            exercises=[
+                {"exercise_id": e + 1, "sets_completed": 3, "reps_completed": 10, "weight_used": 50}
+                for e in range(exercises)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def key(name, payload=b"hash"):
+    return Idempotency(key=name, request_hash=payload, expires_before=int(time.time()) - 60)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_is_one_transaction_with_executemany(
+    test_db, async_db, user_and_plan
+):
+    # Arrange
+    user_id, plan_id = user_and_plan
+    repo = SessionRepository(async_db)
+    commits = []
+    test_db.set_trace_callback(
+        lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None
+    )
+
+    # Act
+    try:
+        response, replayed = await repo.bulk_create_sessions(
+            user_id, make_sessions(plan_id, 50), errors=[]
+        )
+    finally:
+        test_db.set_trace_callback(None)
+
+    # Assert
+    assert replayed is False
+    assert len(response["session_ids"]) == 50
+    assert len(commits) == 1
+    count = test_db.execute("SELECT COUNT(*) FROM sessions_exercises").fetchone()[0]
+    assert count == 100
+    stored = test_db.execute(
+        "SELECT completed_at FROM workout_sessions WHERE id = ?", (response["session_ids"][0],)
+    ).fetchone()[0]
+    assert stored == "2024-01-01 18:00:00"
+
+
+@pytest.mark.asyncio
+async def test_preallocated_ids_continue_after_existing_rows(test_db, async_db, user_and_plan):
+    # Arrange
+    user_id, plan_id = user_and_plan
+    repo = SessionRepository(async_db)
+    first, _ = await repo.bulk_create_sessions(user_id, make_sessions(plan_id, 3), [])
+    test_db.execute("DELETE FROM workout_sessions WHERE id = ?", (first["session_ids"][-1],))
+    test_db.commit()
+
+    # Act
+    second, _ = await repo.bulk_create_sessions(user_id, make_sessions(plan_id, 2), [])
+
+    # Assert: AUTOINCREMENT ids are never reused
+    assert second["session_ids"][0] == first["session_ids"][-1] + 1
+
+
+@pytest.mark.asyncio
+async def test_same_idempotency_key_does_not_insert_twice(test_db, async_db, user_and_plan):
+    # Arrange
+    user_id, plan_id = user_and_plan
+    repo = SessionRepository(async_db)
+
+    # Act
+    first, first_replayed = await repo.bulk_create_sessions(
+        user_id, make_sessions(plan_id, 3), [], key("retry-1")
+    )
+    second, second_replayed = await repo.bulk_create_sessions(
+        user_id, make_sessions(plan_id, 3), [], key("retry-1")
+    )
+
+    # Assert
+    assert (first_replayed, second_replayed) == (False, True)
+    assert first == second
+    assert test_db.execute("SELECT COUNT(*) FROM workout_sessions").fetchone()[0] == 3
+    assert await repo.get_idempotent_response(user_id, key("retry-1")) == first
+    with pytest.raises(IdempotencyKeyMismatch):
+        await repo.get_idempotent_response(user_id, key("retry-1", b"other"))
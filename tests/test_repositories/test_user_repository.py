@@ -1,16 +1,17 @@
+import sqlite3
 import pytest
 from api.models.user import UserCreate, UserResponse
-from api.repositories.user_repository import UserRepository
+from api.repositories.user_repository import UserAlreadyExistsError, UserRepository
 
 
 @pytest.mark.asyncio
-async def test_create_user_inserts_into_db(test_db):
+async def test_create_user_inserts_into_db(test_db, async_db):
     # Arrange
-    repo = UserRepository(test_db)
+    repo = UserRepository(async_db)
 
     # Act
     user = await repo.create_user(
-        username="testuser", email="test@example.com", password="pass123"
+        username="testuser", email="test@example.com", password_hash="pass123"
     )
 
     # Assert
@@ -25,27 +26,28 @@ async def test_create_user_inserts_into_db(test_db):
 
 
 @pytest.mark.asyncio
-async def test_create_user_with_duplicate_email_fails(test_db):
+async def test_create_user_with_duplicate_email_fails(async_db):
     # Arrange
-    repo = UserRepository(test_db)
+    repo = UserRepository(async_db)
     await repo.create_user(
         username="testuser1",
         email="duplicate@example.com",
-        password="pass123",
+        password_hash="pass123",
     )
 
     # Act & Assert
-    with pytest.raises(Exception):
+    with pytest.raises(UserAlreadyExistsError) as exc_info:
         await repo.create_user(
             username="testuser2",
             email="duplicate@example.com",
-            password="pass123",
+            password_hash="pass123",
         )
+    assert exc_info.value.field == "email"
 
 @pytest.mark.asyncio
-async def test_get_user_by_email_returns_user_when_exists(test_db):
+async def test_get_user_by_email_returns_user_when_exists(test_db, async_db):
     # Arrange
-    repo = UserRepository(test_db)
+    repo = UserRepository(async_db)
     test_db.execute(
 		"INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
 		("john", "john@example.com", "pass123")
@@ -61,9 +63,9 @@ async def test_get_user_by_email_returns_user_when_exists(test_db):
     assert user.email == "john@example.com"
     
 @pytest.mark.asyncio
-async def test_get_user_by_email_returns_none_when_not_exists(test_db):
+async def test_get_user_by_email_returns_none_when_not_exists(async_db):
     # Arrange
-    repo = UserRepository(test_db)
+    repo = UserRepository(async_db)
     
     # Act
     user = await repo.get_user_by_email("nonexistent@example.com")
@@ -73,4 +75,65 @@ async def test_get_user_by_email_returns_none_when_not_exists(test_db):
     
 # Additional tests can be added for edge cases and error handling
     
-    
\ No newline at end of file
+    
+@pytest.mark.asyncio
+async def test_update_password_hash_replaces_stored_hash(test_db, async_db):
+    # Arrange
+    repo = UserRepository(async_db)
+    user = await repo.create_user(
+        username="rehash", email="rehash@example.com", password_hash="pass123"
+    )
+
+    # Act
+    await repo.update_password_hash(user.id, "$scrypt$new")
+
+    # Assert
+    row = test_db.execute(
+        "SELECT password_hash FROM users WHERE id = ?", (user.id,)
+    ).fetchone()
+    assert row[0] == "$scrypt$new"
+
+
+@pytest.mark.asyncio
+async def test_create_user_with_duplicate_username_reports_field(async_db):
+    # Arrange
+    repo = UserRepository(async_db)
+    await repo.create_user(username="same", email="a@example.com", password_hash="h")
+
+    # Act
+    with pytest.raises(UserAlreadyExistsError) as exc_info:
+        await repo.create_user(username="same", email="b@example.com", password_hash="h")
+
+    # Assert
+    assert exc_info.value.field == "username"
+    assert await repo.get_user_by_email("b@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_create_user_reraises_other_integrity_errors(async_db):
+    # Arrange
+    repo = UserRepository(async_db)
+
+    # Act
+    with pytest.raises(sqlite3.IntegrityError, match="NOT NULL"):
+        await repo.create_user(username="nohash", email="n@example.com", password_hash=None)
+
+    # Assert
+    assert not async_db.in_transaction
+    assert await repo.get_user_by_email("n@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_get_credentials_by_email_returns_stored_hash(test_db, async_db):
+    # Arrange
+    repo = UserRepository(async_db)
+    await repo.create_user(username="cred", email="cred@example.com", password_hash="stored")
+
+    # Act
+    credentials = await repo.get_credentials_by_email("cred@example.com")
+    missing = await repo.get_credentials_by_email("nobody@example.com")
+
+    # Assert
+    assert credentials.email == "cred@example.com"
+    assert credentials.password_hash == "stored"
+    assert missing is None
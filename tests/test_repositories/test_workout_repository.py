@@ -0,0 +1,107 @@
+import pytest
+from api.models.workout_plan_exercise import WorkoutPlanExerciseCreate
+from api.repositories.workout_repository import WorkoutRepository
+
+
+@pytest.fixture
+def user_id(test_db):
+    cursor = test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("lifter", "lifter@example.com", "hash"),
+    )
+    test_db.commit()
+    return cursor.lastrowid
+
+
+async def seed_plans(repo, user_id, plans, exercises_per_plan):
+    for p in range(plans):
+        plan = await repo.create_workout_plan(user_id, f"Plan {p}")
+        for e in range(exercises_per_plan):
+            await repo.add_exercise_to_plan(
+                plan.id, WorkoutPlanExerciseCreate(exercise_id=e + 1, sets=3, reps=10)
+            )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("plans", [1, 5, 50])
+async def test_get_all_plans_uses_two_queries_regardless_of_plan_count(
+    async_db, user_id, statements, plans
+):
+    # Arrange
+    repo = WorkoutRepository(async_db)
+    await seed_plans(repo, user_id, plans, exercises_per_plan=3)
+    statements.clear()
+
+    # Act
+    result = await repo.get_all_workout_plans_by_user(user_id)
+
+    # Assert
+    assert len(statements) == 2
+    assert len(result) == plans
+    assert all(len(plan.exercises) == 3 for plan in result)
+    assert [e.exercise_id for e in result[-1].exercises] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_get_all_plans_without_plans_is_one_query(async_db, user_id, statements):
+    # Act
+    result = await WorkoutRepository(async_db).get_all_workout_plans_by_user(user_id)
+
+    # Assert
+    assert result == []
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_plan_is_only_visible_to_its_owner(async_db, user_id):
+    # Arrange
+    repo = WorkoutRepository(async_db)
+    plan = await repo.create_workout_plan(user_id, "Mine", "desc")
+
+    # Act & Assert
+    assert (await repo.get_workout_plan_by_id(plan.id, user_id)).name == "Mine"
+    assert await repo.get_workout_plan_by_id(plan.id, user_id + 1) is None
+    assert await repo.update_workout_plan(plan.id, user_id + 1, "Stolen") is None
+    assert await repo.delete_workout_plan(plan.id, user_id + 1) is False
+
+
+@pytest.mark.asyncio
+async def test_update_returns_plan_with_exercises(async_db, user_id):
+    # Arrange
+    repo = WorkoutRepository(async_db)
+    await seed_plans(repo, user_id, plans=1, exercises_per_plan=2)
+
+    # Act
+    updated = await repo.update_workout_plan(1, user_id, "Renamed", "new")
+
+    # Assert
+    assert updated.name == "Renamed"
+    assert len(updated.exercises) == 2
+
+
+@pytest.mark.asyncio
+async def test_add_unknown_exercise_returns_none(async_db, user_id):
+    # Arrange
+    repo = WorkoutRepository(async_db)
+    plan = await repo.create_workout_plan(user_id, "Plan")
+
+    # Act
+    added = await repo.add_exercise_to_plan(
+        plan.id, WorkoutPlanExerciseCreate(exercise_id=9999, sets=3)
+    )
+
+    # Assert
+    assert added is None
+
+
+@pytest.mark.asyncio
+async def test_remove_and_delete(test_db, async_db, user_id):
+    # Arrange
+    repo = WorkoutRepository(async_db)
+    await seed_plans(repo, user_id, plans=1, exercises_per_plan=2)
+
+    # Act & Assert
+    assert await repo.remove_exercise_from_plan(1, 1) is True
+    assert await repo.remove_exercise_from_plan(1, 1) is False
+    assert await repo.delete_workout_plan(1, user_id) is True
+    assert test_db.execute("SELECT COUNT(*) FROM workout_plan_exercises").fetchone()[0] == 0
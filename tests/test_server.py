@@ -0,0 +1,101 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import pytest
+from server import Arbiter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get(port):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5) as response:
+        return response.status
+
+
+def test_request_limit_adds_jitter_and_zero_disables_it():
+    # Arrange
+    limited = Arbiter(max_requests=100, max_requests_jitter=10)
+    unlimited = Arbiter(max_requests=0, max_requests_jitter=10)
+
+    # Act
+    limits = {limited._request_limit() for _ in range(200)}
+
+    # Assert
+    assert min(limits) >= 100 and max(limits) <= 110 and len(limits) > 1
+    assert unlimited._request_limit() is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork server needs fork()")
+def test_sighup_reload_serves_every_request(tmp_path):
+    # Arrange
+    port = free_port()
+    (tmp_path / "tmp").mkdir()
+    env = dict(
+        os.environ,
+        WEB_PORT=str(port),
+        WEB_WORKERS="2",
+        WEB_GRACEFUL_TIMEOUT="5",
+        DB_PATH=str(tmp_path / "app.db"),
+        TMPDIR=str(tmp_path / "tmp"),
+    )
+    env.pop("METRICS_DIR", None)
+    log = open(tmp_path / "server.log", "w")
+    proc = subprocess.Popen(
+        [sys.executable, "manage.py", "prod"], cwd=ROOT, env=env, stdout=log, stderr=log
+    )
+    results = []
+    stop = threading.Event()
+
+    def hammer():
+        while not stop.is_set():
+            try:
+                results.append(get(port))
+            except OSError as exc:
+                results.append(exc)
+
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                get(port)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        # Several clients, so connections are being accepted at every moment
+        clients = [threading.Thread(target=hammer) for _ in range(4)]
+        for client in clients:
+            client.start()
+
+        # Act
+        proc.send_signal(signal.SIGHUP)
+        deadline = time.monotonic() + 20
+        while "Reload complete" not in (tmp_path / "server.log").read_text():
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        time.sleep(0.5)
+        stop.set()
+        for client in clients:
+            client.join()
+    finally:
+        stop.set()
+        proc.send_signal(signal.SIGTERM)
+        code = proc.wait(timeout=30)
+        log.close()
+
+    # Assert
+    assert code == 0
+    assert results and all(result == 200 for result in results)
+    assert not list((tmp_path / "tmp").iterdir())  # metrics dir removed after the reload
@@ -0,0 +1,84 @@
+import hashlib
+import pytest
+from api.models.user import UserCreate, UserLogin
+from api.repositories.user_repository import UserRepository
+from api.services.auth_service import AuthService
+from api.utils.security import password_hasher
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    """Counts password hasher work per operation"""
+
+    calls = {"hash": 0, "verify": 0}
+    hash_async = password_hasher.hash_async
+    verify_async = password_hasher.verify_async
+
+    async def counting_hash(password):
+        calls["hash"] += 1
+        return await hash_async(password)
+
+    async def counting_verify(password, encoded):
+        calls["verify"] += 1
+        return await verify_async(password, encoded)
+
+    monkeypatch.setattr(password_hasher, "hash_async", counting_hash)
+    monkeypatch.setattr(password_hasher, "verify_async", counting_verify)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_register_is_one_hash_and_one_insert(async_db, statements, hash_calls):
+    # Arrange
+    service = AuthService(UserRepository(async_db))
+
+    # Act
+    await service.create_user(
+        UserCreate(username="budget", email="budget@example.com", password="pass123")
+    )
+
+    # Assert
+    assert hash_calls == {"hash": 1, "verify": 0}
+    assert len(statements) == 1
+    assert statements[0].lstrip().startswith("INSERT INTO users")
+
+
+@pytest.mark.asyncio
+async def test_login_is_one_verify_and_one_select(async_db, statements, hash_calls):
+    # Arrange
+    service = AuthService(UserRepository(async_db))
+    await service.create_user(
+        UserCreate(username="budget", email="budget@example.com", password="pass123")
+    )
+    statements.clear()
+    hash_calls.update(hash=0, verify=0)
+
+    # Act
+    token = await service.login(UserLogin(email="budget@example.com", password="pass123"))
+
+    # Assert
+    assert token.access_token
+    assert hash_calls == {"hash": 0, "verify": 1}
+    assert len(statements) == 1
+    assert statements[0].lstrip().startswith("SELECT id, email, password_hash")
+
+
+@pytest.mark.asyncio
+async def test_login_with_legacy_hash_adds_one_rehash_and_one_update(
+    test_db, async_db, statements, hash_calls
+):
+    # Arrange
+    test_db.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+        ("legacy", "legacy@example.com", hashlib.sha256(b"oldpass").hexdigest()),
+    )
+    test_db.commit()
+    statements.clear()
+    service = AuthService(UserRepository(async_db))
+
+    # Act
+    await service.login(UserLogin(email="legacy@example.com", password="oldpass"))
+
+    # Assert
+    assert hash_calls == {"hash": 1, "verify": 1}
+    assert [sql.lstrip().split(None, 1)[0] for sql in statements] == ["SELECT", "UPDATE"]
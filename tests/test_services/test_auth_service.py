@@ -1,9 +1,16 @@
+import hashlib
 import pytest
 from unittest.mock import AsyncMock, Mock
 from api.models.user import UserCreate, UserResponse, UserLogin, Token
+from api.repositories.user_repository import UserAlreadyExistsError
 from api.services.auth_service import AuthService
 from fastapi import HTTPException
-from api.utils.security import hash_password
+from api.utils.security import (
+    PasswordHasherBusy,
+    hash_password,
+    password_hasher,
+    verify_password,
+)
 
 
 class TestAuthService:
@@ -22,7 +29,6 @@ class TestAuthService:
             email="new@example.com"
         )
         
-        mock_user_repository.get_user_by_email = AsyncMock(return_value=None)
         mock_user_repository.create_user = AsyncMock(return_value=expected_user)
         
         auth_service = AuthService(mock_user_repository)
@@ -33,8 +39,9 @@ class TestAuthService:
         # Assert
         assert result.username == "newuser"
         assert result.email == "new@example.com"
-        mock_user_repository.get_user_by_email.assert_called_once_with("new@example.com")
         mock_user_repository.create_user.assert_called_once()
+        stored_hash = mock_user_repository.create_user.call_args.kwargs["password_hash"]
+        assert verify_password("securepass123", stored_hash)
         
     @pytest.mark.asyncio
     async def test_register_user_duplicate_email_fails(self, mock_user_repository):
@@ -45,13 +52,9 @@ class TestAuthService:
             password="pass123"
         )
         
-        existing_user = UserResponse(
-            id=1,
-            username="duplicate",
-            email="exists@example.com",
+        mock_user_repository.create_user = AsyncMock(
+            side_effect=UserAlreadyExistsError("email")
         )
-        
-        mock_user_repository.get_user_by_email = AsyncMock(return_value=existing_user)
         auth_service = AuthService(mock_user_repository)
         
         # Act
@@ -62,6 +65,25 @@ class TestAuthService:
         assert exc_info.value.status_code == 400
         assert "already registered" in str(exc_info.value.detail).lower()
     
+    @pytest.mark.asyncio
+    async def test_register_user_duplicate_username_fails(self, mock_user_repository):
+        # Arrange
+        user_data = UserCreate(
+            username="taken", email="free@example.com", password="pass123"
+        )
+        mock_user_repository.create_user = AsyncMock(
+            side_effect=UserAlreadyExistsError("username")
+        )
+        auth_service = AuthService(mock_user_repository)
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_service.create_user(user_data)
+
+        # Assert
+        assert exc_info.value.status_code == 400
+        assert "username" in str(exc_info.value.detail).lower()
+
     @pytest.mark.asyncio
     async def test_login_success(self, mock_user_repository):
         # Arrange
@@ -77,7 +99,7 @@ class TestAuthService:
         stored_user.email = "user@example.com"
         stored_user.password_hash = password_hash
         
-        mock_user_repository.get_user_by_email = AsyncMock(return_value=stored_user)
+        mock_user_repository.get_credentials_by_email = AsyncMock(return_value=stored_user)
         auth_service = AuthService(mock_user_repository)
         
         # Act
@@ -96,7 +118,7 @@ class TestAuthService:
             password="wrongpass"
         )
         
-        mock_user_repository.get_user_by_email = AsyncMock(return_value=None)
+        mock_user_repository.get_credentials_by_email = AsyncMock(return_value=None)
         auth_service = AuthService(mock_user_repository)
         
         # Act
@@ -105,4 +127,87 @@ class TestAuthService:
         
         # Assert
         assert exc_info.value.status_code == 401
-        
\ No newline at end of file
+
+    @pytest.mark.asyncio
+    async def test_login_with_unknown_email_still_runs_a_hash(
+        self, mock_user_repository, monkeypatch
+    ):
+        # Arrange
+        dummy = AsyncMock(return_value=False)
+        monkeypatch.setattr(password_hasher, "verify_dummy_async", dummy)
+        mock_user_repository.get_credentials_by_email = AsyncMock(return_value=None)
+        auth_service = AuthService(mock_user_repository)
+
+        # Act
+        with pytest.raises(HTTPException):
+            await auth_service.login(UserLogin(email="nobody@example.com", password="guess"))
+
+        # Assert
+        dummy.assert_awaited_once_with("guess")
+        
+    @pytest.mark.asyncio
+    async def test_login_upgrades_legacy_hash(self, mock_user_repository):
+        # Arrange
+        credentials = UserLogin(email="user@example.com", password="oldpass")
+
+        stored_user = Mock()
+        stored_user.id = 7
+        stored_user.email = "user@example.com"
+        stored_user.password_hash = hashlib.sha256(b"oldpass").hexdigest()
+
+        mock_user_repository.get_credentials_by_email = AsyncMock(return_value=stored_user)
+        mock_user_repository.update_password_hash = AsyncMock()
+        auth_service = AuthService(mock_user_repository)
+
+        # Act
+        result = await auth_service.login(credentials)
+
+        # Assert
+        assert isinstance(result, Token)
+        user_id, new_hash = mock_user_repository.update_password_hash.call_args.args
+        assert user_id == 7
+        assert new_hash.startswith("$scrypt$")
+        assert verify_password("oldpass", new_hash)
+
+    @pytest.mark.asyncio
+    async def test_login_with_current_hash_is_not_rewritten(self, mock_user_repository):
+        # Arrange
+        credentials = UserLogin(email="user@example.com", password="correctpass")
+
+        stored_user = Mock()
+        stored_user.id = 1
+        stored_user.email = "user@example.com"
+        stored_user.password_hash = hash_password("correctpass")
+
+        mock_user_repository.get_credentials_by_email = AsyncMock(return_value=stored_user)
+        mock_user_repository.update_password_hash = AsyncMock()
+        auth_service = AuthService(mock_user_repository)
+
+        # Act
+        await auth_service.login(credentials)
+
+        # Assert
+        mock_user_repository.update_password_hash.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_login_returns_503_when_hasher_is_saturated(
+        self, mock_user_repository, monkeypatch
+    ):
+        # Arrange
+        async def busy(*args):
+            raise PasswordHasherBusy("saturated")
+
+        stored_user = Mock()
+        stored_user.password_hash = hash_password("correctpass")
+        mock_user_repository.get_credentials_by_email = AsyncMock(return_value=stored_user)
+        monkeypatch.setattr(password_hasher, "verify_async", busy)
+        auth_service = AuthService(mock_user_repository)
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_service.login(
+                UserLogin(email="user@example.com", password="correctpass")
+            )
+
+        # Assert
+        assert exc_info.value.status_code == 503
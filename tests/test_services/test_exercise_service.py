@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import AsyncMock, Mock
 from api.services.exercise_service import ExerciseService
-from api.models.exercise import ExerciseResponse
+from api.utils.pagination import decode_cursor, encode_cursor
+from api.models.exercise import ExerciseCreate, ExerciseResponse
 from fastapi import HTTPException
 
 class TestExerciseService:
@@ -69,4 +70,78 @@ class TestExerciseService:
             await exercise_service.get_exercise_by_id(12)
         
         assert exc_info.value.status_code == 404
-        mock_exercise_repository.get_exercise_by_id.assert_called_once_with(12)
\ No newline at end of file
+        mock_exercise_repository.get_exercise_by_id.assert_called_once_with(12)
+
+    @pytest.mark.asyncio
+    async def test_create_exercise(self, mock_exercise_repository):
+        # Arrange
+        exercise_data = ExerciseCreate(name="Lunges", category="strength", muscle_group="legs")
+        expected_exercise = ExerciseResponse(id=9, **exercise_data.model_dump())
+
+        mock_exercise_repository.create_exercise = AsyncMock(return_value=expected_exercise)
+        exercise_service = ExerciseService(mock_exercise_repository)
+
+        # Act
+        result = await exercise_service.create_exercise(exercise_data)
+
+        # Assert
+        assert result.id == 9
+        mock_exercise_repository.create_exercise.assert_called_once_with(exercise_data)
+
+    @pytest.mark.asyncio
+    async def test_get_exercises_page_returns_next_cursor(self, mock_exercise_repository):
+        # Arrange
+        rows = [{"id": i, "name": f"Exercise {i}"} for i in (4, 5, 6)]
+        mock_exercise_repository.get_exercises_page = AsyncMock(return_value=rows)
+        exercise_service = ExerciseService(mock_exercise_repository)
+
+        # Act
+        items, next_cursor = await exercise_service.get_exercises_page(
+            category="strength", fields="name", cursor=encode_cursor(3), limit=2
+        )
+
+        # Assert
+        assert [item["id"] for item in items] == [4, 5]
+        assert decode_cursor(next_cursor) == 5
+        mock_exercise_repository.get_exercises_page.assert_called_once_with(
+            category="strength",
+            muscle_group=None,
+            after_id=3,
+            limit=3,
+            columns=("name",),
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_exercises_page_last_page_has_no_cursor(self, mock_exercise_repository):
+        # Arrange
+        mock_exercise_repository.get_exercises_page = AsyncMock(return_value=[{"id": 1}])
+        exercise_service = ExerciseService(mock_exercise_repository)
+
+        # Act
+        items, next_cursor = await exercise_service.get_exercises_page(limit=5)
+
+        # Assert
+        assert len(items) == 1
+        assert next_cursor is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"fields": "name,password_hash"},
+            {"cursor": "not-a-cursor"},
+            {"cursor": encode_cursor(True)},
+            {"cursor": encode_cursor(2**63)},
+        ],
+    )
+    async def test_get_exercises_page_rejects_bad_input(self, mock_exercise_repository, kwargs):
+        # Arrange
+        mock_exercise_repository.get_exercises_page = AsyncMock()
+        exercise_service = ExerciseService(mock_exercise_repository)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await exercise_service.get_exercises_page(**kwargs)
+
+        assert exc_info.value.status_code == 400
+        mock_exercise_repository.get_exercises_page.assert_not_called()
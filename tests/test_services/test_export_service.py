@@ -0,0 +1,169 @@
+import csv
+import io
+import json
+import tracemalloc
+import pytest
+from api.repositories.session_repository import (
+    HISTORY_COLUMNS,
+    HISTORY_PAGE_AFTER_SQL,
+    SessionRepository,
+)
+from api.services.export_service import ExportService
+from contextlib import asynccontextmanager
+
+
+@pytest.fixture
+def history(test_db):
+    """A user with ``sessions`` sessions of six exercises each"""
+
+    def build(sessions):
+        user_id = test_db.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+            (f"user{sessions}", f"user{sessions}@example.com", "hash"),
+        ).lastrowid
+        plan_id = test_db.execute(
+            "INSERT INTO workout_plans (user_id, name) VALUES (?, ?)", (user_id, "Plan")
+        ).lastrowid
+        first = test_db.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM workout_sessions"
+        ).fetchone()[0]
+        test_db.executemany(
+            "INSERT INTO workout_sessions (id, workout_plan_id, user_id, completed_at, notes) "
+            "VALUES (?, ?, ?, datetime('2020-01-01', ?), ?)",
+            [
+                (first + i, plan_id, user_id, f"+{i} hours", "felt strong " * 4)
+                for i in range(sessions)
+            ],
+        )
+        test_db.executemany(
+            "INSERT INTO sessions_exercises "
+            "(session_id, exercise_id, sets_completed, reps_completed, weight_used) "
+            "VALUES (?, ?, 3, 10, 42.5)",
+            [(first + i, e) for i in range(sessions) for e in range(1, 7)],
+        )
+        test_db.commit()
+        return user_id
+
+    return build
+
+
+def service_for(async_db, chunk_size=100):
+    @asynccontextmanager
+    async def connect():
+        yield async_db
+
+    return ExportService(connect=connect, chunk_size=chunk_size)
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_has_one_object_per_exercise_row(async_db, history):
+    # Arrange
+    user_id = history(sessions=3)
+
+    # Act
+    body = await collect(service_for(async_db).export_history(user_id, "ndjson"))
+
+    # Assert
+    lines = [json.loads(line) for line in body.decode().splitlines()]
+    assert len(lines) == 18
+    assert lines[0]["completed_at"] == "2020-01-01 00:00:00"
+    assert lines[0]["exercise_name"]
+    assert set(lines[0]) == set(HISTORY_COLUMNS)
+
+
+@pytest.mark.asyncio
+async def test_csv_export_starts_with_header(async_db, history):
+    # Arrange
+    user_id = history(sessions=2)
+
+    # Act
+    body = await collect(service_for(async_db).export_history(user_id, "csv"))
+
+    # Assert
+    rows = list(csv.reader(io.StringIO(body.decode())))
+    assert tuple(rows[0]) == HISTORY_COLUMNS
+    assert len(rows) == 1 + 12
+
+
+def test_history_pages_seek_the_index_instead_of_scanning(test_db):
+    plan = test_db.execute(
+        "EXPLAIN QUERY PLAN " + HISTORY_PAGE_AFTER_SQL, (1, "2020-01-01", 1, 100)
+    ).fetchall()
+    details = [row[3] for row in plan]
+    assert any(
+        "idx_workout_sessions_user_completed (user_id=? AND completed_at>?)" in detail
+        for detail in details
+    )
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_uncompleted_sessions_once_in_order(test_db, async_db, history):
+    # Arrange: two never-completed sessions sort before the completed ones
+    user_id = history(sessions=5)
+    test_db.execute(
+        "UPDATE workout_sessions SET completed_at = NULL "
+        "WHERE id IN (SELECT id FROM workout_sessions WHERE user_id = ? ORDER BY id DESC LIMIT 2)",
+        (user_id,),
+    )
+    test_db.commit()
+
+    # Act
+    body = await collect(service_for(async_db, chunk_size=1).export_history(user_id))
+
+    # Assert
+    lines = [json.loads(line) for line in body.decode().splitlines()]
+    session_ids = list(dict.fromkeys(line["session_id"] for line in lines))
+    assert len(lines) == 30
+    assert [line["completed_at"] for line in lines[:12]] == [None] * 12
+    assert len(session_ids) == 5
+
+
+@pytest.mark.asyncio
+async def test_no_connection_is_held_between_chunks(async_db, history):
+    # Arrange
+    user_id = history(sessions=3)
+    held = []
+
+    @asynccontextmanager
+    async def connect():
+        held.append(True)
+        yield async_db
+        held.pop()
+
+    service = ExportService(connect=connect, chunk_size=1)
+
+    # Act
+    between_chunks = [len(held) async for _ in service.export_history(user_id)]
+
+    # Assert
+    assert between_chunks == [0, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_export_memory_stays_bounded(async_db, history):
+    # Arrange: 2,500 sessions -> 15,000 exported rows
+    user_id = history(sessions=2500)
+    service = service_for(async_db, chunk_size=40)
+
+    tracemalloc.start()
+    try:
+        # Act: stream and discard, as the ASGI server does
+        exported = 0
+        async for chunk in service.export_history(user_id, "ndjson"):
+            exported += chunk.count(b"\n")
+        streaming_peak = tracemalloc.get_traced_memory()[1]
+
+        # Baseline: materializing the whole result, as response_model would
+        tracemalloc.reset_peak()
+        await SessionRepository(async_db).get_history_page(user_id, limit=2500)
+        materialized_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Assert
+    assert exported == 15000
+    assert streaming_peak < materialized_peak / 10
@@ -0,0 +1,109 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, Mock
+from api.services.leaderboard_service import LeaderboardService
+from api.utils.leaderboard import LeaderboardIndex
+from fastapi import HTTPException
+
+
+def make_repository(scores):
+    repository = Mock()
+    repository.get_board_scores = AsyncMock(return_value=scores)
+    repository.get_user_scores = AsyncMock(return_value=[])
+    repository.get_usernames = AsyncMock(
+        side_effect=lambda user_ids: {user_id: f"user{user_id}" for user_id in user_ids}
+    )
+    return repository
+
+
+class TestLeaderboardService:
+    @pytest.mark.asyncio
+    async def test_board_is_loaded_once_and_then_served_from_memory(self):
+        # Arrange
+        repository = make_repository([(1, 500.0), (2, 900.0), (3, 700.0)])
+        service = LeaderboardService(repository, LeaderboardIndex(10))
+
+        # Act
+        first = await service.get_weekly_leaderboard(3, week=date(2024, 3, 6), limit=2)
+        second = await service.get_weekly_leaderboard(1, week=date(2024, 3, 4))
+
+        # Assert
+        repository.get_board_scores.assert_awaited_once_with("2024-03-04", None)
+        assert first.week == date(2024, 3, 4)
+        assert [(e.rank, e.user_id, e.username) for e in first.entries] == [
+            (1, 2, "user2"),
+            (2, 3, "user3"),
+        ]
+        assert first.me.rank == 2
+        assert second.me.rank == 3
+        assert second.size == 3
+
+    @pytest.mark.asyncio
+    async def test_recorded_sessions_update_loaded_boards_only(self):
+        # Arrange
+        repository = make_repository([(1, 500.0), (2, 900.0)])
+        service = LeaderboardService(repository, LeaderboardIndex(10))
+        await service.get_weekly_leaderboard(1, week=date(2024, 3, 4))
+        await service.get_weekly_leaderboard(1, week=date(2024, 3, 4), exercise_id=7)
+        repository.get_user_scores.return_value = [
+            ("2024-03-04", 7, 600.0),
+            ("2024-03-04", 8, 400.0),
+        ]
+
+        # Act
+        await service.record_sessions(1, {"2024-03-04", "2024-01-01"})
+        await service.record_sessions(1, {"2023-01-02"})
+
+        # Assert
+        repository.get_user_scores.assert_awaited_once_with(1, {"2024-03-04"})
+        total = await service.get_weekly_leaderboard(1, week=date(2024, 3, 4))
+        by_exercise = await service.get_weekly_leaderboard(
+            1, week=date(2024, 3, 4), exercise_id=7
+        )
+        assert (total.me.rank, total.me.score) == (1, 1000.0)
+        assert (by_exercise.me.rank, by_exercise.me.score) == (2, 600.0)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_reloads_every_loaded_board(self):
+        # Arrange
+        repository = make_repository([(1, 500.0)])
+        service = LeaderboardService(repository, LeaderboardIndex(10))
+        await service.get_weekly_leaderboard(1, week=date(2024, 3, 4))
+        repository.get_board_scores.return_value = [(1, 500.0), (2, 800.0)]
+
+        # Act
+        rebuilt = await service.rebuild()
+
+        # Assert
+        board = await service.get_weekly_leaderboard(1, week=date(2024, 3, 4))
+        assert rebuilt == 1
+        assert board.me.rank == 2
+
+    @pytest.mark.asyncio
+    async def test_rebuild_leaves_unchanged_boards_alone(self):
+        # Arrange
+        repository = make_repository([(1, 500.0), (2, 800.0)])
+        index = LeaderboardIndex(10)
+        service = LeaderboardService(repository, index)
+        await service.get_weekly_leaderboard(1, week=date(2024, 3, 4))
+        board = index.get(("2024-03-04", None))
+        keys = board._keys
+        repository.get_board_scores.return_value = [(2, 800.0), (1, 500.0)]
+
+        # Act
+        rebuilt = await service.rebuild()
+
+        # Assert
+        assert rebuilt == 0
+        assert index.get(("2024-03-04", None)) is board
+        assert board._keys is keys
+
+    @pytest.mark.asyncio
+    async def test_limit_is_bounded(self):
+        # Arrange
+        service = LeaderboardService(make_repository([]), LeaderboardIndex(10))
+
+        # Act / Assert
+        with pytest.raises(HTTPException) as exc:
+            await service.get_weekly_leaderboard(1, limit=0)
+        assert exc.value.status_code == 400
@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from api.repositories.session_repository import IdempotencyKeyMismatch
+from api.services.session_service import SessionService
+from fastapi import HTTPException
+
+
+def make_repository(owned_plans=(1,), exercises=(1, 2)):
+    repository = Mock()
+    repository.get_owned_plan_ids = AsyncMock(return_value=set(owned_plans))
+    repository.get_existing_exercise_ids = AsyncMock(return_value=set(exercises))
+    repository.get_idempotent_response = AsyncMock(return_value=None)
+    repository.bulk_create_sessions = AsyncMock(
+        side_effect=lambda user_id, sessions, errors, idempotency: (
+            {"session_ids": list(range(10, 10 + len(sessions))), "errors": errors},
+            False,
+        )
+    )
+    return repository
+
+
+class TestSessionService:
+    @pytest.mark.asyncio
+    async def test_invalid_items_are_reported_and_valid_ones_written(self):
+        # Arrange
+        repository = make_repository()
+        service = SessionService(repository)
+        items = [
+            {"workout_plan_id": 1, "exercises": [{"exercise_id": 1, "sets_completed": 3}]},
+            {"workout_plan_id": "not-a-number"},
+            {"workout_plan_id": 99},
+            {"workout_plan_id": 1, "exercises": [{"exercise_id": 42}]},
+            {"workout_plan_id": 1},
+        ]
+
+        # Act
+        result = await service.bulk_create_sessions(user_id=1, items=items)
+
+        # Assert
+        assert result.created == 2
+        assert [error.index for error in result.errors] == [1, 2, 3]
+        assert "workout_plan_id" in result.errors[0].errors[0]
+        assert result.errors[1].errors == ["workout_plan_id: Workout plan not found"]
+        assert result.errors[2].errors == ["exercises.0.exercise_id: Exercise not found"]
+        written = repository.bulk_create_sessions.call_args.args[1]
+        assert len(written) == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_with_same_key_replays_stored_response(self):
+        # Arrange
+        repository = make_repository()
+        repository.get_idempotent_response = AsyncMock(
+            return_value={"session_ids": [5, 6], "errors": []}
+        )
+        service = SessionService(repository)
+
+        # Act
+        result = await service.bulk_create_sessions(
+            1, [{"workout_plan_id": 1}], idempotency_key="abc"
+        )
+
+        # Assert
+        assert result.replayed is True
+        assert result.session_ids == [5, 6]
+        repository.bulk_create_sessions.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_other_payload_is_rejected(self):
+        # Arrange
+        repository = make_repository()
+        repository.get_idempotent_response = AsyncMock(
+            side_effect=IdempotencyKeyMismatch("abc")
+        )
+        service = SessionService(repository)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await service.bulk_create_sessions(
+                1, [{"workout_plan_id": 1}], idempotency_key="abc"
+            )
+        assert exc_info.value.status_code == 422
@@ -0,0 +1,145 @@
+import math
+import numpy as np
+import pytest
+from api.utils.analytics import (
+    LiftHistory,
+    e1rm_trend,
+    estimated_1rm,
+    personal_records,
+    rolling_mean,
+)
+
+ROWS = [
+    (2, "2024-03-04", 3, 5, 100.0),
+    (1, "2024-03-04", 3, 10, 50.0),
+    (1, "2024-03-04", 1, 3, 70.0),
+    (2, "2024-03-06", 3, 3, 110.0),
+    (1, "2024-03-08", 3, 12, 50.0),
+    (1, "2024-03-11", 1, 0, 90.0),
+    (1, "2024-03-12", 2, 3, 70.0),
+]
+
+
+def history_of(rows):
+    """LiftHistory from rows with ISO dates, as from_records would get them"""
+    epoch = np.datetime64("1970-01-01", "D")
+    return LiftHistory.from_records(
+        (exercise_id, int((np.datetime64(day, "D") - epoch).astype(np.int64)), sets, reps, weight)
+        for exercise_id, day, sets, reps, weight in rows
+    )
+
+
+def test_estimated_1rm_formulas():
+    # Arrange
+    weight = np.array([100.0, 100.0, 100.0, 100.0])
+    reps = np.array([1, 10, 0, 40])
+
+    # Act
+    epley = estimated_1rm(weight, reps, "epley")
+    brzycki = estimated_1rm(weight, reps, "brzycki")
+
+    # Assert
+    assert epley[:2] == pytest.approx([100.0, 100 * (1 + 10 / 30)])
+    assert math.isnan(epley[2])
+    assert brzycki[:2] == pytest.approx([100.0, 100 * 36 / 27])
+    assert np.isnan(brzycki[2:]).all()
+
+
+def test_rolling_mean_uses_partial_windows_at_the_start():
+    # Act
+    result = rolling_mean(np.array([1.0, 2.0, 3.0, 4.0, 5.0]), window=3)
+
+    # Assert
+    assert result == pytest.approx([1.0, 1.5, 2.0, 3.0, 4.0])
+
+
+def test_personal_records_match_a_row_by_row_scan():
+    # Arrange
+    history = history_of(ROWS)
+    expected = {}
+    for exercise_id, day, _sets, reps, weight in ROWS:
+        best = expected.setdefault(
+            exercise_id,
+            {"max_weight": (-1, None), "max_reps": 0, "e1rm": (-1, None), "volume": 0},
+        )
+        if weight > best["max_weight"][0]:
+            best["max_weight"] = (weight, day)
+        best["max_reps"] = max(best["max_reps"], reps)
+        if reps >= 1:
+            e1rm = weight if reps == 1 else weight * (1 + reps / 30)
+            if e1rm > best["e1rm"][0]:
+                best["e1rm"] = (e1rm, day)
+        best["volume"] = max(best["volume"], reps * weight)
+
+    # Act
+    records = personal_records(history)
+
+    # Assert
+    assert records["exercise_id"].tolist() == [1, 2]
+    for i, exercise_id in enumerate(records["exercise_id"].tolist()):
+        best = expected[exercise_id]
+        assert records["max_weight"][i] == best["max_weight"][0]
+        assert str(records["max_weight_day"][i]) == best["max_weight"][1]
+        assert records["max_reps"][i] == best["max_reps"]
+        assert records["best_e1rm"][i] == pytest.approx(best["e1rm"][0])
+        assert str(records["best_e1rm_day"][i]) == best["e1rm"][1]
+        assert records["best_set_volume"][i] == best["volume"]
+
+
+def test_e1rm_trend_keeps_the_best_set_per_day():
+    # Arrange
+    history = history_of(ROWS)
+
+    # Act
+    trend = e1rm_trend(history, exercise_id=1, window=2)
+
+    # Assert
+    # 2024-03-11 only has a set without reps, so it has no estimate
+    assert [str(day) for day in trend["day"]] == ["2024-03-04", "2024-03-08", "2024-03-12"]
+    assert trend["e1rm"] == pytest.approx([70 * 1.1, 50 * 1.4, 70 * 1.1])
+    assert trend["rolling_mean"] == pytest.approx([77.0, 73.5, 73.5])
+
+
+def test_empty_history_gives_empty_results():
+    # Arrange
+    history = history_of([])
+
+    # Act
+    records = personal_records(history)
+    trend = e1rm_trend(history, exercise_id=1)
+
+    # Assert
+    assert len(records["exercise_id"]) == 0
+    assert len(trend["day"]) == 0
+
+
+def test_records_are_sorted_by_exercise_then_day():
+    # Act
+    history = LiftHistory.from_records(
+        iter([(2, 2, 3, 5, 100.5), (1, 3, 2, 8, 60.0), (1, 1, 1, 3, 70.0)])
+    )
+    empty = LiftHistory.from_records(iter([]))
+
+    # Assert
+    assert history.exercise_id.tolist() == [1, 1, 2]
+    assert [str(day) for day in history.day] == ["1970-01-02", "1970-01-04", "1970-01-03"]
+    assert history.weight.tolist() == [70.0, 60.0, 100.5]
+    assert history.day.dtype == np.dtype("datetime64[D]")
+    assert history.sets.dtype == history.reps.dtype == np.int64
+    assert len(empty) == 0
+
+
+def test_misaligned_columns_are_rejected():
+    with pytest.raises(ValueError, match="differ in length"):
+        LiftHistory(
+            exercise_id=np.array([1, 1, 2]),
+            day=np.array(["2024-03-04", "2024-03-05"], dtype="datetime64[D]"),
+            sets=np.array([3, 3, 3]),
+            reps=np.array([5, 5, 5]),
+            weight=np.array([100.0, 100.0, 100.0]),
+        )
+
+
+def test_records_reject_nulls_instead_of_misaligning():
+    with pytest.raises(TypeError):
+        LiftHistory.from_records(iter([(1, 1, 3, 5, 100.0), (1, None, 3, 5, 100.0)]))
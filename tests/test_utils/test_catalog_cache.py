@@ -0,0 +1,94 @@
+from api.models.exercise import ExerciseResponse
+import gzip
+import json
+from api.utils.catalog_cache import ExerciseCatalogCache, etag_matches
+
+
+def make_exercises():
+    return [
+        ExerciseResponse(id=1, name="Push Up", category="strength", muscle_group="chest"),
+        ExerciseResponse(id=2, name="Squat", category="strength", muscle_group="legs"),
+    ]
+
+
+def test_store_builds_snapshot_with_id_index():
+    # Arrange
+    cache = ExerciseCatalogCache()
+
+    # Act
+    snapshot = cache.store(make_exercises(), cache.version)
+
+    # Assert
+    assert cache.get() is snapshot
+    assert snapshot.by_id[2].name == "Squat"
+    assert snapshot.etag.startswith('W/"')
+
+
+def test_store_is_rejected_after_concurrent_invalidation():
+    # Arrange
+    cache = ExerciseCatalogCache()
+    version = cache.version
+
+    # Act: a write lands while the reader was still loading rows
+    cache.invalidate()
+    snapshot = cache.store(make_exercises(), version)
+
+    # Assert
+    assert snapshot is None
+    assert cache.get() is None
+
+
+def test_etag_depends_on_content_not_version():
+    # Arrange
+    first, second = ExerciseCatalogCache(), ExerciseCatalogCache()
+    second.invalidate()
+
+    # Act
+    first_etag = first.store(make_exercises(), first.version).etag
+    second_etag = second.store(make_exercises(), second.version).etag
+    changed = make_exercises()
+    changed[0] = changed[0].model_copy(update={"name": "Diamond Push Up"})
+    changed_etag = ExerciseCatalogCache().store(changed, 0).etag
+
+    # Assert
+    assert first_etag == second_etag
+    assert changed_etag != first_etag
+
+
+def test_snapshot_carries_preencoded_bodies():
+    # Arrange
+    cache = ExerciseCatalogCache()
+
+    # Act
+    snapshot = cache.store(make_exercises(), cache.version)
+    gzip_body, gzip_coding = snapshot.negotiate("gzip, deflate")
+    plain_body, plain_coding = snapshot.negotiate("gzip;q=0, identity")
+
+    # Assert
+    assert json.loads(snapshot.body)[1]["name"] == "Squat"
+    assert gzip_coding == "gzip"
+    assert gzip.decompress(gzip_body) == snapshot.body
+    assert plain_coding is None
+    assert plain_body == snapshot.body
+
+
+def test_etag_matches_handles_lists_weak_tags_and_wildcard():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"other", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"other"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_sync_drops_snapshot_only_when_database_version_moved():
+    # Arrange
+    cache = ExerciseCatalogCache()
+    cache.store(make_exercises(), cache.version, source_version=4)
+
+    # Act
+    unchanged = cache.sync(4)
+    changed = cache.sync(5)
+
+    # Assert
+    assert (unchanged, changed) == (False, True)
+    assert cache.get() is None
@@ -0,0 +1,54 @@
+import uuid
+from api.utils.denylist import TokenDenylist
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_revoked_id_is_denied_until_its_expiry():
+    # Arrange
+    clock = FakeClock()
+    denylist = TokenDenylist(clock=clock)
+    jti = uuid.uuid4().hex
+
+    # Act
+    denylist.add(jti, clock.now + 30)
+
+    # Assert
+    assert jti in denylist
+    assert uuid.uuid4().hex not in denylist
+    clock.now += 31
+    assert jti not in denylist
+    assert len(denylist) == 0
+
+
+def test_expired_entries_are_purged_on_add():
+    # Arrange
+    clock = FakeClock()
+    denylist = TokenDenylist(clock=clock)
+    denylist.load([(uuid.uuid4().hex, clock.now + 5) for _ in range(100)])
+
+    # Act
+    clock.now += 10
+    denylist.add("not-a-uuid", clock.now + 5)
+
+    # Assert
+    assert len(denylist) == 1
+    assert "not-a-uuid" in denylist
+
+
+def test_already_expired_token_is_not_stored():
+    # Arrange
+    clock = FakeClock()
+    denylist = TokenDenylist(clock=clock)
+
+    # Act
+    denylist.add(uuid.uuid4().hex, clock.now - 1)
+
+    # Assert
+    assert len(denylist) == 0
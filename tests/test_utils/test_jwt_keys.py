@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jose import JWTError, jwt
+from api.utils.jwt_keys import KeyRing, build_key_ring, hmac_key, pem_key
+
+
+def claims(minutes=5):
+    return {
+        "user_id": 1,
+        "email": "user@example.com",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=minutes),
+    }
+
+
+def private_pem(key):
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def public_pem(key):
+    return key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+
+def test_hmac_rotation_keeps_old_tokens_valid():
+    # Arrange
+    old_ring = KeyRing(hmac_key("old-secret"))
+    token = old_ring.sign(claims())
+
+    # Act: "new-secret" becomes active, "old-secret" is retired
+    new_ring = KeyRing(hmac_key("new-secret"), (hmac_key("old-secret"),))
+
+    # Assert
+    assert new_ring.verify(token)["user_id"] == 1
+    assert jwt.get_unverified_header(new_ring.sign(claims()))["kid"] == hmac_key("new-secret").kid
+    with pytest.raises(JWTError):
+        KeyRing(hmac_key("new-secret")).verify(token)
+
+
+def test_token_without_kid_is_checked_against_active_key():
+    # Arrange
+    ring = KeyRing(hmac_key("secret"))
+    legacy = jwt.encode(claims(), "secret", algorithm="HS256")
+
+    # Act & Assert
+    assert ring.verify(legacy)["email"] == "user@example.com"
+
+
+def test_expired_token_is_rejected():
+    # Arrange
+    ring = KeyRing(hmac_key("secret"))
+    token = ring.sign(claims(minutes=-1))
+
+    # Act & Assert
+    with pytest.raises(JWTError):
+        ring.verify(token)
+
+
+def test_rs256_signs_with_private_and_verifies_with_public_key():
+    # Arrange
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ring = KeyRing(pem_key(private_pem(private), "RS256"))
+    verify_only = KeyRing(
+        pem_key(private_pem(rsa.generate_private_key(public_exponent=65537, key_size=2048)), "RS256"),
+        (pem_key(public_pem(private), "RS256"),),
+    )
+
+    # Act
+    token = ring.sign(claims())
+
+    # Assert
+    assert jwt.get_unverified_header(token)["alg"] == "RS256"
+    assert verify_only.verify(token)["user_id"] == 1
+    assert pem_key(public_pem(private), "RS256").signer is None
+
+
+def test_eddsa_round_trip():
+    # Arrange
+    private = ed25519.Ed25519PrivateKey.generate()
+    ring = KeyRing(pem_key(private_pem(private), "EdDSA"))
+    other = KeyRing(pem_key(private_pem(ed25519.Ed25519PrivateKey.generate()), "EdDSA"))
+
+    # Act
+    token = ring.sign(claims())
+
+    # Assert
+    assert ring.verify(token)["user_id"] == 1
+    with pytest.raises(JWTError):
+        other.verify(token)
+
+
+def test_build_key_ring_loads_pem_files(tmp_path):
+    # Arrange
+    current = ed25519.Ed25519PrivateKey.generate()
+    retired = ed25519.Ed25519PrivateKey.generate()
+    (tmp_path / "current.pem").write_bytes(private_pem(current))
+    (tmp_path / "retired.pub").write_bytes(public_pem(retired))
+    old_token = KeyRing(pem_key(private_pem(retired), "EdDSA")).sign(claims())
+
+    # Act
+    ring = build_key_ring(
+        algorithm="EdDSA",
+        private_key_path=str(tmp_path / "current.pem"),
+        previous_public_key_paths=[str(tmp_path / "retired.pub")],
+    )
+
+    # Assert
+    assert len(ring.kids) == 2
+    assert ring.verify(old_token)["user_id"] == 1
+
+
+def test_asymmetric_key_ring_requires_private_key():
+    with pytest.raises(ValueError):
+        build_key_ring(algorithm="RS256", private_key_path=None)
@@ -0,0 +1,68 @@
+import random
+from api.utils.leaderboard import LeaderboardIndex, RankIndex
+
+
+def test_ranks_match_a_full_sort_after_random_updates():
+    # Arrange
+    rng = random.Random(7)
+    board = RankIndex()
+    scores = {}
+
+    # Act
+    for _ in range(2000):
+        user_id = rng.randint(1, 200)
+        score = float(rng.randint(0, 50))
+        board.set(user_id, score)
+        scores[user_id] = score
+    for user_id in rng.sample(sorted(scores), 20):
+        board.discard(user_id)
+        del scores[user_id]
+
+    # Assert
+    ordered = sorted(scores.values(), reverse=True)
+    for user_id, score in scores.items():
+        assert board.rank(user_id) == (ordered.index(score) + 1, score)
+    assert [score for _, _, score in board.top(len(scores))] == ordered
+    assert len(board) == len(scores)
+
+
+def test_ties_share_a_rank():
+    # Arrange
+    board = RankIndex({1: 100.0, 2: 80.0, 3: 80.0, 4: 50.0})
+
+    # Act
+    top = board.top(4)
+
+    # Assert
+    assert top == [(1, 1, 100.0), (2, 2, 80.0), (2, 3, 80.0), (4, 4, 50.0)]
+    assert board.rank(3) == (2, 80.0)
+    assert board.rank(99) is None
+
+
+def test_load_replaces_scores_in_one_sort():
+    # Arrange
+    board = RankIndex({1: 100.0, 2: 80.0})
+
+    # Act
+    changed = board.load([(2, 120.0), (3, 90.0)])
+    unchanged = board.load({3: 90.0, 2: 120.0})
+
+    # Assert
+    assert (changed, unchanged) == (True, False)
+    assert board.top(3) == [(1, 2, 120.0), (2, 3, 90.0)]
+    assert board.rank(1) is None
+
+
+def test_least_recently_used_board_is_evicted():
+    # Arrange
+    index = LeaderboardIndex(maxsize=2)
+    index.put(("2024-03-04", None), RankIndex())
+    index.put(("2024-03-11", None), RankIndex())
+
+    # Act
+    index.get(("2024-03-04", None))
+    index.put(("2024-03-18", 1), RankIndex())
+
+    # Assert
+    assert index.keys() == [("2024-03-04", None), ("2024-03-18", 1)]
+    assert index.weeks() == {"2024-03-04", "2024-03-18"}
@@ -0,0 +1,136 @@
+import os
+import pytest
+from api.utils import metrics as metrics_module
+from api.utils.metrics import Registry, record_query, registry, statement_label
+from database.async_db import add_query_hook, remove_query_hook
+
+
+def sample_value(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not rendered")
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    # Arrange
+    metrics = Registry()
+    latency = metrics.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+    # Act
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, "/a")
+    text = metrics.render()
+
+    # Assert
+    assert "# TYPE latency_seconds histogram" in text
+    assert sample_value(text, 'latency_seconds_bucket{route="/a",le="0.1"}') == 1
+    assert sample_value(text, 'latency_seconds_bucket{route="/a",le="1"}') == 3
+    assert sample_value(text, 'latency_seconds_bucket{route="/a",le="+Inf"}') == 4
+    assert sample_value(text, 'latency_seconds_sum{route="/a"}') == pytest.approx(4.05)
+    assert sample_value(text, 'latency_seconds_count{route="/a"}') == 4
+
+
+def test_counter_and_collector_samples_escape_label_values():
+    # Arrange
+    metrics = Registry()
+    rows = metrics.counter("rows_total", "Rows", ("statement",))
+    metrics.collector(lambda: [("queue_depth", "gauge", "Depth", [({}, 3)])])
+
+    # Act
+    rows.inc(2, 'SELECT "x"')
+    rows.inc(5, 'SELECT "x"')
+    text = metrics.render()
+
+    # Assert
+    assert sample_value(text, 'rows_total{statement="SELECT \\"x\\""}') == 7
+    assert "# TYPE queue_depth gauge" in text
+    assert sample_value(text, "queue_depth") == 3
+
+
+def worker_registry(directory, depth):
+    """A registry laid out like every worker's: same metrics, own values"""
+    metrics = Registry(directory=str(directory))
+    rows = metrics.counter("rows_total", "Rows", ("statement",))
+    latency = metrics.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    metrics.collector(lambda: [("queue_depth", "gauge", "Depth", [({}, depth)])])
+    return metrics, rows, latency
+
+
+def flush_as(monkeypatch, metrics, pid):
+    monkeypatch.setattr(metrics_module.os, "getpid", lambda: pid)
+    metrics.flush()
+    monkeypatch.undo()
+
+
+def test_scrape_sums_every_worker_and_labels_live_state_by_pid(tmp_path, monkeypatch):
+    # Arrange: another worker (pid 4242) flushed its snapshot earlier
+    other, other_rows, other_latency = worker_registry(tmp_path, depth=5)
+    other_rows.inc(3, "SELECT 1")
+    other_latency.observe(0.5)
+    flush_as(monkeypatch, other, 4242)
+    mine, rows, latency = worker_registry(tmp_path, depth=2)
+    rows.inc(4, "SELECT 1")
+    latency.observe(0.05)
+    monkeypatch.setattr(metrics_module, "_alive", lambda pid: True)
+
+    # Act
+    text = mine.render()
+
+    # Assert
+    assert sample_value(text, 'rows_total{statement="SELECT 1"}') == 7
+    assert sample_value(text, 'latency_seconds_bucket{le="0.1"}') == 1
+    assert sample_value(text, "latency_seconds_count") == 2
+    assert sample_value(text, 'queue_depth{pid="4242"}') == 5
+    assert sample_value(text, f'queue_depth{{pid="{os.getpid()}"}}') == 2
+    assert text.count("# TYPE queue_depth gauge") == 1
+
+
+def test_exited_workers_counts_are_archived_not_lost(tmp_path, monkeypatch):
+    # Arrange
+    other, other_rows, _ = worker_registry(tmp_path, depth=5)
+    other_rows.inc(3, "SELECT 1")
+    flush_as(monkeypatch, other, 4242)
+    mine, rows, _ = worker_registry(tmp_path, depth=2)
+    rows.inc(4, "SELECT 1")
+    monkeypatch.setattr(metrics_module, "_alive", lambda pid: pid != 4242)
+
+    # Act
+    first = mine.render()
+    second = mine.render()
+
+    # Assert
+    assert sample_value(first, 'rows_total{statement="SELECT 1"}') == 7
+    assert sample_value(second, 'rows_total{statement="SELECT 1"}') == 7
+    assert 'pid="4242"' not in second
+    assert sorted(os.listdir(tmp_path)) == [".lock", f"{os.getpid()}.json", "archive.json"]
+
+
+def test_statement_label_collapses_whitespace_and_caps_length():
+    # Act
+    short = statement_label("SELECT *\n    FROM users\n  WHERE id = ?")
+    long = statement_label("SELECT " + "a, " * 200 + "b FROM t")
+
+    # Assert
+    assert short == "SELECT * FROM users WHERE id = ?"
+    assert len(long) == 200 and long.endswith("...")
+
+
+@pytest.mark.asyncio
+async def test_query_hook_records_statement_latency_and_rows(async_db):
+    # Arrange
+    sql = "SELECT id FROM exercises WHERE category = ?  -- metrics test"
+    hook = lambda *args: record_query(*args)
+    add_query_hook(hook)
+
+    # Act
+    try:
+        rows = await async_db.fetchall(sql, ("strength",))
+    finally:
+        remove_query_hook(hook)
+
+    # Assert
+    text = registry.render()
+    label = statement_label(sql)
+    assert sample_value(text, f'db_query_duration_seconds_count{{statement="{label}"}}') >= 1
+    assert sample_value(text, f'db_query_rows_total{{statement="{label}"}}') >= len(rows)
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.middleware.profiling import ProfilingMiddleware
+from api.utils import profiler
+from api.utils.profiler import sign_token, verify_token
+from database.async_db import add_query_hook, remove_query_hook
+
+SECRET = "profile-secret"
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def profiled_app(tmp_path, async_db):
+    def build(**options):
+        app = FastAPI()
+
+        @app.get("/slow/{item_id}")
+        async def slow(item_id: int):
+            busy_loop(0.03)
+            await asyncio.sleep(0.03)
+            row = await async_db.fetchone("SELECT name FROM exercises WHERE id = ?", (item_id,))
+            return {"name": row["name"]}
+
+        app.add_middleware(
+            ProfilingMiddleware, directory=str(tmp_path), interval=0.001, **options
+        )
+        return TestClient(app)
+
+    add_query_hook(profiler.record_query)
+    yield build
+    remove_query_hook(profiler.record_query)
+
+
+def test_sampled_request_writes_collapsed_stacks_and_sql(profiled_app, tmp_path):
+    # Arrange
+    client = profiled_app(enabled=True, sample_rate=1.0)
+
+    # Act
+    response = client.get("/slow/1")
+
+    # Assert
+    profile_id = response.headers["x-profile-id"]
+    stacks = (tmp_path / f"{profile_id}.collapsed").read_text().splitlines()
+    summary = json.loads((tmp_path / f"{profile_id}.json").read_text())
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    assert any("test_profiler:busy_loop" in line for line in stacks)
+    assert any("[await" in line for line in stacks)
+    assert all(line.startswith("api.middleware.profiling:ProfilingMiddleware.__call__") for line in stacks)
+    assert summary["route"] == "/slow/{item_id}"
+    assert summary["status"] == 200
+    assert summary["duration_ms"] >= 60
+    assert [query["sql"] for query in summary["queries"]] == [
+        "SELECT name FROM exercises WHERE id = ?"
+    ]
+
+
+def test_only_requests_with_a_valid_signed_header_are_profiled(profiled_app, tmp_path):
+    # Arrange
+    client = profiled_app(enabled=False, secret=SECRET)
+    expires = int(time.time()) + 60
+    valid = sign_token(SECRET, expires, "/slow/1")
+
+    # Act
+    plain = client.get("/slow/1")
+    forged = client.get("/slow/1", headers={"X-Profile": sign_token("other", expires, "/slow/1")})
+    elsewhere = client.get("/slow/2", headers={"X-Profile": valid})
+    signed = client.get("/slow/1", headers={"X-Profile": valid})
+
+    # Assert
+    assert "x-profile-id" not in plain.headers
+    assert "x-profile-id" not in forged.headers
+    assert "x-profile-id" not in elsewhere.headers
+    assert (tmp_path / f"{signed.headers['x-profile-id']}.collapsed").exists()
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_only_the_newest_profiles_are_kept(profiled_app, tmp_path):
+    # Arrange
+    client = profiled_app(enabled=True, sample_rate=1.0, keep=2)
+
+    # Act
+    ids = [client.get("/slow/1").headers["x-profile-id"] for _ in range(4)]
+
+    # Assert
+    assert len(set(ids)) == 4
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f"{profile_id}{suffix}" for profile_id in ids[2:] for suffix in (".collapsed", ".json")
+    )
+
+
+def test_profiled_requests_are_capped_per_minute(profiled_app, tmp_path):
+    # Arrange
+    client = profiled_app(enabled=True, sample_rate=1.0, max_per_minute=2)
+
+    # Act
+    responses = [client.get("/slow/1") for _ in range(3)]
+
+    # Assert
+    assert ["x-profile-id" in response.headers for response in responses] == [True, True, False]
+    assert all(response.status_code == 200 for response in responses)
+
+
+def test_tokens_expire_and_resist_tampering():
+    # Arrange
+    token = sign_token(SECRET, 2_000, "/reports/records")
+
+    # Act / Assert
+    assert verify_token(SECRET, token, "/reports/records", now=1_999)
+    assert not verify_token(SECRET, token, "/reports/records", now=2_001)
+    assert not verify_token(SECRET, token, "/reports/volume", now=1_999)
+    assert not verify_token(SECRET, token.replace("2000", "9000"), "/reports/records", now=1_999)
+    assert not verify_token(SECRET, "garbage", "/reports/records", now=1_999)
@@ -0,0 +1,118 @@
+import logging
+import time
+import pytest
+from api.utils.query_stats import QueryStats, normalize_sql, params_shape
+from database.async_db import add_query_hook, remove_query_hook, set_slow_query_handler
+
+
+@pytest.fixture
+def stats():
+    stats = QueryStats(slow_seconds=0.0, max_statements=3)
+    add_query_hook(stats.record)
+    set_slow_query_handler(stats.record_slow, stats.slow_seconds)
+    yield stats
+    set_slow_query_handler(None)
+    remove_query_hook(stats.record)
+
+
+def test_normalize_collapses_literals_comments_and_lists():
+    # Act / Assert
+    assert normalize_sql(
+        "SELECT *  FROM users\n WHERE id IN (?, ?, ?) AND name = 'bob' -- lookup\n LIMIT 10"
+    ) == "SELECT * FROM users WHERE id IN (?, ...) AND name = ? LIMIT ?"
+    assert normalize_sql("SELECT * FROM t WHERE id IN (?,?)") == normalize_sql(
+        "SELECT * FROM t WHERE id IN (?, ?, ?, ?)"
+    )
+    assert normalize_sql("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == (
+        "INSERT INTO t (a, b) VALUES (?, ...), ..."
+    )
+
+
+def test_params_shape_reports_types_never_values():
+    # Act / Assert
+    assert params_shape((1, "secret@example.com", None, b"x", 2.5)) == "(int, str, NULL, blob, float)"
+    assert params_shape({"email": "secret@example.com"}) == "{email: str}"
+    assert params_shape(tuple(range(12))).endswith("... 12 values)")
+    assert params_shape(None) == "n/a"
+
+
+def test_top_orders_statements_and_evicts_the_cheapest():
+    # Arrange
+    stats = QueryStats(slow_seconds=1.0, max_statements=3)
+    for sql, seconds in (("SELECT 1", 0.5), ("SELECT a FROM t", 0.1), ("SELECT b FROM t", 0.3)):
+        stats.record(sql, seconds, 1)
+    stats.record("SELECT a FROM t", 0.05, 1)
+
+    # Act
+    stats.record("SELECT c FROM t", 0.2, 0)
+
+    # Assert
+    assert [entry.statement for entry in stats.top(sort="total")] == [
+        "SELECT ?",
+        "SELECT b FROM t",
+        "SELECT c FROM t",
+    ]
+    assert [entry.statement for entry in stats.top(limit=1, sort="calls")] == ["SELECT ?"]
+
+
+@pytest.mark.asyncio
+async def test_slow_statements_are_logged_with_their_plan(stats, async_db, caplog):
+    # Arrange
+    caplog.set_level(logging.WARNING, logger="api.utils.query_stats")
+
+    # Act
+    await async_db.fetchone("SELECT name FROM exercises WHERE id = ?", (3,))
+    await async_db.fetchone("SELECT name FROM exercises WHERE id = ?", (4,))
+
+    # Assert
+    entry = stats.top(limit=1)[0]
+    assert entry.statement == "SELECT name FROM exercises WHERE id = ?"
+    assert entry.calls == 2 and entry.slow_calls == 2
+    assert entry.last_slow_params == "(int)"
+    assert any("USING INTEGER PRIMARY KEY" in line for line in entry.plan)
+    message = caplog.records[-1].getMessage()
+    assert "params (int)" in message
+    assert "SEARCH exercises" in message
+
+
+@pytest.mark.asyncio
+async def test_statements_inside_run_jobs_are_observed(stats, async_db):
+    # Arrange
+    def job(conn):
+        conn.execute("SELECT COUNT(*) FROM exercises WHERE category = ?", ("strength",))
+        return conn.in_transaction
+
+    # Act
+    await async_db.run(job)
+
+    # Assert
+    statements = {entry.statement for entry in stats.top()}
+    assert "SELECT COUNT(*) FROM exercises WHERE category = ?" in statements
+    assert not any(statement.startswith("run:") for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_job_time_is_counted_once_with_its_commit(async_db):
+    # Arrange
+    recorded = []
+    hook = lambda sql, seconds, rows: recorded.append((sql, seconds))
+
+    def job(conn):
+        conn.execute("UPDATE exercises SET description = description WHERE id = ?", (1,))
+        conn.commit()
+
+    add_query_hook(hook)
+    try:
+        # Act
+        started = time.perf_counter()
+        await async_db.run(job)
+        wall = time.perf_counter() - started
+    finally:
+        remove_query_hook(hook)
+
+    # Assert
+    assert [sql for sql, _ in recorded] == [
+        "UPDATE exercises SET description = description WHERE id = ?",
+        "COMMIT",
+    ]
+    assert sum(seconds for _, seconds in recorded) <= wall
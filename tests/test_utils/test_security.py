@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import threading
+import pytest
+from api.utils.security import PasswordHasher, PasswordHasherBusy
+
+
+def make_hasher(**overrides):
+    params = {"log_n": 4, "r": 8, "p": 1, "workers": 1, "max_pending": 4}
+    params.update(overrides)
+    return PasswordHasher(**params)
+
+
+def test_hash_is_salted_and_self_describing():
+    # Arrange
+    hasher = make_hasher()
+
+    # Act
+    first = hasher.hash("secret")
+    second = hasher.hash("secret")
+
+    # Assert
+    assert first.startswith("$scrypt$ln=4,r=8,p=1$")
+    assert first != second
+    assert hasher.verify("secret", first)
+    assert not hasher.verify("wrong", first)
+
+
+def test_verify_accepts_legacy_sha256_and_flags_it_for_rehash():
+    # Arrange
+    hasher = make_hasher()
+    legacy = hashlib.sha256(b"secret").hexdigest()
+
+    # Act & Assert
+    assert hasher.verify("secret", legacy)
+    assert not hasher.verify("wrong", legacy)
+    assert hasher.needs_rehash(legacy)
+
+
+def test_needs_rehash_when_cost_changes():
+    # Arrange
+    old = make_hasher(log_n=4).hash("secret")
+
+    # Act & Assert
+    assert not make_hasher(log_n=4).needs_rehash(old)
+    assert make_hasher(log_n=5).needs_rehash(old)
+    # Hashes made at the old cost still verify after the upgrade
+    assert make_hasher(log_n=5).verify("secret", old)
+
+
+def test_verify_rejects_malformed_hash():
+    assert not make_hasher().verify("secret", "$scrypt$garbage")
+
+
+def test_verify_dummy_runs_scrypt_at_current_cost_and_never_matches(monkeypatch):
+    # Arrange
+    hasher = make_hasher(log_n=5)
+    costs = []
+    monkeypatch.setattr(
+        "api.utils.security._scrypt",
+        lambda password, salt, log_n, r, p: costs.append(log_n) or b"k" * 32,
+    )
+
+    # Act
+    first = hasher.verify_dummy("guess")
+    second = hasher.verify_dummy("guess")
+
+    # Assert
+    assert (first, second) == (False, False)
+    # One hash to build the dummy, then one verify per call
+    assert costs == [5, 5, 5]
+
+
+@pytest.mark.asyncio
+async def test_async_hashing_runs_off_the_event_loop_thread():
+    # Arrange
+    hasher = make_hasher()
+    threads = []
+
+    def record(password):
+        threads.append(threading.current_thread().name)
+        return hasher.hash(password)
+
+    # Act
+    encoded = await hasher._submit(record, "secret")
+
+    # Assert
+    assert threads[0].startswith("password-hash")
+    assert await hasher.verify_async("secret", encoded)
+    assert hasher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_work_past_max_pending():
+    # Arrange
+    hasher = make_hasher(max_pending=1)
+    release = threading.Event()
+    blocked = asyncio.ensure_future(hasher._submit(release.wait))
+    await asyncio.sleep(0)
+
+    # Act & Assert
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash_async("secret")
+
+    release.set()
+    await blocked
+    assert hasher.pending == 0
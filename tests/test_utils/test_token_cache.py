@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from api.utils import auth
+from api.utils.jwt_keys import get_key_ring
+from api.utils.token_cache import VerifiedTokenCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_entries_expire_after_ttl_or_token_exp():
+    # Arrange
+    clock = FakeClock()
+    cache = VerifiedTokenCache(maxsize=10, ttl=60, clock=clock)
+    cache.put("long", "a")
+    cache.put("short", "b", exp=clock.now + 5)
+
+    # Act
+    clock.now += 10
+
+    # Assert
+    assert cache.get("long") == "a"
+    assert cache.get("short") is None
+    clock.now += 60
+    assert cache.get("long") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    # Arrange
+    cache = VerifiedTokenCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    # Act
+    cache.put("c", 3)
+
+    # Assert
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+@pytest.fixture
+def fresh_token_cache():
+    auth.token_cache.clear()
+    yield auth.token_cache
+    auth.token_cache.clear()
+
+
+def make_token(minutes=5):
+    return get_key_ring().sign(
+        {
+            "user_id": 3,
+            "email": "user@example.com",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=minutes),
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_verifies_once_then_serves_from_cache(
+    fresh_token_cache, monkeypatch
+):
+    # Arrange
+    token = make_token()
+    ring = get_key_ring()
+    calls = []
+    verify = ring.verify
+    monkeypatch.setattr(ring, "verify", lambda t: calls.append(t) or verify(t))
+
+    # Act
+    first = await auth.get_current_user(bearer(token))
+    second = await auth.get_current_user(bearer(token))
+
+    # Assert
+    assert first.user_id == second.user_id == 3
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_bad_tokens(fresh_token_cache):
+    for credentials in (None, bearer("not-a-jwt"), bearer(make_token(minutes=-1))):
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(credentials)
+        assert exc_info.value.status_code == 401
+
+    # Failures are never cached
+    assert len(fresh_token_cache) == 0